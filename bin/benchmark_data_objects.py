@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Measure the memory of 100k documents from the storage backend.
+
+Compares a plain dataclass with the same fields, as it was, with the slotted
+``drc.backend.data.EnkelvoudigInformatieObject``.
+
+Usage: python bin/benchmark_data_objects.py
+"""
+import dataclasses
+import os
+import sys
+import tracemalloc
+from datetime import date
+
+NUMBER = 100_000
+
+
+def setup():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+    from drc.setup import setup_env
+    setup_env()
+
+    import django
+    django.setup()
+
+
+def measure(document_class) -> float:
+    """
+    Return the MiB taken by ``NUMBER`` documents of ``document_class``.
+    """
+    values = {field.name: '' for field in dataclasses.fields(document_class)}
+    values.update(creatiedatum=date(2018, 6, 27), versie=1, locked=False)
+
+    tracemalloc.start()
+    documents = [document_class(**dict(values, identificatie=f'AMS{i}')) for i in range(NUMBER)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(documents) == NUMBER
+    return size / 1024 / 1024
+
+
+def main():
+    setup()
+
+    from drc.backend.data import EnkelvoudigInformatieObject
+
+    PlainEnkelvoudigInformatieObject = dataclasses.make_dataclass(
+        'EnkelvoudigInformatieObject',
+        [(field.name, field.type) for field in dataclasses.fields(EnkelvoudigInformatieObject)]
+    )
+
+    for name, document_class in (('before', PlainEnkelvoudigInformatieObject),
+                                 ('after', EnkelvoudigInformatieObject)):
+        print(f"{name}: {measure(document_class):.1f} MiB for {NUMBER} documents")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Measure the CPU time to render a page of 100 documents.
+
+Compares ``PaginateSerializer`` with the camelizing renderer, as it was, with
+the representation used by the list now. Both give the same output.
+
+Usage: python bin/benchmark_list_rendering.py
+"""
+import os
+import sys
+import time
+import timeit
+from datetime import date, datetime, timezone
+
+NUMBER = 20
+PAGE_SIZE = 100
+
+
+def setup():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+    from drc.setup import setup_env
+    setup_env()
+
+    import django
+    django.setup()
+
+
+def get_page():
+    from drc.backend.data import EnkelvoudigInformatieObject, PaginationObject
+
+    url = 'http://testserver/api/v1/enkelvoudiginformatieobjecten'
+    documents = [
+        EnkelvoudigInformatieObject(
+            url=f'{url}/{i}',
+            inhoud=f'{url}/{i}/download',
+            creatiedatum=date(2018, 6, 27),
+            ontvangstdatum=None,
+            verzenddatum=date(2018, 7, i % 28 + 1),
+            integriteit_datum=None,
+            ondertekening_datum=date(2018, 1, 1),
+            titel='some titel',
+            identificatie=f'AMS{i}',
+            bronorganisatie='159351741',
+            vertrouwelijkheidaanduiding='openbaar',
+            auteur='some auteur',
+            status='definitief',
+            beschrijving='',
+            indicatie_gebruiksrecht=None,
+            ondertekening_soort='digitaal',
+            informatieobjecttype='https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1',
+            formaat='text/plain',
+            taal='nld',
+            bestandsnaam='dummy.txt',
+            link='',
+            integriteit_algoritme='',
+            integriteit_waarde='',
+            bestandsomvang=1024,
+            begin_registratie=datetime(2019, 1, 1, 12, i % 60, tzinfo=timezone.utc),
+            versie=1,
+            locked=i % 10 == 0,
+        )
+        for i in range(PAGE_SIZE)
+    ]
+    return PaginationObject(count=1000, results=documents, next=f'{url}?page=2')
+
+
+def main():
+    setup()
+
+    from djangorestframework_camel_case.render import (
+        CamelCaseJSONRenderer as BaseCamelCaseJSONRenderer
+    )
+
+    from drc.api.renderers import CamelCaseJSONRenderer
+    from drc.api.representations import document_representation
+    from drc.api.serializers import PaginateSerializer
+
+    page = get_page()
+
+    def before():
+        return BaseCamelCaseJSONRenderer().render(PaginateSerializer(instance=page).data)
+
+    def after():
+        return CamelCaseJSONRenderer().render(document_representation.to_page_representation(page))
+
+    assert before() == after(), "the output differs"
+
+    for name, render in (('before', before), ('after', after)):
+        seconds = min(timeit.repeat(render, timer=time.process_time, number=NUMBER, repeat=5))
+        print(f"{name}: {seconds / NUMBER * 1000:.2f} ms CPU per page of {PAGE_SIZE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Measure the time to instantiate a document serializer, as done per request.
+
+Compares the serializer with the help texts of its choice fields extended in
+``__init__``, as it was, with the current declaration.
+
+Usage: python bin/benchmark_serializers.py
+"""
+import os
+import sys
+import timeit
+
+NUMBER = 2000
+
+
+def setup():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+    from drc.setup import setup_env
+    setup_env()
+
+    import django
+    django.setup()
+
+
+def main():
+    setup()
+
+    from vng_api_common.constants import VertrouwelijkheidsAanduiding
+    from vng_api_common.serializers import add_choice_values_help_text
+
+    from drc.api.serializers import RetrieveEnkelvoudigInformatieObjectSerializer
+    from drc.datamodel.constants import Statussen
+
+    class InitHelpTextSerializer(RetrieveEnkelvoudigInformatieObjectSerializer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            for name, choices in (('vertrouwelijkheidaanduiding', VertrouwelijkheidsAanduiding),
+                                  ('status', Statussen)):
+                self.fields[name].help_text += f"\n\n{add_choice_values_help_text(choices)}"
+
+    for name, serializer_class in (('before', InitHelpTextSerializer),
+                                   ('after', RetrieveEnkelvoudigInformatieObjectSerializer)):
+        seconds = min(timeit.repeat(lambda: serializer_class(instance=None), number=NUMBER, repeat=5))
+        print(f"{name}: {seconds / NUMBER * 1e6:.1f} us per serializer")
+
+
+if __name__ == '__main__':
+    main()
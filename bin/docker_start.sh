@@ -10,6 +10,7 @@ export PGPORT=${DB_PORT:-5432}
 fixtures_dir=${FIXTURES_DIR:-/app/fixtures}
 
 uwsgi_port=${UWSGI_PORT:-8000}
+uwsgi_gevent=${UWSGI_GEVENT:-0}
 
 until pg_isready; do
   >&2 echo "Waiting for database connection..."
@@ -35,14 +36,21 @@ fi
 
 # Start server
 >&2 echo "Starting server"
+if [ "$uwsgi_gevent" -gt 0 ]; then
+    # every process handles up to $uwsgi_gevent requests as greenlets, which
+    # don't block each other while waiting on outbound HTTP
+    uwsgi_workers="--module drc.wsgi_gevent --gevent $uwsgi_gevent"
+else
+    uwsgi_workers="--module drc.wsgi --threads 2"
+fi
+
 uwsgi \
     --http :$uwsgi_port \
-    --module drc.wsgi \
+    $uwsgi_workers \
     --static-map /static=/app/static \
     --static-map /media=/app/media  \
     --static-map /_docs=/app/docs/_build/html  \
     --chdir src \
     --processes 2 \
-    --threads 2 \
     --buffer-size=32768
     # processes & threads are needed for concurrency without nginx sitting inbetween
@@ -0,0 +1 @@
+default_app_config = 'drc.api.apps.ApiConfig'
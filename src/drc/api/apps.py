@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    name = 'drc.api'
+
+    def ready(self):
+        from . import signals  # noqa
@@ -1,6 +1,207 @@
+import logging
+from dataclasses import asdict, is_dataclass
+from functools import wraps
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
 from vng_api_common.audittrails.audits import Audit
+from vng_api_common.audittrails.models import AuditTrail
+from vng_api_common.audittrails.viewsets import (
+    AuditTrailMixin as _AuditTrailMixin
+)
+from vng_api_common.compat import get_header
+from vng_api_common.constants import CommonResourceAction
+
+from drc.datamodel.models import UitgaandeAuditTrail
+
+logger = logging.getLogger(__name__)
 
 AUDIT_DRC = Audit(
     'DRC',
     'enkelvoudiginformatieobject'
 )
+
+
+def _get(data, key: str):
+    # the backends return dataclasses, the model viewsets return dicts
+    if is_dataclass(data):
+        return getattr(data, key)
+    return data[key]
+
+
+def audittrail_to_dict(trail: AuditTrail) -> dict:
+    """
+    Return the fields of an audit trail, to store it in the outbox.
+    """
+    data = {
+        field.attname: getattr(trail, field.attname)
+        for field in AuditTrail._meta.concrete_fields
+        if not field.primary_key
+    }
+    # the time of the request, not the time the trail is written
+    data['aanmaakdatum'] = timezone.now()
+    return data
+
+
+class AuditTrailBuffer:
+    """
+    Collects the audit trails of a request and writes them in one query.
+
+    The buffer is closed (and written) in the transaction of the request, just
+    before it is committed. With ``AUDITTRAIL_DELIVERY = 'async'`` the trails
+    are stored in the outbox, to be written by the ``write_audittrails``
+    command.
+    """
+    def __init__(self, serialize):
+        self.serialize = serialize
+        self.trails = []
+
+    def add(self, trail: AuditTrail) -> None:
+        self.trails.append(trail)
+
+    def close(self) -> None:
+        trails, self.trails = self.trails, []
+        if not trails:
+            return
+
+        for trail in trails:
+            trail.oud = self.serialize(trail.oud)
+            trail.nieuw = self.serialize(trail.nieuw)
+
+        try:
+            if settings.AUDITTRAIL_DELIVERY == 'async':
+                UitgaandeAuditTrail.objects.create(audittrails=[audittrail_to_dict(trail) for trail in trails])
+            else:
+                AuditTrail.objects.bulk_create(trails)
+        except Exception:
+            # log the trails, so they can be recovered
+            logger.exception(
+                "Could not write audit trails for %s",
+                ", ".join(f"{trail.actie} {trail.resource_url}" for trail in trails)
+            )
+            raise
+
+
+def atomic_with_audittrails(view):
+    """
+    Run a view in a transaction, and write its audit trails in that transaction.
+
+    The audit trails of the request are written with a single query just
+    before the transaction is committed, so they are committed together with
+    the changes they describe.
+    """
+    @wraps(view)
+    def wrapper(self, *args, **kwargs):
+        # views can call other views, the outermost one writes
+        outermost = not getattr(self, '_audittrail_atomic', False)
+        with transaction.atomic():
+            self._audittrail_atomic = True
+            try:
+                response = view(self, *args, **kwargs)
+            finally:
+                if outermost:
+                    self._audittrail_atomic = False
+
+            buffer = getattr(self, '_audittrail_buffer', None)
+            if outermost and buffer is not None:
+                if response.status_code < 400:
+                    buffer.close()
+                else:
+                    buffer.trails = []
+        return response
+    return wrapper
+
+
+class AuditTrailMixin(_AuditTrailMixin):
+    """
+    Audit trail mixin that understands the backend dataclasses and batches the writes.
+
+    The audit trails of a view decorated with :func:`atomic_with_audittrails`
+    are collected and written with a single query in its transaction: into the
+    audit trail, or into the outbox with ``AUDITTRAIL_DELIVERY = 'async'``. The
+    versions are only serialized when the trails are written.
+    """
+    audittrail_serializer_class = None
+    # the resource that is changed, if it is not the resource of the viewset
+    audittrail_resource = None
+
+    def get_audittrail_main_object_url(self, data, main_resource):
+        key = getattr(self, 'audittrail_main_resource_key', main_resource)
+        main_object = _get(data, key)
+        # relations of dataclasses can be dataclasses themselves
+        return main_object if isinstance(main_object, str) else main_object.url
+
+    def serialize_audittrail_version(self, version):
+        """
+        Return the representation of a version as it is stored in the audit trail.
+        """
+        if not is_dataclass(version):
+            return version
+        if self.audittrail_serializer_class is not None:
+            return self.audittrail_serializer_class(instance=version).data
+        return asdict(version)
+
+    def get_audittrail_buffer(self) -> AuditTrailBuffer:
+        if not hasattr(self, '_audittrail_buffer'):
+            self._audittrail_buffer = AuditTrailBuffer(self.serialize_audittrail_version)
+        return self._audittrail_buffer
+
+    def create_audittrail(self, status_code, action, version_before_edit, version_after_edit, unique_representation):
+        """
+        Create the audittrail for the action that has been carried out.
+        """
+        data = version_after_edit if version_after_edit else version_before_edit
+        resource = self.audittrail_resource or self.basename
+        if resource == self.audit.main_resource:
+            main_object = _get(data, 'url')
+        else:
+            main_object = self.get_audittrail_main_object_url(data, self.audit.main_resource)
+
+        applications = self.request.jwt_auth.applicaties
+        if len(applications) > 1:
+            logger.warning("Unexpectedly found %d applications, expected at most one", len(applications))
+
+        if applications:
+            application = applications[0]
+            app_id, app_presentation = str(application.uuid), application.label
+        else:
+            app_id = get_header(self.request, 'X-NLX-Request-Application-Id')
+            app_presentation = app_id  # we don't have any extra information...
+
+        user_id = self.request.jwt_auth.payload.get('user_id', '')
+        if not user_id:
+            user_id = get_header(self.request, 'X-NLX-Request-User-Id') or ""
+
+        trail = AuditTrail(
+            bron=self.audit.component_name,
+            request_id=get_header(self.request, 'X-NLX-Request-Id') or "",
+            applicatie_id=app_id,
+            applicatie_weergave=app_presentation,
+            actie=action,
+            actie_weergave=CommonResourceAction.labels.get(action, ''),
+            gebruikers_id=user_id,
+            gebruikers_weergave=self.request.jwt_auth.payload.get('user_representation', ''),
+            resultaat=status_code,
+            hoofd_object=main_object,
+            resource=resource,
+            resource_url=_get(data, 'url'),
+            toelichting=get_header(self.request, 'X-Audit-Toelichting') or "",
+            resource_weergave=unique_representation,
+            oud=version_before_edit,
+            nieuw=version_after_edit,
+        )
+
+        buffer = self.get_audittrail_buffer()
+        buffer.add(trail)
+        if not getattr(self, '_audittrail_atomic', False):
+            buffer.close()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        buffer = getattr(self, '_audittrail_buffer', None)
+        if buffer is not None:
+            # the request failed, the changes were not committed
+            buffer.trails = []
+        return response
@@ -1,13 +1,13 @@
 import logging
 
-from vng_api_common.models import APICredential
+from .credentials import credentials
 
 logger = logging.getLogger(__name__)
 
 
 def get_ztc_auth(url: str) -> dict:
     logger.info("Authenticating for %s", url)
-    auth = APICredential.get_auth(url, scopes=['zds.scopes.zaaktypes.lezen'])
+    auth = credentials.get_auth(url, scopes=['zds.scopes.zaaktypes.lezen'])
     if auth is None:
         logger.warning("Could not authenticate for %s", url)
         return {}
@@ -16,7 +16,7 @@ def get_ztc_auth(url: str) -> dict:
 
 def get_zrc_auth(url: str) -> dict:
     logger.info("Authenticating for %s", url)
-    auth = APICredential.get_auth(
+    auth = credentials.get_auth(
         url,
         scopes=['zds.scopes.zaken.lezen'],
         zaaktypes=['*']
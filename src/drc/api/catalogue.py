@@ -0,0 +1,202 @@
+"""
+A cache of catalogue (ZTC) resources, keyed by URL.
+
+Creating or updating a document validates the ``informatieobjecttype`` URL,
+which would otherwise be a request to the Catalogi API (and a credentials
+lookup) every time. Informatieobjecttypen rarely change, so the responses are
+cached:
+
+* successful responses for ``ZTC_CACHE_TTL`` seconds
+* ``404`` responses for ``ZTC_CACHE_NEGATIVE_TTL`` seconds
+* expired successful responses are served for another ``ZTC_CACHE_STALE_TTL``
+  seconds, while they are refreshed in the background
+
+Other errors are not cached. Each process keeps at most ``ZTC_CACHE_SIZE``
+URLs, the least recently used are dropped first. With ``ZTC_CACHE_ALIAS`` the
+responses are kept in that Django cache too, so a resource that one process
+fetched is not fetched again by the others.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+SHARED_KEY = 'drc:catalogue:{hash}'
+
+
+class CachedResponse:
+    """
+    The parts of a response that the validators use.
+    """
+    def __init__(self, status_code: int, data=None):
+        self.status_code = status_code
+        self.data = data
+
+    @classmethod
+    def from_response(cls, response) -> 'CachedResponse':
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        return cls(response.status_code, data)
+
+    def json(self):
+        return self.data
+
+
+class CatalogueCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # url -> (response, expires, stale until)
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0}
+
+    @property
+    def shared_cache(self):
+        alias = settings.ZTC_CACHE_ALIAS
+        return caches[alias] if alias else None
+
+    def get(self, url: str, fetch: Callable[[str], CachedResponse]) -> CachedResponse:
+        """
+        Return the cached response for ``url``, calling ``fetch(url)`` when needed.
+
+        Exceptions raised by ``fetch`` are not cached, and passed on unless a
+        stale response can be served instead.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and now < entry[1]:
+                self._entries.move_to_end(url)
+                self._stats['hits'] += 1
+                return entry[0]
+
+        # another process may have fetched or refreshed it
+        shared = self._get_shared(url)
+
+        with self._lock:
+            if shared is not None and (entry is None or shared[1] > entry[1]):
+                entry = shared
+                self._put(url, entry)
+            if entry is not None and now < entry[1]:
+                self._stats['hits'] += 1
+                return entry[0]
+            if entry is not None and now < entry[2]:
+                self._entries.move_to_end(url)
+                self._stats['stale'] += 1
+                refresh = url not in self._refreshing
+                self._refreshing.add(url)
+            else:
+                entry = None
+                self._stats['misses'] += 1
+
+        if entry is None:
+            response = fetch(url)
+            self._store(url, response)
+            return response
+
+        if refresh:
+            thread = threading.Thread(target=self._refresh, args=(url, fetch), daemon=True)
+            thread.start()
+        return entry[0]
+
+    def _refresh(self, url: str, fetch: Callable[[str], CachedResponse]) -> None:
+        try:
+            self._store(url, fetch(url))
+        except Exception:
+            # keep serving the stale response until it is dropped
+            logger.warning("Could not refresh %s", url, exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing.discard(url)
+            # the credentials lookup may have opened a connection for this thread
+            connections.close_all()
+
+    def _store(self, url: str, response: CachedResponse) -> None:
+        now = time.monotonic()
+        if response.status_code == 200:
+            expires = now + settings.ZTC_CACHE_TTL
+            stale_until = expires + settings.ZTC_CACHE_STALE_TTL
+        elif response.status_code == 404:
+            expires = stale_until = now + settings.ZTC_CACHE_NEGATIVE_TTL
+        else:
+            # don't serve an old answer for a resource that is failing now
+            self.invalidate(url)
+            return
+
+        with self._lock:
+            self._put(url, (response, expires, stale_until))
+        self._set_shared(url, response, expires, stale_until)
+
+    def _put(self, url: str, entry: tuple) -> None:
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+        while len(self._entries) > settings.ZTC_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    def _get_shared(self, url: str):
+        cache = self.shared_cache
+        if cache is None:
+            return None
+        entry = cache.get(self._shared_key(url))
+        if entry is None:
+            return None
+        # other processes have other monotonic clocks, the shared entries
+        # expire by the wall clock
+        status_code, data, expires, stale_until = entry
+        offset = time.time() - time.monotonic()
+        return CachedResponse(status_code, data), expires - offset, stale_until - offset
+
+    def _set_shared(self, url: str, response: CachedResponse, expires: float, stale_until: float) -> None:
+        cache = self.shared_cache
+        if cache is None:
+            return
+        offset = time.time() - time.monotonic()
+        cache.set(
+            self._shared_key(url),
+            (response.status_code, response.data, expires + offset, stale_until + offset),
+            max(int(stale_until - time.monotonic()) + 1, 1)
+        )
+
+    def _shared_key(self, url: str) -> str:
+        return SHARED_KEY.format(hash=hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            self._entries.pop(url, None)
+        cache = self.shared_cache
+        if cache is not None:
+            cache.delete(self._shared_key(url))
+
+    def clear(self) -> None:
+        """
+        Clear the cache of this process, the shared cache is left alone.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, size=len(self._entries))
+
+
+catalogue_cache = CatalogueCache()
+
+
+@receiver(setting_changed)
+def clear_catalogue_cache(setting, **kwargs):
+    # responses fetched with other settings (e.g. a mocked LINK_FETCHER in
+    # the tests) are not valid anymore
+    if setting in ('LINK_FETCHER', 'ZDS_CLIENT_CLASS') or setting.startswith('ZTC_CACHE_'):
+        catalogue_cache.clear()
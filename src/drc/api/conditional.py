@@ -0,0 +1,54 @@
+"""
+Conditional requests (``If-None-Match``) for the detail resources.
+
+The functions are called by :func:`rest_framework_condition.condition` with
+the request, before the view. The lookup is done once per request and kept on
+the request, so the ETag and the view share it.
+
+A document has no ``Last-Modified``: its ``indicatieGebruiksrecht`` and
+``locked`` change without a new version, and the backends don't keep when.
+"""
+from drc.backend import BackendException, drc_storage_adapter
+
+from .filters import EnkelvoudigInformatieObjectDetailFilter
+from .utils import get_document_etag, get_objectinformatieobject_etag
+
+
+def get_document_version(request, uuid=None, **kwargs):
+    """
+    Look up the version of the document that is retrieved, without its attributes.
+    """
+    if not hasattr(request, '_document_version'):
+        request._document_version = None
+        filters = EnkelvoudigInformatieObjectDetailFilter(data=request.GET)
+        # invalid filters are reported by the view
+        if filters.is_valid():
+            try:
+                request._document_version = drc_storage_adapter.lees_enkelvoudiginformatieobject_versie(
+                    uuid, versie=request.GET.get('versie'), filters=filters.form.cleaned_data
+                )
+            except BackendException:
+                pass
+    return request._document_version
+
+
+def document_etag(request, *args, **kwargs):
+    versie = get_document_version(request, **kwargs)
+    return get_document_etag(versie) if versie else None
+
+
+def get_objectinformatieobject(request, uuid=None, **kwargs):
+    """
+    Read the object informatieobject, which is used for the response as well.
+    """
+    if not hasattr(request, '_objectinformatieobject'):
+        try:
+            request._objectinformatieobject = drc_storage_adapter.lees_objectinformatieobject(uuid)
+        except BackendException:
+            request._objectinformatieobject = None
+    return request._objectinformatieobject
+
+
+def objectinformatieobject_etag(request, *args, **kwargs):
+    oio = get_objectinformatieobject(request, **kwargs)
+    return get_objectinformatieobject_etag(oio) if oio else None
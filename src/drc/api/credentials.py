@@ -0,0 +1,140 @@
+"""
+A process-level registry of the credentials and clients for other APIs.
+
+Every remote check looks up the :class:`vng_api_common.models.APICredential`
+of the URL (a query) and builds a ZDS client for it, often several times per
+request for the same API. The registry keeps them per API root for
+``API_CREDENTIALS_TTL`` seconds:
+
+* the API roots with credentials, per scheme and domain
+* the auth of an API root, per set of claims (e.g. ``scopes``)
+* the clients, per base URL and claims, which keep the schema they fetched
+
+Saving or deleting an ``APICredential`` clears the registry of this process,
+other processes pick up the change when their entries expire.
+"""
+import re
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from vng_api_common.models import APICredential
+
+from drc.backend.http import get_timeout
+
+UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
+
+
+def _freeze(claims: dict) -> tuple:
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in claims.items()
+    ))
+
+
+def _get_base_url(url: str) -> str:
+    # the base URL ``Client.from_url`` finds: the path up to the collection
+    # of the first UUID in it
+    scheme, netloc, path = urlsplit(url)[:3]
+    base_path = UUID_PATTERN.split(path)[0].rstrip('/').rsplit('/', 1)[0] + '/'
+    return urlunsplit((scheme, netloc, base_path, '', ''))
+
+
+def _set_timeout(client) -> None:
+    # the clients don't take a timeout, it is added to their requests before
+    # they are sent
+    pre_request = getattr(client, 'pre_request', None)
+    if pre_request is None:
+        return
+
+    def pre_request_with_timeout(method, url, kwargs=None, *args, **extra):
+        if kwargs is not None:
+            kwargs.setdefault('timeout', get_timeout())
+        return pre_request(method, url, kwargs, *args, **extra)
+
+    client.pre_request = pre_request_with_timeout
+
+
+class CredentialRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (value, expires)
+        self._entries = {}
+
+    def _get(self, key, build):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and now < entry[1]:
+            return entry[0]
+
+        value = build()
+        with self._lock:
+            self._entries[key] = (value, now + settings.API_CREDENTIALS_TTL)
+        return value
+
+    def get_api_root(self, url: str) -> Optional[str]:
+        """
+        Return the API root of the credentials for ``url``, the longest one that matches.
+        """
+        scheme_and_domain = urlunsplit(urlsplit(url)[:2] + ('', '', ''))
+        api_roots = self._get(('api_roots', scheme_and_domain), lambda: sorted(
+            APICredential.objects.filter(api_root__startswith=scheme_and_domain).values_list('api_root', flat=True),
+            key=len, reverse=True
+        ))
+        return next((api_root for api_root in api_roots if url.startswith(api_root)), None)
+
+    def get_auth(self, url: str, **claims):
+        """
+        Drop-in replacement for ``APICredential.get_auth``.
+        """
+        api_root = self.get_api_root(url)
+        if api_root is None:
+            return None
+        return self._get(('auth', api_root, _freeze(claims)), lambda: APICredential.get_auth(api_root, **claims))
+
+    def get_client(self, url: str, **claims):
+        """
+        Return the client (of ``ZDS_CLIENT_CLASS``) for ``url``, with the auth for it.
+
+        The client is shared, don't change it.
+        """
+        key = ('client', settings.ZDS_CLIENT_CLASS, _get_base_url(url), self.get_api_root(url), _freeze(claims))
+
+        def build():
+            Client = import_string(settings.ZDS_CLIENT_CLASS)
+            client = Client.from_url(url)
+            client.auth = self.get_auth(url, **claims)
+            _set_timeout(client)
+            return client
+
+        return self._get(key, build)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+credentials = CredentialRegistry()
+
+
+@receiver(post_save, sender=APICredential)
+@receiver(post_delete, sender=APICredential)
+def clear_credentials(**kwargs):
+    credentials.clear()
+    # and again once the change is visible to other requests
+    transaction.on_commit(credentials.clear)
+
+
+@receiver(setting_changed)
+def clear_credentials_setting(setting, **kwargs):
+    if setting in ('ZDS_CLIENT_CLASS', 'API_CREDENTIALS_TTL'):
+        credentials.clear()
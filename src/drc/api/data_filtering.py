@@ -1,3 +1,43 @@
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from vng_api_common.scopes import Scope
+
+from drc.datamodel.query import AuthorizationPredicate
+
+CACHE_KEY = 'drc:authorizations:{client_id}'
+
+
+def get_authorization_predicate(jwt_auth, scope: Scope) -> Optional[AuthorizationPredicate]:
+    """
+    Return the authorizations of the client for ``scope``, compiled for filtering.
+
+    ``None`` means that no filtering applies, because an application of the
+    client has all authorizations. The compiled authorizations are cached per
+    ``client_id`` until they change, see :func:`invalidate_authorizations`.
+    """
+    client_id = jwt_auth.client_id
+    if client_id is None:
+        return AuthorizationPredicate({})
+
+    key = CACHE_KEY.format(client_id=client_id)
+    compiled = cache.get(key) or {}
+    if scope.label not in compiled:
+        if any(app.heeft_alle_autorisaties for app in jwt_auth.applicaties):
+            compiled[scope.label] = None
+        else:
+            compiled[scope.label] = AuthorizationPredicate.from_authorizations(scope, jwt_auth.autorisaties)
+        cache.set(key, compiled, settings.AUTHORIZATIONS_CACHE_TIMEOUT)
+    return compiled[scope.label]
+
+
+def invalidate_authorizations(client_ids: Iterable[str]) -> None:
+    cache.delete_many([CACHE_KEY.format(client_id=client_id) for client_id in client_ids])
+
+
 class ListFilterByAuthorizationsMixin:
     """
     Filter list-action data by the authorizations configured.
@@ -7,33 +47,33 @@ class ListFilterByAuthorizationsMixin:
     implementation facilitates it in a conventional way.
 
     For this to be effective, the underlying model must have a queryset
-    method ``filter_for_authorizations``, which is provided by
-    :class:`zrc.datamodel.query.AuthorizationsFilterMixin`
+    method ``filter_for_predicate``, which is provided by
+    :class:`drc.datamodel.query.AuthorizationsFilterMixin`. Viewsets that
+    read from the storage backend pass :meth:`get_authorization_predicate`
+    to the adapter instead.
     """
+    # the actions that only return the objects the client may see
+    authorization_filtered_actions = ('list',)
 
-    def get_queryset(self):
-        base = super().get_queryset()
-
+    def get_authorization_predicate(self) -> Optional[AuthorizationPredicate]:
         # drf-yasg introspection - doesn't run the middleware, so this isn't set
         if not hasattr(self.request, 'jwt_auth'):
-            return base
+            return None
 
         # we do not apply the filtering for update/partial_update/delete,
         # because the resource _does exist_, you just don't have permission
         # to do those operations. A 403 is semantically more correct than a
         # 404, which would be the result if the queryset is always filtered.
-        if not self.action == 'list':
-            return base
-
-        # get the auth apps that are relevant for this particular request
-        apps = self.request.jwt_auth.applicaties
-
-        # as soon as there's one matching app that gives you all permissions,
-        # you're good - no further detailed data filtering is applied
-        if any(app.heeft_alle_autorisaties for app in apps):
-            return base
+        if self.action not in self.authorization_filtered_actions:
+            return None
 
         scope_needed = self.required_scopes[self.action]
-        authorizations = self.request.jwt_auth.autorisaties
+        return get_authorization_predicate(self.request.jwt_auth, scope_needed)
+
+    def get_queryset(self):
+        base = super().get_queryset()
 
-        return base.filter_for_authorizations(scope_needed, authorizations)
+        predicate = self.get_authorization_predicate()
+        if predicate is None:
+            return base
+        return base.filter_for_predicate(predicate)
@@ -0,0 +1,22 @@
+from drf_yasg import openapi
+from drf_yasg.inspectors import DjangoRestResponsePagination
+
+
+class NullableCountPagination(DjangoRestResponsePagination):
+    """
+    The ``count`` of a page is ``null`` when it is not determined.
+
+    With cursor pagination the total is only counted on request, and the
+    total of the documents the authorizations allow is unknown for backends
+    that can't filter by them.
+    """
+
+    def get_paginated_response(self, paginator, response_schema):
+        paged_schema = super().get_paginated_response(paginator, response_schema)
+        if paged_schema is not None and 'count' in paged_schema.properties:
+            paged_schema.properties['count'] = openapi.Schema(
+                type=openapi.TYPE_INTEGER,
+                description='Het totaal, `null` als het niet bepaald is.',
+                x_nullable=True
+            )
+        return paged_schema
@@ -4,7 +4,7 @@ from urllib.parse import urlparse
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 from djangorestframework_camel_case.util import camelize
@@ -16,9 +16,63 @@ from vng_api_common.notifications.models import NotificationsConfig
 from vng_api_common.utils import get_resource_for_path
 from zds_client import ClientError
 
+from drc.datamodel.models import UitgaandeNotificatie
+
 logger = logging.getLogger(__name__)
 
 
+def send_notification(message: dict) -> None:
+    """
+    Send the message to the NRC, or queue it in the outbox.
+
+    With ``NOTIFICATIONS_DELIVERY = 'async'`` the message is stored in the
+    current transaction and delivered by the ``send_notifications`` command,
+    so the NRC round-trip is not part of the request. Otherwise it is sent
+    once the current transaction is committed, and not if it is rolled back.
+    """
+    if settings.NOTIFICATIONS_DELIVERY == 'async':
+        UitgaandeNotificatie.objects.create(
+            kanaal=message['kanaal'],
+            hoofd_object=message['hoofdObject'],
+            bericht=message,
+        )
+        return
+
+    # build the client from the singleton config. This will raise an
+    # exception if the config is not complete. We want this to hard-fail!
+    client = NotificationsConfig.get_client()
+    # the round-trip doesn't keep the transaction (and its row locks) open
+    transaction.on_commit(lambda: _deliver(client, message))
+
+
+def _deliver(client, message: dict) -> None:
+    try:
+        client.create('notificaties', message)
+    # any unexpected errors should show up in error-monitoring, so we only
+    # catch ClientError exceptions
+    except ClientError:
+        logger.warning("Could not deliver message to %s", client.base_url, exc_info=True)
+
+
+def send_notifications(messages: List[dict]) -> None:
+    """
+    Send a batch of messages, queued in the outbox with a single query in async mode.
+    """
+    if settings.NOTIFICATIONS_DELIVERY == 'async':
+        UitgaandeNotificatie.objects.bulk_create([
+            UitgaandeNotificatie(
+                kanaal=message['kanaal'],
+                hoofd_object=message['hoofdObject'],
+                bericht=message,
+            )
+            for message in messages
+        ])
+        return
+
+    for message in messages:
+        send_notification(message)
+
+
 class NotificationMixinBase(type):
 
     def __new__(cls, name, bases, attrs):
@@ -47,7 +101,42 @@ class NotificationMixinBase(type):
         return new_cls
 
 
-class NotificationMixin(metaclass=NotificationMixinBase):
+class SendNotificationMixin:
+    """
+    Send the message built by ``construct_message`` with :func:`send_notification`.
+
+    Put this mixin before the ``vng_api_common`` notification mixins to send
+    their notifications through the outbox as well.
+    """
+    def notify(self, status_code: int,
+               data: Union[List, Dict], instance: models.Model = None) -> None:
+        if settings.NOTIFICATIONS_DISABLED:
+            return
+
+        # do nothing unless we have a 'success' status code - early exit here
+        if not 200 <= status_code < 300:
+            logger.info("Not notifying, status code '%s' does not represent success.", status_code)
+            return
+
+        # build the content of the notification
+        message = self.construct_message(data, instance=instance)
+        send_notification(message)
+
+    def notify_many(self, status_code: int, items: List) -> None:
+        """
+        Notify about a batch of objects, see :func:`send_notifications`.
+        """
+        if settings.NOTIFICATIONS_DISABLED:
+            return
+
+        if not 200 <= status_code < 300:
+            logger.info("Not notifying, status code '%s' does not represent success.", status_code)
+            return
+
+        send_notifications([self.construct_message(data) for data in items])
+
+
+class NotificationMixin(SendNotificationMixin, metaclass=NotificationMixinBase):
     notifications_kanaal = None  # must be set be subclasses
     notifications_main_resource_key = None
     notifications_resource = None
@@ -82,6 +171,12 @@ class NotificationMixin(metaclass=NotificationMixinBase):
     def get_model(self):
         return self.notifications_model
 
+    def get_notification_action(self) -> str:
+        """
+        Determine the action ('create', 'update', ...) that is reported.
+        """
+        return self.action
+
     def get_main_object(self, data, instance):
         return data
 
@@ -121,7 +216,7 @@ class NotificationMixin(metaclass=NotificationMixinBase):
             'hoofd_object': main_object_url,
             'resource': model._meta.model_name,
             'resource_url': data.url,
-            'actie': self.action,
+            'actie': self.get_notification_action(),
             'aanmaakdatum': timezone.now(),
             # each channel knows which kenmerken it has, so delegate this
             'kenmerken': kanaal.get_kenmerken(main_object),
@@ -132,29 +227,6 @@ class NotificationMixin(metaclass=NotificationMixinBase):
         serializer = NotificatieSerializer(instance=message_data)
         return camelize(serializer.data)
 
-    def notify(self, status_code: int,
-               data: Union[List, Dict], instance: models.Model = None) -> None:
-        if settings.NOTIFICATIONS_DISABLED:
-            return
-
-        # do nothing unless we have a 'success' status code - early exit here
-        if not 200 <= status_code < 300:
-            logger.info("Not notifying, status code '%s' does not represent success.", status_code)
-            return
-
-        # build the content of the notification
-        message = self.construct_message(data, instance=instance)
-
-        # build the client from the singleton config. This will raise an
-        # exception if the config is not complete. We want this to hard-fail!
-        client = NotificationsConfig.get_client()
-        try:
-            client.create('notificaties', message)
-        # any unexpected errors should show up in error-monitoring, so we only
-        # catch ClientError exceptions
-        except ClientError:
-            logger.warning("Could not deliver message to %s", client.base_url, exc_info=True)
-
 
 class NotificationCreateMixin(NotificationMixin):
     def create(self, request, *args, **kwargs):
@@ -0,0 +1,67 @@
+"""
+Cursor (keyset) pagination for lists that are fetched from the backend.
+
+The cursor is an opaque, url-safe token that encodes the direction and the
+position (as returned by the backend) to continue from. Fetching a page by
+cursor does not depend on the number of objects before it, unlike page
+numbers which require an OFFSET and a total count.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Optional, Tuple
+
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+CURSOR_QUERY_PARAM = 'cursor'
+PAGINATION_QUERY_PARAM = 'paginering'
+COUNT_QUERY_PARAM = 'count'
+
+# query parameters that are not filters
+PAGINATION_QUERY_PARAMS = ('page', CURSOR_QUERY_PARAM, PAGINATION_QUERY_PARAM, COUNT_QUERY_PARAM)
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def uses_cursor_pagination(request) -> bool:
+    return (
+        request.GET.get(PAGINATION_QUERY_PARAM) == 'cursor' or
+        CURSOR_QUERY_PARAM in request.GET
+    )
+
+
+def encode_cursor(direction: str, position: list) -> str:
+    data = json.dumps({'d': direction, 'p': position}, separators=(',', ':'))
+    return urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[list], Optional[list]]:
+    """
+    Decode the cursor into the ``(after, before)`` positions.
+
+    :raises InvalidCursor: if the cursor can't be decoded
+    """
+    if not cursor:
+        return None, None
+
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        data = json.loads(urlsafe_b64decode(cursor + padding).decode('utf-8'))
+        direction, position = data['d'], data['p']
+    except (TypeError, ValueError, KeyError):
+        raise InvalidCursor()
+
+    if direction not in ('after', 'before') or not isinstance(position, list):
+        raise InvalidCursor()
+    return (position, None) if direction == 'after' else (None, position)
+
+
+def get_cursor_link(request, direction: str, position: Optional[list]) -> Optional[str]:
+    if position is None:
+        return None
+
+    url = request.build_absolute_uri()
+    url = remove_query_param(url, 'page')
+    url = replace_query_param(url, PAGINATION_QUERY_PARAM, 'cursor')
+    return replace_query_param(url, CURSOR_QUERY_PARAM, encode_cursor(direction, position))
@@ -0,0 +1,270 @@
+"""
+Run the remote checks of a serializer concurrently.
+
+Some validators do remote I/O: they fetch a URL, or look up a relation in
+another component. Run one after another, validating a request takes as long
+as all of them together. :class:`ConcurrentValidationMixin` starts them on a
+shared pool of ``REMOTE_VALIDATION_THREADS`` threads instead, and waits for
+them, so it takes as long as the slowest check.
+
+* the remote validators of the fields are started while the other fields are
+  validated
+* the remote validators of the serializer are started as soon as the fields
+  are valid, without waiting for the remote checks of the fields. Their
+  result is only used when the fields turn out to be valid, just like
+  validating one after another.
+
+A check that doesn't finish within ``REMOTE_VALIDATION_TIMEOUT`` seconds
+after it started is answered with ``504 Gateway Timeout``: the input may well
+be valid. The time a check waits for a thread doesn't count. A check can't be
+stopped once it runs, but the requests it does time out after ``HTTP_TIMEOUT``
+seconds, so it doesn't keep its thread indefinitely. Set
+``REMOTE_VALIDATION_THREADS`` to 0 to run the checks one after another.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Dict, List, Union
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+from django.utils import translation
+from django.utils.translation import ugettext_lazy as _
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.fields import empty, get_error_detail
+from rest_framework.serializers import ValidationError, as_serializer_error
+from vng_api_common.validators import URLValidator
+
+# validators that fetch the resource behind the URL
+REMOTE_VALIDATORS = (URLValidator,)
+
+_lock = threading.Lock()
+_executor = None
+
+
+def is_remote(validator) -> bool:
+    return getattr(validator, 'remote', False) or isinstance(validator, REMOTE_VALIDATORS)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.REMOTE_VALIDATION_THREADS,
+                thread_name_prefix='remote-validation',
+            )
+        return _executor
+
+
+@receiver(setting_changed)
+def reset_executor(setting, **kwargs):
+    global _executor
+    if setting == 'REMOTE_VALIDATION_THREADS':
+        with _lock:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = None
+
+
+class RemoteValidationTimeout(APIException):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    default_detail = _("The validation did not finish within {timeout} seconds.")
+    default_code = 'validation-timeout'
+
+    def __init__(self):
+        super().__init__(self.default_detail.format(timeout=settings.REMOTE_VALIDATION_TIMEOUT))
+
+
+class RemoteCheck:
+    """
+    A remote check on the pool, with the time it started running.
+    """
+    def __init__(self, validator, value):
+        self.validator = validator
+        self.value = value
+        self.started = None
+        self._running = threading.Event()
+        self.future = get_executor().submit(self.run, translation.get_language())
+        # also when the check is cancelled before it runs
+        self.future.add_done_callback(lambda future: self._running.set())
+
+    def run(self, language: str) -> None:
+        self.started = time.monotonic()
+        self._running.set()
+        _run(self.validator, self.value, language)
+
+    def result(self) -> None:
+        """
+        Wait for the check, and raise its validation error, if any.
+
+        :raises RemoteValidationTimeout: if the check runs for more than
+          ``REMOTE_VALIDATION_TIMEOUT`` seconds
+        """
+        # the running checks are bounded by their HTTP timeouts, so a queued
+        # check starts eventually
+        self._running.wait()
+        if self.started is None:
+            return self.future.result()
+        deadline = self.started + settings.REMOTE_VALIDATION_TIMEOUT
+        try:
+            self.future.result(timeout=max(deadline - time.monotonic(), 0))
+        except TimeoutError:
+            raise RemoteValidationTimeout()
+
+    def cancel(self) -> None:
+        # a running check finishes in the background, its result is ignored
+        self.future.cancel()
+
+
+def _run(validator, value, language: str) -> None:
+    try:
+        # the messages are formatted in the language of the request
+        with translation.override(language):
+            validator(value)
+    finally:
+        # the credentials lookup may have opened a connection for this thread
+        connections.close_all()
+
+
+class RemoteChecks:
+    """
+    The remote checks started while validating the data, by key: the name of
+    the field, or ``None`` for the serializer.
+    """
+    def __init__(self):
+        self.checks = OrderedDict()
+
+    def submit(self, key, validator, value) -> None:
+        self.checks.setdefault(key, []).append(RemoteCheck(validator, value))
+
+    def wait(self, keys) -> Dict[str, List]:
+        """
+        Wait for the checks of ``keys``, and return the errors by key.
+        """
+        errors = OrderedDict()
+        for key in keys:
+            key_errors = self._wait(self.checks.pop(key, []))
+            if key_errors:
+                errors[key] = key_errors
+        return errors
+
+    def _wait(self, checks) -> Union[List, Dict]:
+        errors = []
+        for check in checks:
+            try:
+                check.result()
+            except ValidationError as exc:
+                # errors by field are passed on as is, like DRF does
+                if isinstance(exc.detail, dict):
+                    return exc.detail
+                errors.extend(exc.detail)
+            except DjangoValidationError as exc:
+                errors.extend(get_error_detail(exc))
+        return errors
+
+    def wait_fields(self) -> Dict[str, List]:
+        return self.wait([key for key in self.checks if key is not None])
+
+    def cancel(self) -> None:
+        for checks in self.checks.values():
+            for check in checks:
+                check.cancel()
+        self.checks.clear()
+
+
+class DeferredValidator:
+    """
+    Start the remote validator on the pool, instead of running it.
+    """
+    def __init__(self, serializer, key, validator):
+        self.serializer = serializer
+        self.key = key
+        self.validator = validator
+
+    def set_context(self, field):
+        if hasattr(self.validator, 'set_context'):
+            self.validator.set_context(field)
+
+    def __call__(self, value):
+        self.serializer._remote_checks.submit(self.key, self.validator, value)
+
+
+class ConcurrentValidationMixin:
+    """
+    Run the remote validators of the fields and the serializer concurrently.
+    """
+    def _defer_remote_validators(self) -> None:
+        if getattr(self, '_remote_deferred', False):
+            return
+        self._remote_deferred = True
+
+        for field in self.fields.values():
+            field.validators = [
+                DeferredValidator(self, field.field_name, validator) if is_remote(validator) else validator
+                for validator in field.validators
+            ]
+        self.validators = [
+            DeferredValidator(self, None, validator) if is_remote(validator) else validator
+            for validator in self.validators
+        ]
+
+    def run_validation(self, data=empty):
+        if not settings.REMOTE_VALIDATION_THREADS:
+            return super().run_validation(data)
+
+        (is_empty_value, data) = self.validate_empty_values(data)
+        if is_empty_value:
+            return data
+
+        self._defer_remote_validators()
+        self._remote_checks = checks = RemoteChecks()
+        try:
+            try:
+                value = self.to_internal_value(data)
+            except ValidationError as exc:
+                raise ValidationError(self._merge_errors(exc.detail, checks.wait_fields()))
+
+            try:
+                self.run_validators(value)
+            except (ValidationError, DjangoValidationError) as exc:
+                detail = as_serializer_error(exc)
+            else:
+                detail = {}
+
+            # the fields are validated before the serializer
+            field_errors = checks.wait_fields()
+            if field_errors:
+                raise ValidationError(field_errors)
+
+            errors = checks.wait([None])
+            if None in errors:
+                detail = self._merge_errors(detail, as_serializer_error(ValidationError(errors[None])))
+            if detail:
+                raise ValidationError(detail)
+        finally:
+            checks.cancel()
+
+        try:
+            value = self.validate(value)
+            assert value is not None, '.validate() should return the validated data'
+        except (ValidationError, DjangoValidationError) as exc:
+            raise ValidationError(detail=as_serializer_error(exc))
+
+        return value
+
+    @staticmethod
+    def _merge_errors(detail: dict, errors: dict) -> dict:
+        detail = OrderedDict(detail)
+        for key, value in errors.items():
+            if isinstance(detail.get(key), list) and isinstance(value, list):
+                detail[key] = detail[key] + value
+            else:
+                detail.setdefault(key, value)
+        return detail
@@ -0,0 +1,30 @@
+from collections import OrderedDict
+
+from djangorestframework_camel_case.render import (
+    CamelCaseJSONRenderer as _CamelCaseJSONRenderer
+)
+from rest_framework.renderers import JSONRenderer
+
+
+class CamelizedDict(OrderedDict):
+    """
+    A representation that has camelCase keys already.
+    """
+
+
+class CamelizedList(list):
+    """
+    A list of representations that have camelCase keys already.
+    """
+
+
+class CamelCaseJSONRenderer(_CamelCaseJSONRenderer):
+    """
+    Render JSON with camelCase keys, without camelizing the data again if it
+    is camelized already.
+    """
+
+    def render(self, data, *args, **kwargs):
+        if isinstance(data, (CamelizedDict, CamelizedList)):
+            return JSONRenderer.render(self, data, *args, **kwargs)
+        return super().render(data, *args, **kwargs)
@@ -0,0 +1,136 @@
+"""
+Fast, read-only representation of documents for list responses.
+
+``RetrieveEnkelvoudigInformatieObjectSerializer`` looks up and converts every
+field of every document, and the renderer camelizes all keys afterwards. For
+a page of 100 documents this dominates the CPU time of a list request.
+
+:class:`DocumentRepresentation` gives the same output, from a plan that is
+built once from the fields of the serializer: the camelCase key, the attribute
+of :class:`drc.backend.data.EnkelvoudigInformatieObject` to read and the
+conversion of the field. Gegevensgroepen (like ``integriteit``) are read from
+the flattened attributes of the dataclass directly. The result is marked as
+camelized, so the renderer doesn't camelize it again.
+"""
+import dataclasses
+from datetime import date
+from functools import lru_cache
+from typing import Iterable
+
+from djangorestframework_camel_case.util import camelize
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import SkipField
+from rest_framework.settings import api_settings
+
+from drc.backend.data import EnkelvoudigInformatieObject, PaginationObject
+
+from .renderers import CamelizedDict, CamelizedList
+from .serializers import RetrieveEnkelvoudigInformatieObjectSerializer
+
+MISSING = object()
+
+
+def camel_case(name: str) -> str:
+    return next(iter(camelize({name: None})))
+
+
+@lru_cache(maxsize=4096)
+def format_date(value: date) -> str:
+    return value.isoformat()
+
+
+def get_converter(field: serializers.Field):
+    """
+    Return the function converting a (not ``None``) value of the field.
+    """
+    if isinstance(field, (serializers.Serializer, serializers.ListSerializer)):
+        # the keys of a nested representation are camelized by the renderer
+        return lambda value: camelize(field.to_representation(value))
+
+    to_representation = type(field).to_representation
+    if to_representation is serializers.CharField.to_representation:
+        return str
+    if to_representation is serializers.IntegerField.to_representation:
+        return int
+
+    if to_representation is serializers.DateField.to_representation:
+        if getattr(field, 'format', api_settings.DATE_FORMAT) != ISO_8601:
+            return field.to_representation
+
+        def convert_date(value):
+            # a datetime is a date too, but it is refused by the field
+            if type(value) is date:
+                return format_date(value)
+            return field.to_representation(value)
+        return convert_date
+
+    return field.to_representation
+
+
+class DocumentRepresentation:
+    def __init__(self, serializer_class, document_class):
+        self.serializer_class = serializer_class
+        self.document_class = document_class
+        self._plan = None
+
+    @property
+    def plan(self) -> tuple:
+        if self._plan is None:
+            self._plan = self._build_plan(self.serializer_class()._readable_fields)
+        return self._plan
+
+    def _build_plan(self, fields: Iterable[serializers.Field], prefix: str = '') -> tuple:
+        attributes = {field.name for field in dataclasses.fields(self.document_class)}
+
+        plan = []
+        for field in fields:
+            key = camel_case(field.field_name)
+            if isinstance(field, serializers.Serializer):
+                group_prefix = f'{prefix}{field.source}_'
+                children = field._readable_fields
+                if all(f'{group_prefix}{child.source}' in attributes for child in children):
+                    plan.append((key, None, None, field, self._build_plan(children, group_prefix)))
+                    continue
+            plan.append((key, f'{prefix}{field.source}', get_converter(field), field, None))
+        return tuple(plan)
+
+    def _represent(self, document, plan: tuple) -> CamelizedDict:
+        ret = CamelizedDict()
+        for key, attribute, convert, field, children in plan:
+            if children is not None:
+                ret[key] = self._represent(document, children)
+                continue
+
+            value = getattr(document, attribute, MISSING)
+            if value is MISSING:
+                # properties (and their errors) are handled like the serializer does
+                try:
+                    value = field.get_attribute(document)
+                except SkipField:
+                    continue
+            ret[key] = None if value is None else convert(value)
+        return ret
+
+    def to_representation(self, document) -> CamelizedDict:
+        if type(document) is not self.document_class:
+            return CamelizedDict(camelize(self.serializer_class(instance=document).data))
+        return self._represent(document, self.plan)
+
+    def to_list_representation(self, documents: Iterable) -> CamelizedList:
+        return CamelizedList(self.to_representation(document) for document in documents)
+
+    def to_page_representation(self, page: PaginationObject) -> CamelizedDict:
+        """
+        Return the same as ``PaginateSerializer``.
+        """
+        return CamelizedDict([
+            ('count', None if page.count is None else int(page.count)),
+            ('next', None if page.next is None else str(page.next)),
+            ('previous', None if page.previous is None else str(page.previous)),
+            ('results', self.to_list_representation(page.results)),
+        ])
+
+
+document_representation = DocumentRepresentation(
+    RetrieveEnkelvoudigInformatieObjectSerializer, EnkelvoudigInformatieObject
+)
@@ -4,8 +4,9 @@ Serializers of the Document Registratie Component REST API
 import uuid
 
 from django.conf import settings
+from django.utils.functional import lazy
 from django.utils.http import urlencode
-from django.utils.module_loading import import_string
+from django.utils.text import format_lazy
 from django.utils.translation import ugettext_lazy as _
 
 from drf_extra_fields.fields import Base64FileField
@@ -14,7 +15,6 @@ from privates.storages import PrivateMediaFileSystemStorage
 from rest_framework import serializers
 from rest_framework.reverse import reverse
 from vng_api_common.constants import ObjectTypes, VertrouwelijkheidsAanduiding
-from vng_api_common.models import APICredential
 from vng_api_common.serializers import (
     add_choice_values_help_text
 )
@@ -27,16 +27,29 @@ from drc.datamodel.constants import (
 )
 from drc.datamodel.models import (
     EnkelvoudigInformatieObjectCanonical,
-    Gebruiksrechten
+    Gebruiksrechten, UploadSessie
 )
 
 from .auth import get_zrc_auth, get_ztc_auth
+from .catalogue import CachedResponse, catalogue_cache
+from .credentials import credentials
+from .remote_validation import ConcurrentValidationMixin
 from .validators import (
-    InformatieObjectUniqueValidator, ObjectInformatieObjectValidator,
-    StatusValidator
+    CatalogueURLValidator, InformatieObjectUniqueValidator,
+    ObjectInformatieObjectValidator, StatusValidator
 )
 
 
+def with_choice_values(help_text, choices) -> str:
+    """
+    Append the explanation of the values of ``choices`` to ``help_text``.
+
+    Both are evaluated lazily, when the schema is generated, so the field is
+    declared once with its final help text.
+    """
+    return format_lazy('{}\n\n{}', help_text, lazy(add_choice_values_help_text, str)(choices))
+
+
 class AnyFileType:
     def __contains__(self, item):
         return True
@@ -89,32 +102,26 @@ class AnyBase64File(Base64FileField):
 class IntegriteitSerializer(serializers.Serializer):
     algoritme = serializers.ChoiceField(
         choices=ChecksumAlgoritmes.choices,
-        help_text=_("Aanduiding van algoritme, gebruikt om de checksum te maken.")
+        help_text=with_choice_values(
+            _("Aanduiding van algoritme, gebruikt om de checksum te maken."), ChecksumAlgoritmes
+        )
     )
     waarde = serializers.CharField(min_length=1, max_length=128, help_text=_("De waarde van de checksum."))
     datum = serializers.DateField(help_text=_("Datum waarop de checksum is gemaakt."))
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        value_display_mapping = add_choice_values_help_text(ChecksumAlgoritmes)
-        self.fields['algoritme'].help_text += f"\n\n{value_display_mapping}"
-
 
 class OndertekeningSerializer(serializers.Serializer):
     soort = serializers.ChoiceField(
         choices=OndertekeningSoorten.choices,
-        help_text=_("Aanduiding van de wijze van ondertekening van het INFORMATIEOBJECT")
+        help_text=with_choice_values(
+            _("Aanduiding van de wijze van ondertekening van het INFORMATIEOBJECT"), OndertekeningSoorten
+        )
     )
     datum = serializers.DateField(
         help_text=_("De datum waarop de ondertekening van het INFORMATIEOBJECT heeft plaatsgevonden."))
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        value_display_mapping = add_choice_values_help_text(OndertekeningSoorten)
-        self.fields['soort'].help_text += f"\n\n{value_display_mapping}"
-
 
-class BaseEnkelvoudigInformatieObjectSerializer(serializers.Serializer):
+class BaseEnkelvoudigInformatieObjectSerializer(ConcurrentValidationMixin, serializers.Serializer):
     identificatie = serializers.CharField(
         required=False, max_length=40, allow_blank=True, allow_null=True,
         help_text='Een binnen een gegeven context ondubbelzinnige referentie naar het INFORMATIEOBJECT.'
@@ -133,7 +140,10 @@ class BaseEnkelvoudigInformatieObjectSerializer(serializers.Serializer):
     )
     vertrouwelijkheidaanduiding = serializers.ChoiceField(
         choices=VertrouwelijkheidsAanduiding.choices, default=VertrouwelijkheidsAanduiding.openbaar,
-        help_text='Aanduiding van de mate waarin het INFORMATIEOBJECT voor de openbaarheid bestemd is.'
+        help_text=with_choice_values(
+            'Aanduiding van de mate waarin het INFORMATIEOBJECT voor de openbaarheid bestemd is.',
+            VertrouwelijkheidsAanduiding
+        )
     )
     auteur = serializers.CharField(
         max_length=200, allow_blank=True, allow_null=True,
@@ -142,10 +152,13 @@ class BaseEnkelvoudigInformatieObjectSerializer(serializers.Serializer):
     status = serializers.ChoiceField(
         choices=Statussen.choices, required=False, allow_blank=True, allow_null=True,
         validators=[StatusValidator()],
-        help_text=_("Aanduiding van de stand van zaken van een INFORMATIEOBJECT. De waarden 'in bewerking'"
-                    " en 'ter vaststelling' komen niet voor als het attribuut ontvangstdatum van een waarde"
-                    " is voorzien. Wijziging van de Status in 'gearchiveerd' impliceert dat het"
-                    " informatieobject een duurzaam, niet-wijzigbaar Formaat dient te hebben.")
+        help_text=with_choice_values(
+            _("Aanduiding van de stand van zaken van een INFORMATIEOBJECT. De waarden 'in bewerking'"
+              " en 'ter vaststelling' komen niet voor als het attribuut ontvangstdatum van een waarde"
+              " is voorzien. Wijziging van de Status in 'gearchiveerd' impliceert dat het"
+              " informatieobject een duurzaam, niet-wijzigbaar Formaat dient te hebben."),
+            Statussen
+        )
     )
     formaat = serializers.CharField(
         max_length=255, required=False, allow_blank=True, allow_null=True,
@@ -195,7 +208,7 @@ class BaseEnkelvoudigInformatieObjectSerializer(serializers.Serializer):
                     " van toepassing zijn raadplegen via de Gebruiksrechten resource.")
     )
     informatieobjecttype = serializers.URLField(
-        max_length=200, allow_null=True, validators=[URLValidator(get_auth=get_ztc_auth)],
+        max_length=200, allow_null=True, validators=[CatalogueURLValidator(get_auth=get_ztc_auth)],
         help_text='URL naar de INFORMATIEOBJECTTYPE in het ZTC.'
     )
     ondertekening = OndertekeningSerializer(
@@ -208,27 +221,16 @@ class BaseEnkelvoudigInformatieObjectSerializer(serializers.Serializer):
         help_text=_("Uitdrukking van mate van volledigheid en onbeschadigd zijn van digitaal bestand.")
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        value_display_mapping = add_choice_values_help_text(VertrouwelijkheidsAanduiding)
-        self.fields['vertrouwelijkheidaanduiding'].help_text += f"\n\n{value_display_mapping}"
-
-        value_display_mapping = add_choice_values_help_text(Statussen)
-        self.fields['status'].help_text += f"\n\n{value_display_mapping}"
-
     def _get_informatieobjecttype(self, informatieobjecttype_url: str) -> dict:
-        if not hasattr(self, 'informatieobjecttype'):
-            # dynamic so that it can be mocked in tests easily
-            Client = import_string(settings.ZDS_CLIENT_CLASS)
-            client = Client.from_url(informatieobjecttype_url)
-            client.auth = APICredential.get_auth(
-                informatieobjecttype_url,
-                scopes=['zds.scopes.zaaktypes.lezen']
-            )
-            self._informatieobjecttype = client.request(informatieobjecttype_url, 'informatieobjecttype')
+        if not hasattr(self, '_informatieobjecttype'):
+            response = catalogue_cache.get(informatieobjecttype_url, self._fetch_informatieobjecttype)
+            self._informatieobjecttype = response.json()
         return self._informatieobjecttype
 
+    def _fetch_informatieobjecttype(self, informatieobjecttype_url: str) -> CachedResponse:
+        client = credentials.get_client(informatieobjecttype_url, scopes=['zds.scopes.zaaktypes.lezen'])
+        return CachedResponse(200, client.request(informatieobjecttype_url, 'informatieobjecttype'))
+
     def validate_indicatie_gebruiksrecht(self, indicatie):
         if self.instance and not indicatie and self.instance.canonical.gebruiksrechten_set.exists():
             raise serializers.ValidationError(
@@ -299,6 +301,52 @@ class RetrieveEnkelvoudigInformatieObjectSerializer(BaseEnkelvoudigInformatieObj
         ]
 
 
+class UploadSessieSerializer(serializers.HyperlinkedModelSerializer):
+    voltooid = serializers.BooleanField(
+        read_only=True,
+        help_text=_("Geeft aan of alle bytes van het bestand ontvangen zijn.")
+    )
+
+    class Meta:
+        model = UploadSessie
+        fields = (
+            'url',
+            'bestandsnaam',
+            'bestandsomvang',
+            'ontvangen',
+            'voltooid',
+            'informatieobject',
+        )
+        read_only_fields = ('ontvangen',)
+        extra_kwargs = {
+            'url': {
+                'lookup_field': 'uuid',
+            },
+        }
+
+
+class VoltooiUploadSessieSerializer(BaseEnkelvoudigInformatieObjectSerializer):
+    """
+    Metadata for the document that is created (or versioned) when completing
+    an upload session. The content is the uploaded file, not a base64 string.
+    """
+    def create(self, inhoud):
+        """
+        Handle the create calls.
+        """
+        data = self.validated_data.copy()
+        data['inhoud'] = inhoud
+        return drc_storage_adapter.creeer_enkelvoudiginformatieobject(data)
+
+    def update(self, identificatie, lock, inhoud):
+        """
+        Handle the update calls.
+        """
+        data = self.validated_data.copy()
+        data['inhoud'] = inhoud
+        return drc_storage_adapter.update_enkenvoudiginformatieobject(identificatie, lock, data)
+
+
 class PaginateSerializer(serializers.Serializer):
     count = serializers.IntegerField()
     next = serializers.URLField()
@@ -306,6 +354,28 @@ class PaginateSerializer(serializers.Serializer):
     results = RetrieveEnkelvoudigInformatieObjectSerializer(many=True, read_only=True)
 
 
+class EnkelvoudigInformatieObjectZoekSerializer(serializers.Serializer):
+    uuid__in = serializers.ListField(
+        child=serializers.UUIDField(),
+        min_length=1, max_length=500,
+        help_text=_("De UUIDs van de (ENKELVOUDIGe) INFORMATIEOBJECTen.")
+    )
+
+
+class BulkResultaatSerializer(serializers.Serializer):
+    status = serializers.IntegerField(
+        help_text=_("De HTTP status code voor dit document: 201 als het is aangemaakt.")
+    )
+    document = RetrieveEnkelvoudigInformatieObjectSerializer(
+        read_only=True, allow_null=True,
+        help_text=_("Het aangemaakte (ENKELVOUDIG) INFORMATIEOBJECT.")
+    )
+    fouten = serializers.DictField(
+        read_only=True, allow_null=True,
+        help_text=_("De fouten waardoor het document niet is aangemaakt.")
+    )
+
+
 class EnkelvoudigInformatieObjectWithLockSerializer(EnkelvoudigInformatieObjectSerializer):
     """
     This serializer class is used by EnkelvoudigInformatieObjectViewSet for
@@ -370,6 +440,17 @@ class LockEnkelvoudigInformatieObjectSerializer(serializers.ModelSerializer):
         return self.instance
 
 
+class VerlengLockEnkelvoudigInformatieObjectSerializer(serializers.Serializer):
+    """
+    The request body of the lock action: a lock to renew, or nothing to lock
+    the document.
+    """
+    lock = serializers.CharField(
+        required=False,
+        help_text=_("Het `lock` om te verlengen. Zonder `lock` wordt het INFORMATIEOBJECT vergrendeld."),
+    )
+
+
 class UnlockEnkelvoudigInformatieObjectSerializer(serializers.ModelSerializer):
     """
     Serializer for the unlock action of EnkelvoudigInformatieObjectCanonical
@@ -406,7 +487,7 @@ class UnlockEnkelvoudigInformatieObjectSerializer(serializers.ModelSerializer):
         return self.instance
 
 
-class ObjectInformatieObjectSerializer(serializers.Serializer):
+class ObjectInformatieObjectSerializer(ConcurrentValidationMixin, serializers.Serializer):
     url = serializers.URLField(allow_blank=True, allow_null=True, required=False)
     informatieobject = serializers.URLField(
         allow_blank=True,
@@ -423,7 +504,7 @@ class ObjectInformatieObjectSerializer(serializers.Serializer):
         allow_null=True,
         choices=ObjectTypes.choices,
         validators=[IsImmutableValidator()],
-        help_text="Het type van het gerelateerde OBJECT.\n\nUitleg bij mogelijke waarden:"
+        help_text=with_choice_values("Het type van het gerelateerde OBJECT.", ObjectTypes)
     )
 
     class Meta:
@@ -446,15 +527,6 @@ class ObjectInformatieObjectSerializer(serializers.Serializer):
         }
         validators = [ObjectInformatieObjectValidator(), InformatieObjectUniqueValidator('object', 'informatieobject')]
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        value_display_mapping = add_choice_values_help_text(ObjectTypes)
-        self.fields['object_type'].help_text += f"\n\n{value_display_mapping}"
-
-        if not hasattr(self, 'initial_data'):
-            return
-
     def create(self):
         """
         Handle backend calls.
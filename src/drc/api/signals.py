@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from vng_api_common.authorizations.models import Applicatie, Autorisatie
+
+from .data_filtering import invalidate_authorizations
+
+
+@receiver(pre_save, sender=Applicatie)
+def invalidate_previous_client_ids(sender, instance, **kwargs):
+    # client ids that are removed from the applicatie lose its authorizations
+    if instance.pk is None:
+        return
+    previous = Applicatie.objects.filter(pk=instance.pk).values_list('client_ids', flat=True).first()
+    if previous:
+        invalidate_authorizations(previous)
+
+
+@receiver([post_save, post_delete], sender=Applicatie)
+def invalidate_applicatie(sender, instance, **kwargs):
+    invalidate_authorizations(instance.client_ids)
+
+
+@receiver([post_save, post_delete], sender=Autorisatie)
+def invalidate_autorisatie(sender, instance, **kwargs):
+    try:
+        applicatie = instance.applicatie
+    except Applicatie.DoesNotExist:
+        # deleted together with the applicatie, which invalidates itself
+        return
+    invalidate_authorizations(applicatie.client_ids)
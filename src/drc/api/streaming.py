@@ -0,0 +1,210 @@
+"""
+Stream document content to and from clients, with support for byte ranges.
+
+Backends return the content as a file-like object (or an iterable of chunks),
+which is streamed to the client in chunks of ``settings.DOWNLOAD_CHUNK_SIZE``
+so the memory use of a download does not depend on the size of the document.
+Uploads in parts use ``Content-Range`` to indicate where a part belongs.
+"""
+import io
+import re
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(?P<start>\d*)-(?P<end>\d*)$')
+CONTENT_RANGE_RE = re.compile(r'^bytes (?P<start>\d+)-(?P<end>\d+)/(?P<size>\d+|\*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range_header(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a ``Range`` header into an inclusive ``(start, end)`` byte range.
+
+    Only a single range is supported. Headers that can't be parsed or that
+    request multiple ranges are ignored (``None``), in which case the full
+    content is sent, as allowed by RFC 7233.
+
+    :raises RangeNotSatisfiable: if the range lies outside of the content
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    start, end = match.group('start'), match.group('end')
+    if not start and not end:
+        return None
+
+    if not start:
+        # suffix range - the last N bytes
+        suffix_length = int(end)
+        if suffix_length == 0:
+            raise RangeNotSatisfiable()
+        return max(size - suffix_length, 0), size - 1
+
+    start = int(start)
+    if end and int(end) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    end = int(end) if end else size - 1
+    return start, min(end, size - 1)
+
+
+def parse_content_range_header(header: str) -> Optional[Tuple[int, int, Optional[int]]]:
+    """
+    Parse a ``Content-Range`` header into ``(start, end, size)``.
+
+    The ``end`` is inclusive and ``size`` is ``None`` if the complete size is
+    unknown (``*``). Returns ``None`` if the header is invalid.
+    """
+    match = CONTENT_RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    start, end = int(match.group('start')), int(match.group('end'))
+    size = None if match.group('size') == '*' else int(match.group('size'))
+    if end < start or (size is not None and end >= size):
+        return None
+    return start, end, size
+
+
+def get_content_size(content) -> Optional[int]:
+    """
+    Determine the size of the content without reading it.
+    """
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+
+    size = getattr(content, 'size', None)
+    if size is not None:
+        return size
+
+    if _is_seekable(content):
+        position = content.tell()
+        size = content.seek(0, io.SEEK_END)
+        content.seek(position)
+        return size
+    return None
+
+
+def _is_seekable(content) -> bool:
+    seekable = getattr(content, 'seekable', None)
+    if seekable is not None:
+        try:
+            return seekable()
+        except (ValueError, OSError):
+            return False
+    return hasattr(content, 'seek') and hasattr(content, 'tell')
+
+
+def iter_content(content, start: int = 0, length: Optional[int] = None, chunk_size: int = None):
+    """
+    Yield (a range of) the content in chunks, closing it when done.
+    """
+    chunk_size = chunk_size or settings.DOWNLOAD_CHUNK_SIZE
+
+    if isinstance(content, (bytes, bytearray)):
+        content = io.BytesIO(content)
+
+    try:
+        if not hasattr(content, 'read'):
+            # an iterable of chunks, only full downloads are possible
+            yield from content
+            return
+
+        if start:
+            if _is_seekable(content):
+                content.seek(start)
+            else:
+                _skip(content, start, chunk_size)
+
+        remaining = length
+        while remaining is None or remaining > 0:
+            to_read = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = content.read(to_read)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+    finally:
+        _close(content)
+
+
+def _close(content) -> None:
+    close = getattr(content, 'close', None)
+    if close is not None:
+        close()
+
+
+def _skip(content, amount: int, chunk_size: int) -> None:
+    while amount > 0:
+        chunk = content.read(min(chunk_size, amount))
+        if not chunk:
+            break
+        amount -= len(chunk)
+
+
+def _if_range_matches(if_range: str, etag: Optional[str], last_modified: Optional[int]) -> bool:
+    if if_range.startswith(('"', 'W/')):
+        # weak validators can never be used for ranges
+        return etag is not None and not if_range.startswith('W/') and if_range == etag
+
+    if last_modified is None:
+        return False
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def build_download_response(request, content, filename: str, content_type: str = "application/octet-stream",
+                            etag: Optional[str] = None, last_modified: Optional[int] = None) -> HttpResponse:
+    """
+    Build a streaming response for the content, honouring ``Range`` and ``If-Range``.
+
+    :param content: a file-like object, an iterable of bytes or bytes
+    :param etag: the (strong) ETag of the content, used to evaluate ``If-Range``
+    :param last_modified: timestamp of the content, used to evaluate ``If-Range``
+    """
+    size = get_content_size(content)
+    byte_range = None
+
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and size is not None:
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if not if_range or _if_range_matches(if_range, etag, last_modified):
+            try:
+                byte_range = parse_range_header(range_header, size)
+            except RangeNotSatisfiable:
+                _close(content)
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f"bytes */{size}"
+                return response
+
+    if byte_range is None:
+        response = StreamingHttpResponse(iter_content(content), content_type=content_type)
+        if size is not None:
+            response['Content-Length'] = str(size)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            iter_content(content, start=start, length=length),
+            status=206,
+            content_type=content_type
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f"bytes {start}-{end}/{size}"
+
+    if size is not None:
+        response['Accept-Ranges'] = 'bytes'
+    if etag:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response["Content-Disposition"] = f"attachment; filename={filename}.bin"
+    return response
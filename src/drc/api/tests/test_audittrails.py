@@ -1,7 +1,11 @@
 import uuid
 from base64 import b64encode
-from datetime import datetime
+from datetime import datetime, timezone
+from io import StringIO
+from unittest.mock import patch
 
+from django.core.management import call_command
+from django.db import DatabaseError
 from django.test import override_settings
 
 from freezegun import freeze_time
@@ -15,7 +19,7 @@ from vng_api_common.utils import get_uuid_from_path
 from drc.backend import drc_storage_adapter
 from drc.datamodel.models import (
     EnkelvoudigInformatieObject, EnkelvoudigInformatieObjectCanonical,
-    Gebruiksrechten, ObjectInformatieObject
+    Gebruiksrechten, ObjectInformatieObject, UitgaandeAuditTrail
 )
 from drc.datamodel.tests.factories import EnkelvoudigInformatieObjectFactory
 
@@ -270,3 +274,40 @@ class AuditTrailTests(JWTAuthMixin, APITestCase):
         # Verify that the resource weergave stored in the AuditTrail matches
         # the unique representation as defined in the Zaak model
         self.assertIn(audittrail.resource_weergave, eio_unique_representation)
+
+    @override_settings(AUDITTRAIL_DELIVERY='async')
+    def test_audittrail_outbox(self):
+        with freeze_time('2019-01-01T12:00:00'):
+            eio_response = self._create_enkelvoudiginformatieobject()
+
+        self.assertFalse(AuditTrail.objects.exists())
+        self.assertEqual(UitgaandeAuditTrail.objects.count(), 1)
+
+        call_command('write_audittrails', stdout=StringIO())
+
+        audittrail = AuditTrail.objects.get()
+        self.assertEqual(audittrail.hoofd_object, eio_response['url'])
+        self.assertEqual(audittrail.nieuw, eio_response)
+        self.assertEqual(audittrail.aanmaakdatum, datetime(2019, 1, 1, 12, tzinfo=timezone.utc))
+        self.assertFalse(UitgaandeAuditTrail.objects.exists())
+
+    @override_settings(AUDITTRAIL_DELIVERY='async')
+    def test_audittrail_outbox_not_written_for_failed_request(self):
+        response = self.client.post(self.informatieobject_list_url, {})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(UitgaandeAuditTrail.objects.exists())
+
+    def test_audittrail_written_in_transaction(self):
+        with patch.object(AuditTrail.objects, 'bulk_create', wraps=AuditTrail.objects.bulk_create) as mock_bulk_create:
+            eio_response = self._create_enkelvoudiginformatieobject()
+
+        mock_bulk_create.assert_called_once()
+        self.assertTrue(AuditTrail.objects.filter(hoofd_object=eio_response['url']).exists())
+
+    def test_no_changes_without_audittrail(self):
+        with patch.object(AuditTrail.objects, 'bulk_create', side_effect=DatabaseError('no audit trails')):
+            with self.assertRaises(DatabaseError):
+                self._create_enkelvoudiginformatieobject()
+
+        self.assertFalse(EnkelvoudigInformatieObject.objects.exists())
@@ -0,0 +1,91 @@
+import uuid
+from base64 import b64encode
+
+from django.test import override_settings
+
+from privates.test import temp_private_root
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.audittrails.models import AuditTrail
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import JWTAuthMixin, reverse
+
+from drc.api.scopes import SCOPE_DOCUMENTEN_AANMAKEN
+from drc.datamodel.models import (
+    EnkelvoudigInformatieObject, UitgaandeNotificatie
+)
+
+INFORMATIEOBJECTTYPE = 'https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1'
+
+
+def _document(**overrides):
+    return {
+        'identificatie': uuid.uuid4().hex,
+        'bronorganisatie': '159351741',
+        'creatiedatum': '2018-06-27',
+        'titel': 'detailed summary',
+        'auteur': 'test_auteur',
+        'formaat': 'txt',
+        'taal': 'eng',
+        'bestandsnaam': 'dummy.txt',
+        'inhoud': b64encode(b'some file content').decode('utf-8'),
+        'informatieobjecttype': INFORMATIEOBJECTTYPE,
+        'vertrouwelijkheidaanduiding': VertrouwelijkheidsAanduiding.openbaar,
+        **overrides
+    }
+
+
+@temp_private_root()
+@override_settings(
+    LINK_FETCHER='vng_api_common.mocks.link_fetcher_200',
+    NOTIFICATIONS_DISABLED=False,
+    NOTIFICATIONS_DELIVERY='async',
+)
+class BulkCreateTests(JWTAuthMixin, APITestCase):
+
+    scopes = [SCOPE_DOCUMENTEN_AANMAKEN]
+    informatieobjecttype = INFORMATIEOBJECTTYPE
+    max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.openbaar
+    url = reverse('enkelvoudiginformatieobjecten-bulk')
+
+    def test_create(self):
+        response = self.client.post(self.url, [_document(), _document()], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual([resultaat['status'] for resultaat in response.json()], [201, 201])
+        self.assertEqual(EnkelvoudigInformatieObject.objects.count(), 2)
+        for eio in EnkelvoudigInformatieObject.objects.select_related('canonical'):
+            self.assertEqual(eio.canonical.latest_id, eio.pk)
+        self.assertEqual(UitgaandeNotificatie.objects.filter(bericht__actie='create').count(), 2)
+        self.assertEqual(AuditTrail.objects.filter(actie='create').count(), 2)
+
+    def test_partial(self):
+        invalid = _document(titel='')
+        forbidden = _document(vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim)
+        first = _document()
+        duplicate = _document(identificatie=first['identificatie'])
+
+        response = self.client.post(self.url, [invalid, first, forbidden, duplicate], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS, response.data)
+        resultaten = response.json()
+        self.assertEqual([resultaat['status'] for resultaat in resultaten], [400, 201, 403, 400])
+        self.assertIn('titel', resultaten[0]['fouten'])
+        self.assertEqual(resultaten[1]['document']['identificatie'], first['identificatie'])
+        self.assertIn('identificatie', resultaten[3]['fouten'])
+        self.assertEqual(EnkelvoudigInformatieObject.objects.count(), 1)
+
+    def test_nothing_created(self):
+        response = self.client.post(self.url, [_document(titel='')], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(EnkelvoudigInformatieObject.objects.exists())
+        self.assertFalse(UitgaandeNotificatie.objects.exists())
+        self.assertFalse(AuditTrail.objects.exists())
+
+    @override_settings(BULK_CREATE_MAX_SIZE=1)
+    def test_too_many(self):
+        response = self.client.post(self.url, [_document(), _document()], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()['invalidParams'][0]['code'], 'bulk-too-large')
@@ -0,0 +1,135 @@
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from privates.test import temp_private_root
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import JWTAuthMixin, reverse
+
+from drc.api.scopes import SCOPE_DOCUMENTEN_ALLES_LEZEN
+from drc.api.utils import get_objectinformatieobject_etag
+from drc.backend.data import ObjectInformatieObject
+from drc.datamodel.models import (
+    DocumentLock, EnkelvoudigInformatieObject,
+    EnkelvoudigInformatieObjectCanonical
+)
+
+INFORMATIEOBJECTTYPE = 'https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1'
+
+
+@temp_private_root()
+class ConditionalRetrieveTests(JWTAuthMixin, APITestCase):
+
+    heeft_alle_autorisaties = True
+
+    def setUp(self):
+        super().setUp()
+        canonical = EnkelvoudigInformatieObjectCanonical.objects.create()
+        self.eio = EnkelvoudigInformatieObject.objects.create(
+            canonical=canonical,
+            bronorganisatie='159351741',
+            creatiedatum='2018-06-27',
+            titel='some titel',
+            auteur='some auteur',
+            taal='nld',
+            inhoud=ContentFile(b'some content', name='dummy.txt'),
+            informatieobjecttype=INFORMATIEOBJECTTYPE,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+        self.url = reverse('enkelvoudiginformatieobjecten-detail', kwargs={'uuid': self.eio.uuid})
+
+    def test_headers(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertTrue(response['ETag'].startswith('"'))
+        # the document changes in place, without a new version
+        self.assertNotIn('Last-Modified', response)
+
+    def test_if_none_match(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since(self):
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE='Wed, 21 Oct 2099 07:28:00 GMT')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_new_version(self):
+        etag = self.client.get(self.url)['ETag']
+        versie = EnkelvoudigInformatieObject.objects.get(pk=self.eio.pk)
+        versie.pk = None
+        versie.versie = 2
+        versie.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_other_version(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, {'versie': 1}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_locked(self):
+        etag = self.client.get(self.url)['ETag']
+        self.eio.canonical.lock = 'some-lock'
+        self.eio.canonical.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['locked'])
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_expired_lock(self):
+        etag = self.client.get(self.url)['ETag']
+        self.eio.canonical.lock = 'some-lock'
+        self.eio.canonical.save()
+        DocumentLock.objects.create(uuid=self.eio.uuid, lock='some-lock', verloopt_op=timezone.now())
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        # shown as not locked
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_not_found(self):
+        url = reverse('enkelvoudiginformatieobjecten-detail', kwargs={
+            'uuid': 'e8e15b0d-7f5f-4eda-9d24-7e1bd8b47c3a'
+        })
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"foo"')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ObjectInformatieObjectETagTests(SimpleTestCase):
+
+    def _oio(self, **overrides):
+        return ObjectInformatieObject(**{
+            'url': 'http://testserver/api/v1/objectinformatieobjecten/1',
+            'informatieobject': 'http://testserver/api/v1/enkelvoudiginformatieobjecten/1',
+            'object': 'https://zrc.nl/api/v1/zaken/1',
+            'object_type': 'zaak',
+            'aard_relatie': 'hoort_bij',
+            'titel': '',
+            'beschrijving': '',
+            'registratiedatum': '2018-06-27T00:00:00Z',
+            **overrides
+        })
+
+    def test_changes_with_attributes(self):
+        self.assertEqual(get_objectinformatieobject_etag(self._oio()), get_objectinformatieobject_etag(self._oio()))
+        self.assertNotEqual(
+            get_objectinformatieobject_etag(self._oio()),
+            get_objectinformatieobject_etag(self._oio(beschrijving='other'))
+        )
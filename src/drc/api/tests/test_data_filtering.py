@@ -0,0 +1,213 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import (
+    SimpleTestCase, TestCase, TransactionTestCase, override_settings
+)
+
+from vng_api_common.authorizations.models import Applicatie, Autorisatie
+from vng_api_common.constants import (
+    ComponentTypes, VertrouwelijkheidsAanduiding
+)
+
+from drc.api.data_filtering import get_authorization_predicate
+from drc.api.scopes import (
+    SCOPE_DOCUMENTEN_AANMAKEN, SCOPE_DOCUMENTEN_ALLES_LEZEN
+)
+from drc.backend import BackendException
+from drc.backend.adapter import DRCStorageAdapter
+from drc.backend.django import DjangoDRCStorageBackend
+from drc.datamodel.models import EnkelvoudigInformatieObject
+from drc.datamodel.query import AuthorizationPredicate
+from drc.datamodel.tests.factories import EnkelvoudigInformatieObjectFactory
+
+IOTYPE_1 = 'https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1'
+IOTYPE_2 = 'https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/2'
+
+
+def _autorisatie(informatieobjecttype, max_vertrouwelijkheidaanduiding, scopes=(SCOPE_DOCUMENTEN_ALLES_LEZEN,)):
+    return SimpleNamespace(
+        informatieobjecttype=informatieobjecttype,
+        max_vertrouwelijkheidaanduiding=max_vertrouwelijkheidaanduiding,
+        scopes=[scope.label for scope in scopes],
+    )
+
+
+class AuthorizationPredicateTests(SimpleTestCase):
+
+    def test_compile(self):
+        predicate = AuthorizationPredicate.from_authorizations(SCOPE_DOCUMENTEN_ALLES_LEZEN, [
+            _autorisatie(IOTYPE_1, VertrouwelijkheidsAanduiding.openbaar),
+            _autorisatie(IOTYPE_1, VertrouwelijkheidsAanduiding.intern),
+            _autorisatie(IOTYPE_2, VertrouwelijkheidsAanduiding.geheim, scopes=[SCOPE_DOCUMENTEN_AANMAKEN]),
+        ])
+
+        self.assertTrue(predicate.allows(IOTYPE_1, VertrouwelijkheidsAanduiding.intern))
+        self.assertFalse(predicate.allows(IOTYPE_1, VertrouwelijkheidsAanduiding.vertrouwelijk))
+        # the scope is not granted for this informatieobjecttype
+        self.assertFalse(predicate.allows(IOTYPE_2, VertrouwelijkheidsAanduiding.openbaar))
+        self.assertEqual(
+            list(predicate.pairs()),
+            [
+                (IOTYPE_1, VertrouwelijkheidsAanduiding.openbaar),
+                (IOTYPE_1, VertrouwelijkheidsAanduiding.beperkt_openbaar),
+                (IOTYPE_1, VertrouwelijkheidsAanduiding.intern),
+            ]
+        )
+
+    def test_empty(self):
+        predicate = AuthorizationPredicate.from_authorizations(SCOPE_DOCUMENTEN_ALLES_LEZEN, [])
+
+        self.assertFalse(predicate)
+
+
+class FilterForPredicateTests(TestCase):
+
+    def test_filter(self):
+        allowed = EnkelvoudigInformatieObjectFactory.create(
+            informatieobjecttype=IOTYPE_1, vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar
+        )
+        EnkelvoudigInformatieObjectFactory.create(
+            informatieobjecttype=IOTYPE_1, vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim
+        )
+        EnkelvoudigInformatieObjectFactory.create(
+            informatieobjecttype=IOTYPE_2, vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar
+        )
+        predicate = AuthorizationPredicate.from_authorizations(SCOPE_DOCUMENTEN_ALLES_LEZEN, [
+            _autorisatie(IOTYPE_1, VertrouwelijkheidsAanduiding.openbaar)
+        ])
+
+        filtered = EnkelvoudigInformatieObject.objects.filter_for_predicate(predicate)
+
+        self.assertEqual([eio.uuid for eio in filtered], [allowed.uuid])
+
+    def test_filter_nothing_allowed(self):
+        EnkelvoudigInformatieObjectFactory.create()
+
+        filtered = EnkelvoudigInformatieObject.objects.filter_for_predicate(AuthorizationPredicate({}))
+
+        self.assertFalse(filtered.exists())
+
+
+class UnfilteredBackend(DjangoDRCStorageBackend):
+    # like a backend that can't filter in its queries
+    supports_authorizations = False
+
+
+class FilterFallbackTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.adapter = DRCStorageAdapter()
+        self.adapter._backend = UnfilteredBackend()
+        self.allowed = []
+        for i in range(7):
+            eio = EnkelvoudigInformatieObjectFactory.create(
+                informatieobjecttype=IOTYPE_1 if i % 2 else IOTYPE_2,
+                vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+            )
+            if i % 2:
+                self.allowed.append(str(eio.uuid))
+        self.predicate = AuthorizationPredicate.from_authorizations(SCOPE_DOCUMENTEN_ALLES_LEZEN, [
+            _autorisatie(IOTYPE_1, VertrouwelijkheidsAanduiding.openbaar)
+        ])
+
+    def test_page_numbers_refused(self):
+        # every page would be read from the first page of the backend
+        with self.assertRaises(BackendException):
+            self.adapter.lees_enkelvoudiginformatieobjecten(1, 2, None, autorisaties=self.predicate)
+
+    def test_cursor_pages(self):
+        first = self.adapter.lees_enkelvoudiginformatieobjecten_cursor(2, autorisaties=self.predicate)
+        second = self.adapter.lees_enkelvoudiginformatieobjecten_cursor(
+            2, after=first.next_position, autorisaties=self.predicate
+        )
+        previous = self.adapter.lees_enkelvoudiginformatieobjecten_cursor(
+            2, before=second.previous_position, autorisaties=self.predicate
+        )
+
+        self.assertEqual([document.uuid for document in first.results], self.allowed[:2])
+        self.assertEqual([document.uuid for document in second.results], self.allowed[2:])
+        self.assertIsNone(second.next_position)
+        self.assertIsNone(second.count)
+        self.assertEqual([document.uuid for document in previous.results], self.allowed[:2])
+
+    def test_cursor_pages_read_full_pages(self):
+        predicate = AuthorizationPredicate.from_authorizations(SCOPE_DOCUMENTEN_ALLES_LEZEN, [
+            _autorisatie(IOTYPE_2, VertrouwelijkheidsAanduiding.openbaar)
+        ])
+        documents = EnkelvoudigInformatieObject.objects.order_by('begin_registratie', 'pk')
+        allowed = [str(eio.uuid) for eio in documents if eio.informatieobjecttype == IOTYPE_2]
+        # the second page fills up in the middle of a page of the backend
+        allowed.append(str(EnkelvoudigInformatieObjectFactory.create(
+            informatieobjecttype=IOTYPE_2, vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar
+        ).uuid))
+
+        with patch.object(
+            UnfilteredBackend, 'get_documents_by_cursor', autospec=True,
+            side_effect=DjangoDRCStorageBackend.get_documents_by_cursor
+        ) as get_documents_by_cursor:
+            pages = [self.adapter.lees_enkelvoudiginformatieobjecten_cursor(2, autorisaties=predicate)]
+            while pages[-1].next_position is not None:
+                pages.append(self.adapter.lees_enkelvoudiginformatieobjecten_cursor(
+                    2, after=pages[-1].next_position, autorisaties=predicate
+                ))
+
+        self.assertEqual(
+            [[document.uuid for document in page.results] for page in pages],
+            [allowed[:2], allowed[2:4], allowed[4:]]
+        )
+        self.assertEqual({call[1]['page_size'] for call in get_documents_by_cursor.call_args_list}, {2})
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AuthorizationsCacheTests(TransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.applicatie = Applicatie.objects.create(client_ids=['cache-test'], label='test')
+        self.autorisatie = Autorisatie.objects.create(
+            applicatie=self.applicatie,
+            component=ComponentTypes.drc,
+            scopes=[SCOPE_DOCUMENTEN_ALLES_LEZEN.label],
+            informatieobjecttype=IOTYPE_1,
+            max_vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+        applicaties = Applicatie.objects.filter(client_ids__contains=['cache-test'])
+        self.jwt_auth = SimpleNamespace(
+            client_id='cache-test',
+            applicaties=applicaties,
+            autorisaties=Autorisatie.objects.filter(applicatie__in=applicaties),
+        )
+
+    def test_cached_per_client(self):
+        predicate = get_authorization_predicate(self.jwt_auth, SCOPE_DOCUMENTEN_ALLES_LEZEN)
+
+        with self.assertNumQueries(0):
+            cached = get_authorization_predicate(self.jwt_auth, SCOPE_DOCUMENTEN_ALLES_LEZEN)
+
+        self.assertEqual(cached, predicate)
+
+    def test_invalidated_when_autorisatie_changes(self):
+        get_authorization_predicate(self.jwt_auth, SCOPE_DOCUMENTEN_ALLES_LEZEN)
+
+        self.autorisatie.max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.geheim
+        self.autorisatie.save()
+
+        predicate = get_authorization_predicate(self.jwt_auth, SCOPE_DOCUMENTEN_ALLES_LEZEN)
+        self.assertTrue(predicate.allows(IOTYPE_1, VertrouwelijkheidsAanduiding.geheim))
+
+    def test_invalidated_when_applicatie_changes(self):
+        get_authorization_predicate(self.jwt_auth, SCOPE_DOCUMENTEN_ALLES_LEZEN)
+
+        self.applicatie.heeft_alle_autorisaties = True
+        self.applicatie.save()
+
+        self.assertIsNone(get_authorization_predicate(self.jwt_auth, SCOPE_DOCUMENTEN_ALLES_LEZEN))
+
+    def test_other_scope(self):
+        get_authorization_predicate(self.jwt_auth, SCOPE_DOCUMENTEN_ALLES_LEZEN)
+
+        predicate = get_authorization_predicate(self.jwt_auth, SCOPE_DOCUMENTEN_AANMAKEN)
+
+        self.assertFalse(predicate)
@@ -0,0 +1,110 @@
+from io import BytesIO
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.http import http_date
+
+from drc.api.streaming import (
+    RangeNotSatisfiable, build_download_response, parse_content_range_header,
+    parse_range_header
+)
+
+CONTENT = b'0123456789' * 10
+ETAG = '"some-etag"'
+
+
+class ParseRangeHeaderTests(SimpleTestCase):
+
+    def test_start_and_end(self):
+        self.assertEqual(parse_range_header('bytes=0-9', 100), (0, 9))
+
+    def test_open_ended(self):
+        self.assertEqual(parse_range_header('bytes=90-', 100), (90, 99))
+
+    def test_suffix(self):
+        self.assertEqual(parse_range_header('bytes=-5', 100), (95, 99))
+
+    def test_end_clipped_to_size(self):
+        self.assertEqual(parse_range_header('bytes=50-500', 100), (50, 99))
+
+    def test_multiple_ranges_ignored(self):
+        self.assertIsNone(parse_range_header('bytes=0-1,5-6', 100))
+
+    def test_invalid_ignored(self):
+        self.assertIsNone(parse_range_header('items=0-1', 100))
+        self.assertIsNone(parse_range_header('bytes=9-0', 100))
+
+    def test_unsatisfiable(self):
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range_header('bytes=100-', 100)
+
+
+@override_settings(DOWNLOAD_CHUNK_SIZE=16)
+class BuildDownloadResponseTests(SimpleTestCase):
+
+    def _get(self, **headers):
+        request = RequestFactory().get('/', **headers)
+        return build_download_response(
+            request, BytesIO(CONTENT), 'bestand', etag=ETAG, last_modified=1000000000
+        )
+
+    def test_full_download(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['ETag'], ETAG)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+
+    def test_partial_download(self):
+        response = self._get(HTTP_RANGE='bytes=10-29')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Length'], '20')
+        self.assertEqual(response['Content-Range'], 'bytes 10-29/100')
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[10:30])
+
+    def test_range_not_satisfiable(self):
+        response = self._get(HTTP_RANGE='bytes=200-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+
+    def test_if_range_etag_matches(self):
+        response = self._get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=ETAG)
+
+        self.assertEqual(response.status_code, 206)
+
+    def test_if_range_etag_changed(self):
+        response = self._get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"other-etag"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+
+    def test_if_range_date(self):
+        response = self._get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=http_date(1000000000))
+
+        self.assertEqual(response.status_code, 206)
+
+    def test_iterable_content_without_size(self):
+        request = RequestFactory().get('/', HTTP_RANGE='bytes=0-9')
+        response = build_download_response(request, iter([b'abc', b'def']), 'bestand')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(b''.join(response.streaming_content), b'abcdef')
+
+
+class ParseContentRangeHeaderTests(SimpleTestCase):
+
+    def test_range(self):
+        self.assertEqual(parse_content_range_header('bytes 0-9/100'), (0, 9, 100))
+
+    def test_unknown_size(self):
+        self.assertEqual(parse_content_range_header('bytes 10-19/*'), (10, 19, None))
+
+    def test_invalid(self):
+        self.assertIsNone(parse_content_range_header('bytes 10-9/100'))
+        self.assertIsNone(parse_content_range_header('bytes 0-100/100'))
+        self.assertIsNone(parse_content_range_header('items 0-9/100'))
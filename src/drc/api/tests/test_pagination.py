@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone
+
+from privates.test import temp_private_root
+
+from drc.api.pagination import (
+    InvalidCursor, decode_cursor, encode_cursor, get_cursor_link
+)
+from drc.backend.django import DjangoDRCStorageBackend
+from drc.datamodel.models import (
+    EnkelvoudigInformatieObject, EnkelvoudigInformatieObjectCanonical
+)
+
+
+class CursorTests(SimpleTestCase):
+
+    def test_roundtrip(self):
+        position = ['2019-01-01T00:00:00+00:00', 42]
+
+        self.assertEqual(decode_cursor(encode_cursor('after', position)), (position, None))
+        self.assertEqual(decode_cursor(encode_cursor('before', position)), (None, position))
+
+    def test_no_cursor(self):
+        self.assertEqual(decode_cursor(''), (None, None))
+
+    def test_invalid_cursor(self):
+        for cursor in ['garbage', encode_cursor('sideways', [1, 2]), 'e30']:
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursor):
+                    decode_cursor(cursor)
+
+    def test_link_keeps_filters(self):
+        request = RequestFactory().get('/api/v1/enkelvoudiginformatieobjecten', {'bronorganisatie': '159351741'})
+
+        link = get_cursor_link(request, 'after', ['2019-01-01T00:00:00+00:00', 42])
+
+        self.assertIn('bronorganisatie=159351741', link)
+        self.assertIn('paginering=cursor', link)
+        after, _ = decode_cursor(link.split('cursor=')[-1])
+        self.assertEqual(after, ['2019-01-01T00:00:00+00:00', 42])
+
+    def test_no_link_without_position(self):
+        request = RequestFactory().get('/api/v1/enkelvoudiginformatieobjecten')
+
+        self.assertIsNone(get_cursor_link(request, 'after', None))
+
+
+@temp_private_root()
+class DjangoBackendCursorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        for i in range(5):
+            canonical = EnkelvoudigInformatieObjectCanonical.objects.create()
+            eio = EnkelvoudigInformatieObject.objects.create(
+                canonical=canonical,
+                bronorganisatie='159351741',
+                identificatie=f'DOCUMENT-{i}',
+                creatiedatum='2018-06-27',
+                titel=f'document {i}',
+                auteur='some auteur',
+                taal='nld',
+                inhoud=ContentFile(b'some content', name='dummy.txt'),
+                informatieobjecttype='https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1',
+            )
+            # begin_registratie is set automatically on save
+            EnkelvoudigInformatieObject.objects.filter(pk=eio.pk).update(begin_registratie=now + timedelta(minutes=i))
+
+    def setUp(self):
+        super().setUp()
+        self.backend = DjangoDRCStorageBackend()
+
+    def _titels(self, page):
+        return [eio.titel for eio in page.results]
+
+    def test_walk_forward_and_back(self):
+        page = self.backend.get_documents_by_cursor(page_size=2)
+
+        self.assertEqual(self._titels(page), ['document 0', 'document 1'])
+        self.assertIsNone(page.previous_position)
+        self.assertIsNone(page.count)
+
+        page = self.backend.get_documents_by_cursor(page_size=2, after=page.next_position)
+        self.assertEqual(self._titels(page), ['document 2', 'document 3'])
+
+        last = self.backend.get_documents_by_cursor(page_size=2, after=page.next_position)
+        self.assertEqual(self._titels(last), ['document 4'])
+        self.assertIsNone(last.next_position)
+
+        page = self.backend.get_documents_by_cursor(page_size=2, before=last.previous_position)
+        self.assertEqual(self._titels(page), ['document 2', 'document 3'])
+
+    def test_count_on_request(self):
+        page = self.backend.get_documents_by_cursor(page_size=2, count=True)
+
+        self.assertEqual(page.count, 5)
+
+    def test_only_latest_version(self):
+        latest = EnkelvoudigInformatieObject.objects.get(identificatie='DOCUMENT-0')
+        latest.pk = None
+        latest.versie = 2
+        latest.titel = 'document 0 versie 2'
+        latest.save()
+
+        page = self.backend.get_documents_by_cursor(page_size=10)
+
+        titels = self._titels(page)
+        self.assertEqual(len(titels), 5)
+        self.assertIn('document 0 versie 2', titels)
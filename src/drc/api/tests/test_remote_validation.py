@@ -0,0 +1,134 @@
+import threading
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from rest_framework import serializers
+
+from drc.api.remote_validation import (
+    ConcurrentValidationMixin, RemoteValidationTimeout
+)
+
+
+class SlowValidator:
+    remote = True
+
+    def __init__(self, delay: float = 0.2, message: str = ''):
+        self.delay = delay
+        self.message = message
+        self.threads = []
+
+    def __call__(self, value):
+        self.threads.append(threading.current_thread())
+        time.sleep(self.delay)
+        if self.message:
+            raise serializers.ValidationError(self.message, code='invalid')
+
+
+class SerializerTests(SimpleTestCase):
+
+    def get_serializer(self, data, field_validator=None, object_validator=None, **kwargs):
+        field_validator = field_validator or SlowValidator()
+        object_validator = object_validator or SlowValidator()
+
+        class Serializer(ConcurrentValidationMixin, serializers.Serializer):
+            object = serializers.URLField(validators=[field_validator])
+            naam = serializers.CharField(max_length=10)
+
+            class Meta:
+                validators = [object_validator]
+
+        return Serializer(data=data, **kwargs)
+
+    def test_concurrent(self):
+        field_validator, object_validator = SlowValidator(), SlowValidator()
+        serializer = self.get_serializer(
+            {'object': 'https://example.com/zaken/1', 'naam': 'test'},
+            field_validator, object_validator
+        )
+
+        start = time.monotonic()
+        self.assertTrue(serializer.is_valid())
+        self.assertLess(time.monotonic() - start, 0.35)
+
+        self.assertEqual(serializer.validated_data, {'object': 'https://example.com/zaken/1', 'naam': 'test'})
+        self.assertNotEqual(field_validator.threads[0], threading.current_thread())
+        self.assertEqual(len(object_validator.threads), 1)
+
+    def test_field_errors(self):
+        serializer = self.get_serializer(
+            {'object': 'https://example.com/zaken/1', 'naam': 'much too long'},
+            field_validator=SlowValidator(message='not found'),
+            object_validator=SlowValidator(message='not related'),
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['object'][0].code, 'invalid')
+        self.assertEqual(serializer.errors['naam'][0].code, 'max_length')
+        # the serializer isn't validated with invalid fields
+        self.assertNotIn('non_field_errors', serializer.errors)
+
+    def test_remote_field_error_hides_serializer_error(self):
+        serializer = self.get_serializer(
+            {'object': 'https://example.com/zaken/1', 'naam': 'test'},
+            field_validator=SlowValidator(message='not found'),
+            object_validator=SlowValidator(message='not related'),
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(list(serializer.errors), ['object'])
+
+    def test_serializer_error(self):
+        serializer = self.get_serializer(
+            {'object': 'https://example.com/zaken/1', 'naam': 'test'},
+            object_validator=SlowValidator(message='not related'),
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors, {'non_field_errors': ['not related']})
+
+    @override_settings(REMOTE_VALIDATION_TIMEOUT=0.1)
+    def test_timeout(self):
+        serializer = self.get_serializer(
+            {'object': 'https://example.com/zaken/1', 'naam': 'test'},
+            field_validator=SlowValidator(delay=0.5),
+        )
+
+        with self.assertRaises(RemoteValidationTimeout) as context:
+            serializer.is_valid()
+
+        self.assertEqual(context.exception.status_code, 504)
+        self.assertEqual(context.exception.get_codes(), 'validation-timeout')
+
+    @override_settings(REMOTE_VALIDATION_TIMEOUT=0.3, REMOTE_VALIDATION_THREADS=1)
+    def test_timeout_from_start(self):
+        # the checks run one after another, the second one waits for a thread
+        # longer than the timeout
+        serializer = self.get_serializer(
+            {'object': 'https://example.com/zaken/1', 'naam': 'test'},
+            field_validator=SlowValidator(delay=0.2),
+            object_validator=SlowValidator(delay=0.2),
+        )
+
+        self.assertTrue(serializer.is_valid())
+
+    @override_settings(REMOTE_VALIDATION_THREADS=0)
+    def test_sequential(self):
+        field_validator = SlowValidator(delay=0)
+        serializer = self.get_serializer(
+            {'object': 'https://example.com/zaken/1', 'naam': 'test'},
+            field_validator=field_validator,
+        )
+
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(field_validator.threads, [threading.current_thread()])
+
+    def test_many(self):
+        field_validator = SlowValidator(delay=0)
+        serializer = self.get_serializer([
+            {'object': 'https://example.com/zaken/1', 'naam': 'test'},
+            {'object': 'https://example.com/zaken/2', 'naam': 'test'},
+        ], field_validator=field_validator, many=True)
+
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(len(field_validator.threads), 2)
@@ -0,0 +1,102 @@
+from django.test import TestCase
+
+from djangorestframework_camel_case.render import (
+    CamelCaseJSONRenderer as BaseCamelCaseJSONRenderer
+)
+from rest_framework import serializers
+
+from drc.api.renderers import CamelCaseJSONRenderer, CamelizedDict
+from drc.api.representations import (
+    DocumentRepresentation, document_representation
+)
+from drc.api.serializers import (
+    PaginateSerializer, RetrieveEnkelvoudigInformatieObjectSerializer
+)
+from drc.backend import drc_storage_adapter
+from drc.backend.data import EnkelvoudigInformatieObject as Document
+from drc.backend.data import PaginationObject
+from drc.datamodel.models import (
+    EnkelvoudigInformatieObject, EnkelvoudigInformatieObjectCanonical
+)
+
+
+class BestandSerializer(serializers.Serializer):
+    bestandsnaam = serializers.CharField()
+    bestands_omvang = serializers.IntegerField(source='bestandsomvang')
+
+
+class GegevensgroepSerializer(RetrieveEnkelvoudigInformatieObjectSerializer):
+    # a gegevensgroep that is not flattened in the document
+    bestand = BestandSerializer(source='*')
+
+
+class DocumentRepresentationTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        for identificatie, extra in (('1', {}), ('2', {
+            'ontvangstdatum': '2018-07-01',
+            'status': 'definitief',
+            'integriteit_algoritme': 'md5',
+            'integriteit_waarde': 'abc',
+            'integriteit_datum': '2018-12-13',
+            'ondertekening_soort': 'digitaal',
+            'ondertekening_datum': '2018-12-14',
+        })):
+            EnkelvoudigInformatieObject.objects.create(
+                canonical=EnkelvoudigInformatieObjectCanonical.objects.create(),
+                identificatie=identificatie,
+                bronorganisatie='159351741',
+                creatiedatum='2018-06-27',
+                titel='some titel',
+                auteur='some auteur',
+                taal='nld',
+                informatieobjecttype='https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1',
+                **extra
+            )
+        self.documents = [
+            drc_storage_adapter.lees_enkelvoudiginformatieobject(str(uuid))
+            for uuid in EnkelvoudigInformatieObject.objects.order_by('identificatie').values_list('uuid', flat=True)
+        ]
+
+    def test_same_as_serializer(self):
+        for document in self.documents:
+            with self.subTest(identificatie=document.identificatie):
+                expected = BaseCamelCaseJSONRenderer().render(
+                    RetrieveEnkelvoudigInformatieObjectSerializer(instance=document).data
+                )
+
+                representation = document_representation.to_representation(document)
+
+                self.assertEqual(CamelCaseJSONRenderer().render(representation), expected)
+
+    def test_page_same_as_serializer(self):
+        page = PaginationObject(count=2, results=self.documents, next='http://testserver/?page=2')
+        expected = BaseCamelCaseJSONRenderer().render(PaginateSerializer(instance=page).data)
+
+        representation = document_representation.to_page_representation(page)
+
+        self.assertEqual(CamelCaseJSONRenderer().render(representation), expected)
+
+    def test_full_page_same_as_serializer(self):
+        drc_storage_adapter.lock_enkelvoudiginformatieobject(self.documents[1].uuid)
+        page = drc_storage_adapter.lees_enkelvoudiginformatieobjecten(page=1, page_size=100, filters={})
+        self.assertEqual([document.locked for document in page.results], [False, True])
+        representation = DocumentRepresentation(GegevensgroepSerializer, Document)
+
+        expected = BaseCamelCaseJSONRenderer().render({
+            'count': page.count,
+            'next': None,
+            'previous': None,
+            'results': GegevensgroepSerializer(instance=page.results, many=True).data,
+        })
+        rendered = CamelCaseJSONRenderer().render(representation.to_page_representation(page))
+
+        self.assertEqual(rendered, expected)
+        self.assertIn(b'"bestand":{"bestandsnaam":"","bestandsOmvang":null}', rendered)
+        self.assertIn(b'"locked":true', rendered)
+
+    def test_camelized_data_is_rendered_as_is(self):
+        rendered = CamelCaseJSONRenderer().render(CamelizedDict([('begin_registratie', None)]))
+
+        self.assertEqual(rendered, b'{"begin_registratie":null}')
@@ -0,0 +1,39 @@
+from django.test import SimpleTestCase
+
+from drc.api.serializers import (
+    EnkelvoudigInformatieObjectSerializer, IntegriteitSerializer,
+    ObjectInformatieObjectSerializer, OndertekeningSerializer, PaginateSerializer
+)
+
+
+class ChoiceValuesHelpTextTests(SimpleTestCase):
+
+    def test_help_text(self):
+        cases = [
+            (EnkelvoudigInformatieObjectSerializer, 'vertrouwelijkheidaanduiding', '`zeer_geheim`'),
+            (EnkelvoudigInformatieObjectSerializer, 'status', '`definitief`'),
+            (IntegriteitSerializer, 'algoritme', '`sha_256`'),
+            (OndertekeningSerializer, 'soort', '`digitaal`'),
+            (ObjectInformatieObjectSerializer, 'object_type', '`zaak`'),
+        ]
+        for serializer_class, field, value in cases:
+            with self.subTest(serializer=serializer_class.__name__, field=field):
+                help_text = str(serializer_class().fields[field].help_text)
+
+                self.assertIn('\n\nUitleg bij mogelijke waarden:\n\n', help_text)
+                self.assertIn(value, help_text)
+                self.assertEqual(help_text.count('Uitleg bij mogelijke waarden'), 1)
+
+    def test_help_text_not_extended_per_instance(self):
+        help_text = str(EnkelvoudigInformatieObjectSerializer().fields['status'].help_text)
+
+        self.assertEqual(str(EnkelvoudigInformatieObjectSerializer().fields['status'].help_text), help_text)
+
+    def test_instantiation_does_not_build_fields(self):
+        serializer = PaginateSerializer(instance={'count': 0, 'results': []})
+
+        # the fields are only built when the data is serialized
+        self.assertNotIn('fields', serializer.__dict__)
+        self.assertNotIn('fields', serializer._declared_fields['results'].child.__dict__)
+        self.assertNotIn('fields', EnkelvoudigInformatieObjectSerializer().__dict__)
+        self.assertNotIn('fields', ObjectInformatieObjectSerializer().__dict__)
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import uuid
+
+from django.test import override_settings
+
+from privates.test import temp_private_root
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.tests import JWTAuthMixin, get_validation_errors, reverse
+
+from drc.datamodel.models import UploadSessie
+from drc.tests.mixins import DMSMixin
+
+INFORMATIEOBJECTTYPE = 'https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1'
+
+
+@temp_private_root()
+@override_settings(
+    UPLOAD_SESSION_ROOT=tempfile.mkdtemp(),
+    LINK_FETCHER='vng_api_common.mocks.link_fetcher_200',
+)
+class UploadSessieAPITests(DMSMixin, JWTAuthMixin, APITestCase):
+
+    heeft_alle_autorisaties = True
+
+    def _create_sessie(self, bestandsomvang):
+        response = self.client.post(reverse('uploadsessie-list'), {
+            'bestandsnaam': 'dummy.txt',
+            'bestandsomvang': bestandsomvang,
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        return response.data['url']
+
+    def _upload_part(self, url, data, start, size):
+        return self.client.put(
+            f"{url}/inhoud",
+            data,
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f"bytes {start}-{start + len(data) - 1}/{size}"
+        )
+
+    def test_upload_in_parts(self):
+        url = self._create_sessie(10)
+
+        response = self._upload_part(url, b'some ', 0, 10)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['ontvangen'], 5)
+        self.assertFalse(response.data['voltooid'])
+
+        response = self._upload_part(url, b'file!', 5, 10)
+
+        self.assertEqual(response.data['ontvangen'], 10)
+        self.assertTrue(response.data['voltooid'])
+
+        sessie = UploadSessie.objects.get()
+        with open(sessie.path, 'rb') as f:
+            self.assertEqual(f.read(), b'some file!')
+
+    def test_resume_upload_retransmitted_part(self):
+        url = self._create_sessie(10)
+        self._upload_part(url, b'some ', 0, 10)
+
+        # the client did not get the response and sends (part of) the same bytes again
+        response = self._upload_part(url, b'e file!', 3, 10)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['ontvangen'], 10)
+
+    def test_upload_part_with_gap(self):
+        url = self._create_sessie(10)
+
+        response = self._upload_part(url, b'file!', 5, 10)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        error = get_validation_errors(response, 'nonFieldErrors')
+        self.assertEqual(error['code'], 'invalid-offset')
+
+    def test_upload_part_wrong_size(self):
+        url = self._create_sessie(10)
+
+        response = self._upload_part(url, b'some ', 0, 20)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        error = get_validation_errors(response, 'nonFieldErrors')
+        self.assertEqual(error['code'], 'invalid-size')
+
+    def test_upload_part_without_content_range(self):
+        url = self._create_sessie(10)
+
+        response = self.client.put(f"{url}/inhoud", b'some ', content_type='application/octet-stream')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        error = get_validation_errors(response, 'nonFieldErrors')
+        self.assertEqual(error['code'], 'missing-content-range')
+
+    def test_complete_incomplete_upload(self):
+        url = self._create_sessie(10)
+        self._upload_part(url, b'some ', 0, 10)
+
+        response = self.client.post(f"{url}/voltooien", {})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        error = get_validation_errors(response, 'nonFieldErrors')
+        self.assertEqual(error['code'], 'incomplete-upload')
+
+    def test_complete_upload(self):
+        url = self._create_sessie(10)
+        self._upload_part(url, b'some file!', 0, 10)
+        sessie = UploadSessie.objects.get()
+
+        response = self.client.post(f"{url}/voltooien", {
+            'identificatie': uuid.uuid4().hex,
+            'bronorganisatie': '159351741',
+            'creatiedatum': '2018-06-27',
+            'titel': 'detailed summary',
+            'auteur': 'test_auteur',
+            'formaat': 'txt',
+            'taal': 'eng',
+            'bestandsnaam': 'dummy.txt',
+            'informatieobjecttype': INFORMATIEOBJECTTYPE,
+            'vertrouwelijkheidaanduiding': 'openbaar',
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertFalse(UploadSessie.objects.exists())
+        self.assertFalse(os.path.exists(sessie.path))
+
+        download = self.client.get(response.data['inhoud'])
+        self.assertEqual(b''.join(download.streaming_content), b'some file!')
+
+    def test_destroy_removes_parts(self):
+        url = self._create_sessie(10)
+        self._upload_part(url, b'some ', 0, 10)
+        sessie = UploadSessie.objects.get()
+
+        response = self.client.delete(url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(os.path.exists(sessie.path))
@@ -0,0 +1,61 @@
+import uuid
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import JWTAuthMixin, reverse
+
+from drc.api.scopes import SCOPE_DOCUMENTEN_ALLES_LEZEN
+from drc.datamodel.tests.factories import EnkelvoudigInformatieObjectFactory
+
+INFORMATIEOBJECTTYPE = 'https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1'
+
+
+class ZoekTests(JWTAuthMixin, APITestCase):
+
+    scopes = [SCOPE_DOCUMENTEN_ALLES_LEZEN]
+    informatieobjecttype = INFORMATIEOBJECTTYPE
+    max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.openbaar
+    url = reverse('enkelvoudiginformatieobjecten-zoek')
+
+    def test_zoek(self):
+        eio1 = EnkelvoudigInformatieObjectFactory.create()
+        eio2 = EnkelvoudigInformatieObjectFactory.create()
+        EnkelvoudigInformatieObjectFactory.create()
+
+        response = self.client.post(self.url, {
+            'uuid__in': [str(eio2.uuid), str(uuid.uuid4()), str(eio1.uuid), str(eio2.uuid)]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(
+            [document['url'].rsplit('/', 1)[-1] for document in response.json()],
+            [str(eio2.uuid), str(eio1.uuid)]
+        )
+
+    def test_zoek_filtered_by_authorizations(self):
+        allowed = EnkelvoudigInformatieObjectFactory.create()
+        confidential = EnkelvoudigInformatieObjectFactory.create(
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim
+        )
+        other_type = EnkelvoudigInformatieObjectFactory.create(
+            informatieobjecttype='https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/2'
+        )
+
+        response = self.client.post(self.url, {
+            'uuid__in': [str(allowed.uuid), str(confidential.uuid), str(other_type.uuid)]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(len(response.json()), 1)
+        self.assertTrue(response.json()[0]['url'].endswith(str(allowed.uuid)))
+
+    def test_zoek_invalid_uuid(self):
+        response = self.client.post(self.url, {'uuid__in': ['not-a-uuid']}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_zoek_empty(self):
+        response = self.client.post(self.url, {'uuid__in': []}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
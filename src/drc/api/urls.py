@@ -7,7 +7,7 @@ from vng_api_common.schema import SchemaView
 from .viewsets import (
     EnkelvoudigInformatieObjectAuditTrailViewSet,
     EnkelvoudigInformatieObjectViewSet, GebruiksrechtenViewSet,
-    ObjectInformatieObjectViewSet
+    ObjectInformatieObjectViewSet, UploadSessieViewSet
 )
 
 router = routers.DefaultRouter()
@@ -16,6 +16,7 @@ router.register('enkelvoudiginformatieobjecten', EnkelvoudigInformatieObjectView
 ], base_name='enkelvoudiginformatieobjecten')
 router.register('gebruiksrechten', GebruiksrechtenViewSet, base_name="gebruiksrechten")
 router.register('objectinformatieobjecten', ObjectInformatieObjectViewSet, base_name="objectinformatieobjecten")
+router.register('uploadsessies', UploadSessieViewSet, base_name="uploadsessie")
 
 # TODO: the EndpointEnumerator seems to choke on path and re_path
 
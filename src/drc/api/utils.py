@@ -1,3 +1,5 @@
+import hashlib
+
 from django.conf import settings
 from django.contrib.sites.models import Site
 
@@ -12,3 +14,40 @@ def get_absolute_url(url_name: str, uuid: str) -> str:
     domain = Site.objects.get_current().domain
     protocol = 'https' if settings.IS_HTTPS else 'http'
     return f'{protocol}://{domain}{path}'
+
+
+def get_document_etag(document) -> str:
+    """
+    Build a strong ETag for a specific version of a document.
+
+    A stored version is only modified by setting its indicatie_gebruiksrecht,
+    and by (un)locking the document, so (uuid, versie, begin_registratie,
+    indicatie_gebruiksrecht, locked) identifies the representation and the
+    bytes of the content.
+    """
+    begin_registratie = document.begin_registratie.isoformat() if document.begin_registratie else ''
+    # unknown is shown as false
+    indicatie = bool(document.indicatie_gebruiksrecht)
+    value = f"{document.uuid}:{document.versie}:{begin_registratie}:{indicatie}:{bool(document.locked)}"
+    return '"%s"' % hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+
+OBJECTINFORMATIEOBJECT_ETAG_FIELDS = (
+    'url', 'informatieobject', 'object', 'object_type', 'aard_relatie', 'titel', 'beschrijving', 'registratiedatum'
+)
+
+
+def get_objectinformatieobject_etag(oio) -> str:
+    """
+    Build a strong ETag for an object informatieobject.
+
+    The relation can be changed without a version, so the ETag is derived
+    from all of its attributes.
+    """
+    values = []
+    for field in OBJECTINFORMATIEOBJECT_ETAG_FIELDS:
+        # the primary key of relations, without fetching them
+        field_id = f'{field}_id'
+        values.append(getattr(oio, field_id) if hasattr(oio, field_id) else getattr(oio, field, ''))
+    value = ':'.join(str(value) for value in values)
+    return '"%s"' % hashlib.sha1(value.encode('utf-8')).hexdigest()
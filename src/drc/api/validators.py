@@ -7,13 +7,15 @@ from django.utils.module_loading import import_string
 from django.utils.translation import ugettext_lazy as _
 
 from rest_framework import serializers
-from vng_api_common.models import APICredential
 from vng_api_common.tests.urls import reverse
+from vng_api_common.validators import URLValidator
 from zds_client import ClientError
 
 from drc.datamodel.models import ObjectInformatieObject
 from drc.datamodel.validators import validate_status
 
+from .catalogue import CachedResponse, catalogue_cache
+from .credentials import credentials
 from .utils import get_absolute_url
 
 
@@ -38,12 +40,47 @@ class StatusValidator:
         #     raise serializers.ValidationError(exc.error_dict)
 
 
+class CatalogueURLValidator(URLValidator):
+    """
+    Validate that the catalogue URL resolves to a HTTP 200, using the cached response if possible.
+
+    Credentials are only looked up when the resource is actually fetched.
+    """
+    def __call__(self, value: str):
+        try:
+            response = catalogue_cache.get(value, self.fetch)
+        except Exception as exc:
+            raise serializers.ValidationError(
+                _('The URL {url} could not be fetched. Exception: {exc}').format(
+                    url=value, exc=exc
+                ),
+                code=self.code,
+            )
+
+        if response.status_code != 200:
+            raise serializers.ValidationError(
+                self.message.format(status_code=response.status_code, url=value),
+                code=self.code
+            )
+        return response
+
+    def fetch(self, url: str) -> CachedResponse:
+        link_fetcher = import_string(settings.LINK_FETCHER)
+
+        extra = self.extra.copy()
+        if self.get_auth:
+            extra['headers'] = {**extra.get('headers', {}), **self.get_auth(url)}
+        return CachedResponse.from_response(link_fetcher(url, **extra))
+
+
 class ObjectInformatieObjectValidator:
     """
     Validate that the INFORMATIEOBJECT is already linked to the OBJECT in the remote component.
     """
     message = _('Het informatieobject is in het {component} nog niet gerelateerd aan het object.')
     code = 'inconsistent-relation'
+    # looks up the relation in the remote component
+    remote = True
 
     def __call__(self, context: OrderedDict):
         object_url = context['object']
@@ -55,10 +92,7 @@ class ObjectInformatieObjectValidator:
         #     uuid=informatieobject_uuid
         # )
 
-        # dynamic so that it can be mocked in tests easily
-        Client = import_string(settings.ZDS_CLIENT_CLASS)
-        client = Client.from_url(object_url)
-        client.auth = APICredential.get_auth(object_url)
+        client = credentials.get_client(object_url)
         # try:
         #     if object_type == 'zaak':
         #         resource = 'zaakinformatieobject'
@@ -95,9 +129,7 @@ class RemoteRelationValidator:
             'enkelvoudiginformatieobjecten-detail',
             uuid=object_informatie_object.informatieobject.split('/')[-1]
         )
-        Client = import_string(settings.ZDS_CLIENT_CLASS)
-        client = Client.from_url(object_url)
-        client.auth = APICredential.get_auth(object_url)
+        client = credentials.get_client(object_url)
         resource = f"{object_informatie_object.object_type}informatieobject"
 
         try:
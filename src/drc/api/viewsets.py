@@ -2,7 +2,7 @@ import logging
 
 from django.conf import settings
 from django.db import transaction
-from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.http import Http404
 from django.shortcuts import get_list_or_404, get_object_or_404
 from django.utils import dateparse, timezone
 from django.utils.translation import ugettext_lazy as _
@@ -11,56 +11,80 @@ from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import mixins, serializers, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework_condition import condition
 from sendfile import sendfile
 from vng_api_common.audittrails.viewsets import (
     AuditTrailCreateMixin, AuditTrailDestroyMixin, AuditTrailViewSet,
     AuditTrailViewsetMixin
 )
-from vng_api_common.constants import CommonResourceAction
+from vng_api_common.constants import (
+    CommonResourceAction, VertrouwelijkheidsAanduiding
+)
 from vng_api_common.filters import Backend
 from vng_api_common.notifications.viewsets import (
     NotificationCreateMixin, NotificationDestroyMixin,
     NotificationViewSetMixin
 )
+from vng_api_common.permissions import AuthScopesRequired
 from vng_api_common.serializers import FoutSerializer
 from vng_api_common.viewsets import CheckQueryParamsMixin
 
 from drc.backend import BackendException, drc_storage_adapter
+from drc.backend.data import PaginationObject
 from drc.datamodel.constants import Statussen
 from drc.datamodel.models import (
     EnkelvoudigInformatieObject, EnkelvoudigInformatieObjectCanonical,
-    Gebruiksrechten, ObjectInformatieObject
+    Gebruiksrechten, ObjectInformatieObject, UploadSessie
 )
 
-from .audits import AUDIT_DRC
-from .data_filtering import ListFilterByAuthorizationsMixin
+from .audits import AUDIT_DRC, AuditTrailMixin, atomic_with_audittrails
+from .conditional import (
+    document_etag, get_objectinformatieobject, objectinformatieobject_etag
+)
+from .data_filtering import (
+    ListFilterByAuthorizationsMixin, get_authorization_predicate
+)
 from .filters import (
     EnkelvoudigInformatieObjectDetailFilter,
     EnkelvoudigInformatieObjectListFilter, GebruiksrechtenFilter,
     ObjectInformatieObjectFilter
 )
 from .kanalen import KANAAL_DOCUMENTEN
-from .notifications import NotificationMixin
+from .notifications import NotificationMixin, SendNotificationMixin
+from .pagination import (
+    COUNT_QUERY_PARAM, CURSOR_QUERY_PARAM, PAGINATION_QUERY_PARAM,
+    PAGINATION_QUERY_PARAMS, InvalidCursor, decode_cursor, get_cursor_link,
+    uses_cursor_pagination
+)
 from .permissions import (
     InformationObjectAuthScopesRequired,
     InformationObjectRelatedAuthScopesRequired
 )
+from .representations import document_representation
 from .scopes import (
     SCOPE_DOCUMENTEN_AANMAKEN, SCOPE_DOCUMENTEN_ALLES_LEZEN,
     SCOPE_DOCUMENTEN_ALLES_VERWIJDEREN, SCOPE_DOCUMENTEN_BIJWERKEN,
     SCOPE_DOCUMENTEN_GEFORCEERD_UNLOCK, SCOPE_DOCUMENTEN_LOCK
 )
 from .serializers import (
-    EnkelvoudigInformatieObjectSerializer,
-    EnkelvoudigInformatieObjectWithLockSerializer, GebruiksrechtenSerializer,
+    BulkResultaatSerializer, EnkelvoudigInformatieObjectSerializer,
+    EnkelvoudigInformatieObjectWithLockSerializer,
+    EnkelvoudigInformatieObjectZoekSerializer, GebruiksrechtenSerializer,
     LockEnkelvoudigInformatieObjectSerializer,
-    ObjectInformatieObjectSerializer, PaginateSerializer,
+    ObjectInformatieObjectSerializer,
     RetrieveEnkelvoudigInformatieObjectSerializer,
-    UnlockEnkelvoudigInformatieObjectSerializer
+    UnlockEnkelvoudigInformatieObjectSerializer, UploadSessieSerializer,
+    VerlengLockEnkelvoudigInformatieObjectSerializer,
+    VoltooiUploadSessieSerializer
 )
+from .streaming import (
+    build_download_response, parse_content_range_header
+)
+from .utils import get_document_etag
 from .validators import RemoteRelationValidator
 
 logger = logging.getLogger(__name__)
@@ -79,6 +103,52 @@ REGISTRATIE_QUERY_PARAM = openapi.Parameter(
                 'kortst hiervoor zit wordt opgehaald.',
     type=openapi.TYPE_STRING
 )
+RANGE_HEADER = openapi.Parameter(
+    'Range',
+    openapi.IN_HEADER,
+    description='Vraag een deel van de inhoud op, bijvoorbeeld `bytes=0-1048575`. Een onderbroken download kan zo '
+                'hervat worden.',
+    type=openapi.TYPE_STRING
+)
+IF_RANGE_HEADER = openapi.Parameter(
+    'If-Range',
+    openapi.IN_HEADER,
+    description='De `ETag` van de eerder gedownloade inhoud. Is de inhoud gewijzigd, dan wordt de hele inhoud '
+                'teruggegeven in plaats van het deel.',
+    type=openapi.TYPE_STRING
+)
+PAGINERING_QUERY_PARAM = openapi.Parameter(
+    PAGINATION_QUERY_PARAM,
+    openapi.IN_QUERY,
+    description='Gebruik `cursor` om de lijst met een cursor te pagineren in plaats van met paginanummers.',
+    type=openapi.TYPE_STRING,
+    enum=['cursor']
+)
+CURSOR_PARAM = openapi.Parameter(
+    CURSOR_QUERY_PARAM,
+    openapi.IN_QUERY,
+    description='De cursor uit de `next` of `previous` link van de vorige pagina.',
+    type=openapi.TYPE_STRING
+)
+COUNT_PARAM = openapi.Parameter(
+    COUNT_QUERY_PARAM,
+    openapi.IN_QUERY,
+    description='Bepaal het totaal (`count`) bij paginering met een cursor.',
+    type=openapi.TYPE_BOOLEAN
+)
+IF_NONE_MATCH_HEADER = openapi.Parameter(
+    'If-None-Match',
+    openapi.IN_HEADER,
+    description='De `ETag` van een eerder opgevraagde versie. Als het object sindsdien niet gewijzigd is, wordt '
+                '`304 Not Modified` teruggegeven.',
+    type=openapi.TYPE_STRING
+)
+ETAG_HEADERS = {
+    'ETag': openapi.Schema(
+        type=openapi.TYPE_STRING,
+        description='De ETag van de representatie van het object.'
+    ),
+}
 
 
 def test_invalid_statusses(request_data):
@@ -103,10 +173,10 @@ def test_ontvangstdatum_invalid_statusses(request_data, instance):
     return errors
 
 
-def fields_in_filters(filters, request):
+def fields_in_filters(filters, request, ignore=()):
     valid = True
     for key, _value in request.GET.items():
-        if key not in filters.filters:
+        if key not in filters.filters and key not in ignore:
             filters.form.add_error(
                 api_settings.NON_FIELD_ERRORS_KEY,
                 _("'{key}' is not a valid filter option.").format(key=key)
@@ -162,7 +232,8 @@ class SerializerClassMixin:
 
 class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
                                          NotificationMixin,
-                                         # ListFilterByAuthorizationsMixin,  # TODO: Find a fix for this mixin
+                                         ListFilterByAuthorizationsMixin,
+                                         AuditTrailMixin,
                                          AuditTrailViewsetMixin,
                                          viewsets.ViewSet):
     """
@@ -174,6 +245,15 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
     **Er wordt gevalideerd op**
     - geldigheid `informatieobjecttype` URL
 
+    bulk:
+    Maak meerdere (ENKELVOUDIGe) INFORMATIEOBJECTen in een keer aan.
+
+    Elk document wordt gevalideerd zoals bij het aanmaken van een enkel
+    document. De geldige documenten worden aangemaakt, de resultaten worden
+    per document in dezelfde volgorde teruggegeven. De status is 201 als alle
+    documenten zijn aangemaakt, 207 als een deel is aangemaakt en 400 als er
+    geen enkel document is aangemaakt.
+
     list:
     Alle (ENKELVOUDIGe) INFORMATIEOBJECTen opvragen.
 
@@ -184,6 +264,18 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
     (ENKELVOUDIG) INFORMATIEOBJECT wordt getoond. Specifieke versies kunnen
     alleen
 
+    Met `paginering=cursor` wordt de lijst gepagineerd met een cursor in
+    plaats van paginanummers, ook diep in de lijst blijft dit snel. De `next`
+    en `previous` links bevatten de cursor. Het totaal (`count`) wordt alleen
+    bepaald met `count=true`.
+
+    zoek:
+    Meerdere (ENKELVOUDIGe) INFORMATIEOBJECTen opvragen op UUID.
+
+    Geeft de laatste versie van de gevonden (ENKELVOUDIGe)
+    INFORMATIEOBJECTen, in de volgorde van de opgegeven UUIDs. Onbekende
+    UUIDs worden overgeslagen.
+
     retrieve:
     Een specifiek (ENKELVOUDIG) INFORMATIEOBJECT opvragen.
 
@@ -240,6 +332,10 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
     (ENKELVOUDIG) INFORMATIEOBJECT bijgewerkt (`PUT`, `PATCH`) en weer
     ontgrendeld worden.
 
+    Het lock vervalt als het niet binnen de geldigheidsduur gebruikt of
+    verlengd wordt. Verleng het lock door opnieuw te vergrendelen met de
+    `lock` waarde in de request body.
+
     unlock:
     Ontgrendel een (ENKELVOUDIG) INFORMATIEOBJECT.
 
@@ -254,7 +350,9 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
     required_scopes = {
         'list': SCOPE_DOCUMENTEN_ALLES_LEZEN,
         'retrieve': SCOPE_DOCUMENTEN_ALLES_LEZEN,
+        'zoek': SCOPE_DOCUMENTEN_ALLES_LEZEN,
         'create': SCOPE_DOCUMENTEN_AANMAKEN,
+        'bulk': SCOPE_DOCUMENTEN_AANMAKEN,
         'destroy': SCOPE_DOCUMENTEN_ALLES_VERWIJDEREN,
         'update': SCOPE_DOCUMENTEN_BIJWERKEN,
         'partial_update': SCOPE_DOCUMENTEN_BIJWERKEN,
@@ -269,26 +367,73 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
 
     pagination_class = PageNumberPagination
     audit = AUDIT_DRC
+    audittrail_serializer_class = RetrieveEnkelvoudigInformatieObjectSerializer
+    # the router basename is plural
+    audittrail_resource = 'enkelvoudiginformatieobject'
+    authorization_filtered_actions = ('list', 'zoek')
 
     def get_object(self, **kwargs):
         document_data = drc_storage_adapter.lees_enkelvoudiginformatieobject(kwargs.get('uuid'), kwargs.get('versie'))
         return document_data
 
+    @swagger_auto_schema(manual_parameters=[PAGINERING_QUERY_PARAM, CURSOR_PARAM, COUNT_PARAM])
     def list(self, request, version=None):
         filters = self.filterset_class(data=self.request.GET)
-        if not fields_in_filters(filters, request):
+        if not fields_in_filters(filters, request, ignore=PAGINATION_QUERY_PARAMS):
             return Response(filters.errors, status=400)
         if not filters.is_valid():
             return Response(filters.errors, status=400)
 
+        if uses_cursor_pagination(request):
+            return self.list_by_cursor(request, filters.form.cleaned_data)
+
         documents_data = drc_storage_adapter.lees_enkelvoudiginformatieobjecten(
             page=int(request.GET.get('page', 1)),
             page_size=settings.REST_FRAMEWORK.get('PAGE_SIZE'),
             filters=filters.form.cleaned_data,
+            autorisaties=self.get_authorization_predicate(),
         )
-        serializer = PaginateSerializer(instance=documents_data)
-        return Response(serializer.data)
+        return Response(document_representation.to_page_representation(documents_data))
 
+    def list_by_cursor(self, request, filters):
+        """
+        List the documents with keyset pagination, the total is only counted on request.
+        """
+        try:
+            after, before = decode_cursor(request.GET.get(CURSOR_QUERY_PARAM))
+            page = drc_storage_adapter.lees_enkelvoudiginformatieobjecten_cursor(
+                page_size=settings.REST_FRAMEWORK.get('PAGE_SIZE'),
+                after=after,
+                before=before,
+                filters=filters,
+                count=request.GET.get(COUNT_QUERY_PARAM) == 'true',
+                autorisaties=self.get_authorization_predicate(),
+            )
+        except (InvalidCursor, BackendException):
+            raise_validation_error(_("The cursor is invalid"), code='invalid-cursor')
+        except NotImplementedError:
+            raise_validation_error(
+                _("Cursor pagination is not supported by the storage backend"), code='cursor-not-supported'
+            )
+
+        documents_data = PaginationObject(
+            count=page.count,
+            results=page.results,
+            next=get_cursor_link(request, 'after', page.next_position),
+            previous=get_cursor_link(request, 'before', page.previous_position),
+        )
+        return Response(document_representation.to_page_representation(documents_data))
+
+    @swagger_auto_schema(
+        manual_parameters=[IF_NONE_MATCH_HEADER],
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                "OK", schema=RetrieveEnkelvoudigInformatieObjectSerializer, headers=ETAG_HEADERS
+            ),
+            status.HTTP_304_NOT_MODIFIED: openapi.Response("Not modified", headers=ETAG_HEADERS),
+        }
+    )
+    @condition(etag_func=document_etag)
     def retrieve(self, request, uuid=None, version=None):
         data = self.request.GET.copy()
         filters = EnkelvoudigInformatieObjectDetailFilter(data=data)
@@ -306,6 +451,31 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
         serializer = RetrieveEnkelvoudigInformatieObjectSerializer(instance=document)
         return Response(serializer.data)
 
+    @swagger_auto_schema(
+        request_body=EnkelvoudigInformatieObjectZoekSerializer,
+        responses={
+            status.HTTP_200_OK: RetrieveEnkelvoudigInformatieObjectSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: openapi.Response("Bad request", schema=FoutSerializer),
+            status.HTTP_401_UNAUTHORIZED: openapi.Response("Unauthorized", schema=FoutSerializer),
+            status.HTTP_403_FORBIDDEN: openapi.Response("Forbidden", schema=FoutSerializer),
+            status.HTTP_406_NOT_ACCEPTABLE: openapi.Response("Not acceptable", schema=FoutSerializer),
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: openapi.Response("Unsupported media type", schema=FoutSerializer),
+            status.HTTP_429_TOO_MANY_REQUESTS: openapi.Response("Throttled", schema=FoutSerializer),
+            status.HTTP_500_INTERNAL_SERVER_ERROR: openapi.Response("Internal server error", schema=FoutSerializer),
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='_zoek', name='enkelvoudiginformatieobject__zoek')
+    def zoek(self, request, *args, **kwargs):
+        serializer = EnkelvoudigInformatieObjectZoekSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        documenten = drc_storage_adapter.lees_enkelvoudiginformatieobjecten_uuids(
+            serializer.validated_data['uuid__in'],
+            autorisaties=self.get_authorization_predicate(),
+        )
+        return Response(document_representation.to_list_representation(documenten))
+
+    @atomic_with_audittrails
     def create(self, request, version=None):
         errors = test_invalid_statusses(request.data)
         if errors:
@@ -336,6 +506,121 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
         )
         return response
 
+    @swagger_auto_schema(
+        request_body=EnkelvoudigInformatieObjectSerializer(many=True),
+        responses={
+            status.HTTP_201_CREATED: BulkResultaatSerializer(many=True),
+            status.HTTP_207_MULTI_STATUS: BulkResultaatSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: openapi.Response("Bad request", schema=FoutSerializer),
+            status.HTTP_401_UNAUTHORIZED: openapi.Response("Unauthorized", schema=FoutSerializer),
+            status.HTTP_403_FORBIDDEN: openapi.Response("Forbidden", schema=FoutSerializer),
+            status.HTTP_406_NOT_ACCEPTABLE: openapi.Response("Not acceptable", schema=FoutSerializer),
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: openapi.Response("Unsupported media type", schema=FoutSerializer),
+            status.HTTP_429_TOO_MANY_REQUESTS: openapi.Response("Throttled", schema=FoutSerializer),
+            status.HTTP_500_INTERNAL_SERVER_ERROR: openapi.Response("Internal server error", schema=FoutSerializer),
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='_bulk', name='enkelvoudiginformatieobject_bulk')
+    @atomic_with_audittrails
+    def bulk(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            raise_validation_error(_("Verwacht een lijst van documenten."), code='invalid-bulk')
+        if len(request.data) > settings.BULK_CREATE_MAX_SIZE:
+            raise_validation_error(
+                _("Er kunnen maximaal {max} documenten tegelijk aangemaakt worden.").format(
+                    max=settings.BULK_CREATE_MAX_SIZE
+                ),
+                code='bulk-too-large'
+            )
+
+        # checked per document, like the permission check of a single create
+        predicate = get_authorization_predicate(request.jwt_auth, self.required_scopes['bulk'])
+        identificaties = set()
+        resultaten, geldig = [], []
+        for item in request.data:
+            fouten, validated_data = self._validate_bulk_item(item, predicate, identificaties)
+            if fouten:
+                resultaten.append(fouten)
+            else:
+                geldig.append((len(resultaten), validated_data))
+                resultaten.append(None)
+
+        documenten = []
+        if geldig:
+            documenten = drc_storage_adapter.creeer_enkelvoudiginformatieobjecten(
+                [validated_data for _, validated_data in geldig]
+            )
+            for (index, _), document in zip(geldig, documenten):
+                resultaten[index] = {'status': status.HTTP_201_CREATED, 'document': document, 'fouten': None}
+
+        if not documenten:
+            status_code = status.HTTP_400_BAD_REQUEST
+        elif len(documenten) == len(resultaten):
+            status_code = status.HTTP_201_CREATED
+        else:
+            status_code = status.HTTP_207_MULTI_STATUS
+
+        response = Response(BulkResultaatSerializer(resultaten, many=True).data, status=status_code)
+        self.notify_many(response.status_code, documenten)
+        for document in documenten:
+            self.create_audittrail(
+                response.status_code,
+                CommonResourceAction.create,
+                version_before_edit=None,
+                version_after_edit=document,
+                unique_representation=document.unique_representation()
+            )
+        return response
+
+    def _validate_bulk_item(self, item, predicate, identificaties: set) -> tuple:
+        """
+        Validate a document of a bulk request, returning the errors or the validated data.
+        """
+        def fout(status_code, errors):
+            return {'status': status_code, 'document': None, 'fouten': errors}, None
+
+        if not isinstance(item, dict):
+            return fout(status.HTTP_400_BAD_REQUEST, {
+                api_settings.NON_FIELD_ERRORS_KEY: [_("Verwacht een document.")]
+            })
+
+        errors = test_invalid_statusses(item)
+        if errors:
+            return fout(status.HTTP_400_BAD_REQUEST, {'invalid_params': errors})
+
+        serializer = EnkelvoudigInformatieObjectSerializer(data=item)
+        if not serializer.is_valid():
+            return fout(status.HTTP_400_BAD_REQUEST, serializer.errors)
+        validated_data = serializer.validated_data
+
+        if predicate is not None:
+            # without a vertrouwelijkheidaanduiding, the strictest level is assumed
+            vertrouwelijkheidaanduiding = (
+                validated_data.get('vertrouwelijkheidaanduiding') or VertrouwelijkheidsAanduiding.zeer_geheim
+            )
+            if not predicate.allows(validated_data.get('informatieobjecttype'), vertrouwelijkheidaanduiding):
+                return fout(status.HTTP_403_FORBIDDEN, {
+                    'detail': _("U heeft geen toestemming om deze actie uit te voeren.")
+                })
+
+        identificatie = validated_data.get('identificatie')
+        if identificatie:
+            key = (validated_data.get('bronorganisatie'), identificatie)
+            if key in identificaties:
+                return fout(status.HTTP_400_BAD_REQUEST, {
+                    'identificatie': [_("De identificatie komt meerdere keren voor binnen de bronorganisatie.")]
+                })
+            identificaties.add(key)
+
+        return None, validated_data
+
+    def get_notification_action(self) -> str:
+        # consumers are notified about each document of a bulk request
+        if self.action == 'bulk':
+            return CommonResourceAction.create
+        return super().get_notification_action()
+
+    @atomic_with_audittrails
     def update(self, request, uuid=None, version=None):
         before = drc_storage_adapter.lees_enkelvoudiginformatieobject(uuid)
 
@@ -379,6 +664,7 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
             )
             return response
 
+    @atomic_with_audittrails
     def partial_update(self, request, uuid=None, version=None):
         before = drc_storage_adapter.lees_enkelvoudiginformatieobject(uuid)
         errors = test_ontvangstdatum_invalid_statusses(request.data, before)
@@ -419,6 +705,7 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
             )
             return response
 
+    @atomic_with_audittrails
     def destroy(self, request, uuid=None, version=None):
         before = drc_storage_adapter.lees_enkelvoudiginformatieobject(uuid)
         data = drc_storage_adapter.verwijder_enkelvoudiginformatieobject(uuid)
@@ -444,31 +731,50 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
                 "De binaire bestandsinhoud",
                 schema=openapi.Schema(type=openapi.TYPE_FILE)
             ),
+            status.HTTP_206_PARTIAL_CONTENT: openapi.Response(
+                "Het gevraagde deel (`Range`) van de binaire bestandsinhoud",
+                schema=openapi.Schema(type=openapi.TYPE_FILE)
+            ),
             status.HTTP_401_UNAUTHORIZED: openapi.Response("Unauthorized", schema=FoutSerializer),
             status.HTTP_403_FORBIDDEN: openapi.Response("Forbidden", schema=FoutSerializer),
             status.HTTP_404_NOT_FOUND: openapi.Response("Not found", schema=FoutSerializer),
             status.HTTP_406_NOT_ACCEPTABLE: openapi.Response("Not acceptable", schema=FoutSerializer),
             status.HTTP_410_GONE: openapi.Response("Gone", schema=FoutSerializer),
             status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: openapi.Response("Unsupported media type", schema=FoutSerializer),
+            status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE: openapi.Response("Range not satisfiable"),
             status.HTTP_429_TOO_MANY_REQUESTS: openapi.Response("Throttled", schema=FoutSerializer),
             status.HTTP_500_INTERNAL_SERVER_ERROR: openapi.Response("Internal server error", schema=FoutSerializer),
         },
         manual_parameters=[
             VERSIE_QUERY_PARAM,
-            REGISTRATIE_QUERY_PARAM
+            REGISTRATIE_QUERY_PARAM,
+            RANGE_HEADER,
+            IF_RANGE_HEADER
         ]
     )
     @action(methods=['get'], detail=True, name='enkelvoudiginformatieobject_download')
     def download(self, request, *args, **kwargs):
-        content, filename = drc_storage_adapter.lees_enkelvoudiginformatieobject_inhoud(kwargs.get('uuid'))
-        content_type = "application/octet-stream"
+        uuid = kwargs.get('uuid')
+        try:
+            document = drc_storage_adapter.lees_enkelvoudiginformatieobject(uuid)
+            content, filename = drc_storage_adapter.lees_enkelvoudiginformatieobject_inhoud(uuid)
+        except BackendException:
+            raise Http404
 
-        response = HttpResponse(content=content, content_type=content_type)
-        response["Content-Disposition"] = f"attachment; filename={filename}.bin"
-        return response
+        last_modified = None
+        if document.begin_registratie:
+            last_modified = int(document.begin_registratie.timestamp())
+
+        return build_download_response(
+            request,
+            content,
+            filename,
+            etag=get_document_etag(document),
+            last_modified=last_modified,
+        )
 
     @swagger_auto_schema(
-        request_body=LockEnkelvoudigInformatieObjectSerializer,
+        request_body=VerlengLockEnkelvoudigInformatieObjectSerializer,
         responses={
             status.HTTP_200_OK: LockEnkelvoudigInformatieObjectSerializer,
             status.HTTP_400_BAD_REQUEST: openapi.Response("Bad request", schema=FoutSerializer),
@@ -484,6 +790,15 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
     )
     @action(detail=True, methods=['post'])
     def lock(self, request, *args, **kwargs):
+        lock = request.data.get('lock')
+        if lock:
+            # renew the lease on the lock (heartbeat)
+            try:
+                drc_storage_adapter.verleng_lock_enkelvoudiginformatieobject(kwargs.get('uuid'), lock)
+            except BackendException:
+                raise_validation_error(_("Lock id is not correct"), code='incorrect-lock-id')
+            return Response({'lock': lock})
+
         try:
             checkout_id = drc_storage_adapter.lock_enkelvoudiginformatieobject(kwargs.get('uuid'))
             return Response({'lock': checkout_id})
@@ -526,12 +841,14 @@ class EnkelvoudigInformatieObjectViewSet(SerializerClassMixin,
             return {}
 
 
-class ObjectInformatieObjectViewSet(NotificationCreateMixin,
+class ObjectInformatieObjectViewSet(SendNotificationMixin,
+                                    NotificationCreateMixin,
                                     NotificationDestroyMixin,
+                                    AuditTrailMixin,
                                     AuditTrailCreateMixin,
                                     AuditTrailDestroyMixin,
                                     CheckQueryParamsMixin,
-                                    # ListFilterByAuthorizationsMixin,  TODO: Find a fix for this mixin
+                                    ListFilterByAuthorizationsMixin,
                                     viewsets.ViewSet):
     """
     Opvragen en verwijderen van OBJECT-INFORMATIEOBJECT relaties.
@@ -588,6 +905,7 @@ class ObjectInformatieObjectViewSet(NotificationCreateMixin,
         'partial_update': SCOPE_DOCUMENTEN_BIJWERKEN,
     }
     audit = AUDIT_DRC
+    audittrail_serializer_class = ObjectInformatieObjectSerializer
     audittrail_main_resource_key = 'informatieobject'
     model = ObjectInformatieObject
 
@@ -601,12 +919,25 @@ class ObjectInformatieObjectViewSet(NotificationCreateMixin,
             return Response(filters.errors, status=400)
         if not filters.is_valid():
             return Response(filters.errors, status=400)
-        documents_data = drc_storage_adapter.lees_objectinformatieobjecten(filters=filters.form.cleaned_data)
+        documents_data = drc_storage_adapter.lees_objectinformatieobjecten(
+            filters=filters.form.cleaned_data, autorisaties=self.get_authorization_predicate()
+        )
         serializer = ObjectInformatieObjectSerializer(instance=documents_data, many=True)
         return Response(serializer.data)
 
+    @swagger_auto_schema(
+        manual_parameters=[IF_NONE_MATCH_HEADER],
+        responses={
+            status.HTTP_200_OK: openapi.Response("OK", schema=ObjectInformatieObjectSerializer, headers=ETAG_HEADERS),
+            status.HTTP_304_NOT_MODIFIED: openapi.Response("Not modified", headers=ETAG_HEADERS),
+        }
+    )
+    @condition(etag_func=objectinformatieobject_etag)
     def retrieve(self, request, uuid=None, version=None):
-        document_data = drc_storage_adapter.lees_objectinformatieobject(uuid)
+        # read once for the ETag as well
+        document_data = get_objectinformatieobject(request, uuid=uuid)
+        if document_data is None:
+            document_data = drc_storage_adapter.lees_objectinformatieobject(uuid)
         serializer = ObjectInformatieObjectSerializer(instance=document_data)
         return Response(serializer.data)
 
@@ -622,6 +953,7 @@ class ObjectInformatieObjectViewSet(NotificationCreateMixin,
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
+    @transaction.atomic
     def update(self, request, uuid=None, version=None):
         serializer = ObjectInformatieObjectSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -633,6 +965,7 @@ class ObjectInformatieObjectViewSet(NotificationCreateMixin,
         self.notify(response.status_code, oio)
         return response
 
+    @transaction.atomic
     def partial_update(self, request, uuid=None, version=None):
         logger.error(request.data)
         serializer = ObjectInformatieObjectSerializer(data=request.data, partial=True)
@@ -648,6 +981,7 @@ class ObjectInformatieObjectViewSet(NotificationCreateMixin,
         self.notify(response.status_code, oio)
         return response
 
+    @transaction.atomic
     def destroy(self, request, uuid=None, version=None):
         instance = drc_storage_adapter.lees_objectinformatieobject(uuid)
         validator = RemoteRelationValidator()
@@ -673,8 +1007,10 @@ class ObjectInformatieObjectViewSet(NotificationCreateMixin,
             return {}
 
 
-class GebruiksrechtenViewSet(NotificationViewSetMixin,
-                            #  ListFilterByAuthorizationsMixin,  TODO: Find a fix for this mixin
+class GebruiksrechtenViewSet(SendNotificationMixin,
+                             NotificationViewSetMixin,
+                             ListFilterByAuthorizationsMixin,
+                             AuditTrailMixin,
                              AuditTrailViewsetMixin,
                              viewsets.ModelViewSet):
     """
@@ -736,6 +1072,247 @@ class GebruiksrechtenViewSet(NotificationViewSetMixin,
     audittrail_main_resource_key = 'informatieobject'
 
 
+class UploadSessieViewSet(NotificationMixin,
+                          AuditTrailMixin,
+                          mixins.CreateModelMixin,
+                          mixins.RetrieveModelMixin,
+                          mixins.DestroyModelMixin,
+                          viewsets.GenericViewSet):
+    """
+    Upload de inhoud van (ENKELVOUDIG) INFORMATIEOBJECTen in delen.
+
+    Grote bestanden worden niet als base64 in `inhoud` meegestuurd, maar als
+    binaire delen naar een UPLOADSESSIE geupload. Een onderbroken upload kan
+    hervat worden vanaf `ontvangen`.
+
+    create:
+    Start een UPLOADSESSIE.
+
+    Geef de `bestandsomvang` op, en optioneel het `informatieobject` waarvan
+    een nieuwe versie gemaakt wordt.
+
+    retrieve:
+    Een specifieke UPLOADSESSIE opvragen.
+
+    Het attribuut `ontvangen` geeft aan vanaf welke positie een onderbroken
+    upload hervat moet worden.
+
+    destroy:
+    Breek een UPLOADSESSIE af.
+
+    De reeds ontvangen delen worden verwijderd.
+
+    inhoud:
+    Upload een deel van de inhoud.
+
+    De body bevat de binaire data van het deel, de `Content-Range` header
+    (bijvoorbeeld `bytes 0-1048575/4194304`) geeft aan waar het deel in het
+    bestand hoort. Een deel mag niet voorbij `ontvangen` beginnen.
+
+    voltooien:
+    Voltooi een UPLOADSESSIE.
+
+    Maakt een (ENKELVOUDIG) INFORMATIEOBJECT aan met de geuploade inhoud, of
+    een nieuwe versie van het `informatieobject` van de sessie. In dat geval
+    moet de `lock` meegestuurd worden.
+
+    **Er wordt gevalideerd op**
+    - alle bytes van het bestand zijn ontvangen
+    - geldigheid `informatieobjecttype` URL
+    """
+    queryset = UploadSessie.objects.all()
+    serializer_class = UploadSessieSerializer
+    lookup_field = 'uuid'
+    permission_classes = (AuthScopesRequired,)
+    required_scopes = {
+        'create': SCOPE_DOCUMENTEN_AANMAKEN | SCOPE_DOCUMENTEN_BIJWERKEN,
+        'retrieve': SCOPE_DOCUMENTEN_AANMAKEN | SCOPE_DOCUMENTEN_BIJWERKEN,
+        'destroy': SCOPE_DOCUMENTEN_AANMAKEN | SCOPE_DOCUMENTEN_BIJWERKEN,
+        'inhoud': SCOPE_DOCUMENTEN_AANMAKEN | SCOPE_DOCUMENTEN_BIJWERKEN,
+        'voltooien': SCOPE_DOCUMENTEN_AANMAKEN | SCOPE_DOCUMENTEN_BIJWERKEN,
+    }
+    notifications_kanaal = KANAAL_DOCUMENTEN
+    notifications_resource = 'enkelvoudiginformatieobject'
+    notifications_model = EnkelvoudigInformatieObject
+    audit = AUDIT_DRC
+    audittrail_serializer_class = RetrieveEnkelvoudigInformatieObjectSerializer
+    audittrail_resource = 'enkelvoudiginformatieobject'
+
+    def get_notification_action(self) -> str:
+        return self._document_action
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(type=openapi.TYPE_FILE),
+        manual_parameters=[
+            openapi.Parameter(
+                'Content-Range',
+                openapi.IN_HEADER,
+                description='De positie van het deel in het bestand, bijvoorbeeld `bytes 0-1048575/4194304`.',
+                type=openapi.TYPE_STRING,
+                required=True
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: UploadSessieSerializer,
+            status.HTTP_400_BAD_REQUEST: openapi.Response("Bad request", schema=FoutSerializer),
+            status.HTTP_401_UNAUTHORIZED: openapi.Response("Unauthorized", schema=FoutSerializer),
+            status.HTTP_403_FORBIDDEN: openapi.Response("Forbidden", schema=FoutSerializer),
+            status.HTTP_404_NOT_FOUND: openapi.Response("Not found", schema=FoutSerializer),
+            status.HTTP_500_INTERNAL_SERVER_ERROR: openapi.Response("Internal server error", schema=FoutSerializer),
+        }
+    )
+    @action(detail=True, methods=['put'])
+    def inhoud(self, request, *args, **kwargs):
+        content_range = request.META.get('HTTP_CONTENT_RANGE')
+        if not content_range:
+            raise_validation_error(_("The Content-Range header is required"), code='missing-content-range')
+
+        parsed = parse_content_range_header(content_range)
+        if parsed is None:
+            raise_validation_error(_("The Content-Range header is invalid"), code='invalid-content-range')
+        start, end, size = parsed
+
+        # the body is read straight from the request stream, DRF must not parse it
+        stream = request.stream
+        if stream is None:
+            raise_validation_error(_("The part does not contain any data"), code='empty-part')
+
+        with transaction.atomic():
+            # lock the session, so parts of the same upload are written one at a time
+            sessie = UploadSessie.objects.select_for_update().get(pk=self.get_object().pk)
+
+            if size is not None and size != sessie.bestandsomvang:
+                raise_validation_error(_("The size does not match the size of the upload"), code='invalid-size')
+            if end >= sessie.bestandsomvang:
+                raise_validation_error(_("The part lies outside of the upload"), code='invalid-content-range')
+            if start > sessie.ontvangen:
+                raise_validation_error(
+                    _("The part must start at or before byte {ontvangen}").format(ontvangen=sessie.ontvangen),
+                    code='invalid-offset'
+                )
+
+            sessie.write_part(stream, start, end - start + 1)
+
+        serializer = self.get_serializer(sessie)
+        return Response(serializer.data)
+
+    @swagger_auto_schema(
+        request_body=VoltooiUploadSessieSerializer,
+        responses={
+            status.HTTP_201_CREATED: RetrieveEnkelvoudigInformatieObjectSerializer,
+            status.HTTP_200_OK: RetrieveEnkelvoudigInformatieObjectSerializer,
+            status.HTTP_400_BAD_REQUEST: openapi.Response("Bad request", schema=FoutSerializer),
+            status.HTTP_401_UNAUTHORIZED: openapi.Response("Unauthorized", schema=FoutSerializer),
+            status.HTTP_403_FORBIDDEN: openapi.Response("Forbidden", schema=FoutSerializer),
+            status.HTTP_404_NOT_FOUND: openapi.Response("Not found", schema=FoutSerializer),
+            status.HTTP_500_INTERNAL_SERVER_ERROR: openapi.Response("Internal server error", schema=FoutSerializer),
+        }
+    )
+    @action(detail=True, methods=['post'])
+    def voltooien(self, request, *args, **kwargs):
+        sessie = self.get_object()
+        if not sessie.voltooid:
+            raise_validation_error(
+                _("Only {ontvangen} of {bestandsomvang} bytes have been received").format(
+                    ontvangen=sessie.ontvangen, bestandsomvang=sessie.bestandsomvang
+                ),
+                code='incomplete-upload'
+            )
+
+        errors = test_invalid_statusses(request.data)
+        if errors:
+            return Response({
+                "type": "error",
+                "code": "invalid_for_received",
+                "title": "ontvangstdatum kan alleen gezet worden tijden het creëren.",
+                "status": 400,
+                "detail": "ontvangstdatum kan alleen gezet worden tijden het creëren.",
+                "instance": "string",
+                "invalid_params": errors,
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # a new version only needs the attributes that change
+        serializer = VoltooiUploadSessieSerializer(data=request.data, partial=bool(sessie.informatieobject))
+        serializer.is_valid(raise_exception=True)
+
+        if sessie.informatieobject:
+            response = self._voltooi_nieuwe_versie(request, sessie, serializer)
+        else:
+            response = self._voltooi_nieuw_document(request, sessie, serializer)
+
+        # the parts are no longer needed once the document is stored
+        sessie.delete()
+        return response
+
+    @atomic_with_audittrails
+    def _voltooi_nieuw_document(self, request, sessie, serializer):
+        if not request.jwt_auth.has_auth(
+            scopes=SCOPE_DOCUMENTEN_AANMAKEN,
+            informatieobjecttype=serializer.validated_data.get('informatieobjecttype'),
+            vertrouwelijkheidaanduiding=serializer.validated_data.get('vertrouwelijkheidaanduiding'),
+        ):
+            raise PermissionDenied()
+
+        inhoud = sessie.open()
+        try:
+            data = serializer.create(inhoud)
+        finally:
+            inhoud.close()
+
+        self._document_action = CommonResourceAction.create
+        return_serializer = RetrieveEnkelvoudigInformatieObjectSerializer(instance=data)
+        response = Response(return_serializer.data, status=status.HTTP_201_CREATED, headers={'Location': data.url})
+        self.notify(response.status_code, data)
+        self.create_audittrail(
+            response.status_code,
+            CommonResourceAction.create,
+            version_before_edit=None,
+            version_after_edit=data,
+            unique_representation=data.unique_representation()
+        )
+        return response
+
+    @atomic_with_audittrails
+    def _voltooi_nieuwe_versie(self, request, sessie, serializer):
+        uuid = sessie.informatieobject.rstrip('/').split('/')[-1]
+        try:
+            before = drc_storage_adapter.lees_enkelvoudiginformatieobject(uuid)
+        except BackendException:
+            raise_validation_error(_("The informatieobject of the upload does not exist"), code='does-not-exist')
+
+        if not request.jwt_auth.has_auth(
+            scopes=SCOPE_DOCUMENTEN_BIJWERKEN,
+            informatieobjecttype=before.informatieobjecttype,
+            vertrouwelijkheidaanduiding=before.vertrouwelijkheidaanduiding,
+        ):
+            raise PermissionDenied()
+
+        inhoud = sessie.open()
+        try:
+            data = serializer.update(uuid, lock=request.data.get('lock'), inhoud=inhoud)
+        except BackendException as e:
+            if e.code == 'not-locked':
+                raise_validation_error(_("Unlocked document can't be modified"), code='unlocked')
+            elif e.code == 'wrong-lock':
+                raise_validation_error(_("Lock id is not correct"), code='incorrect-lock-id')
+            raise e
+        finally:
+            inhoud.close()
+
+        self._document_action = CommonResourceAction.update
+        return_serializer = RetrieveEnkelvoudigInformatieObjectSerializer(instance=data)
+        response = Response(return_serializer.data, status=status.HTTP_200_OK)
+        self.notify(response.status_code, data)
+        self.create_audittrail(
+            response.status_code,
+            CommonResourceAction.update,
+            version_before_edit=before,
+            version_after_edit=data,
+            unique_representation=data.unique_representation()
+        )
+        return response
+
+
 class EnkelvoudigInformatieObjectAuditTrailViewSet(AuditTrailViewSet):
     """
     Opvragen van de audit trail regels.
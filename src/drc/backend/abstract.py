@@ -1,18 +1,39 @@
 from .data import (
-    EnkelvoudigInformatieObject, ObjectInformatieObject, PaginationObject
+    CursorPaginationObject, DocumentVersie, EnkelvoudigInformatieObject,
+    ObjectInformatieObject, PaginationObject
 )
 from .exceptions import BackendException
+from .http import get_session
 
 
 class BaseDRCStorageBackend:
     """
     This is the base Backend storage for the DRC where it should all be based on.
     """
+    # Backends that can filter by an ``AuthorizationPredicate`` in their
+    # queries set this, and accept an ``authorizations`` argument in
+    # ``get_documents``, ``get_documents_by_cursor``, ``get_documents_by_uuid``
+    # and ``get_document_case_connections``. For other backends the adapter
+    # filters the results.
+    supports_authorizations = False
+
     def __init__(self):
         self.exception_class = BackendException
         self.eio_dataclass = EnkelvoudigInformatieObject
         self.oio_dataclass = ObjectInformatieObject
         self.pagination_dataclass = PaginationObject
+        self.cursor_pagination_dataclass = CursorPaginationObject
+        self.document_version_dataclass = DocumentVersie
+
+    @property
+    def session(self):
+        """
+        The pooled HTTP session to use for requests to the document storage.
+
+        The session is shared by all backends (and threads) in this process,
+        so connections are reused instead of opened per request.
+        """
+        return get_session()
 
     def create_document(self, data, content):
         """
@@ -31,6 +52,22 @@ class BaseDRCStorageBackend:
         """
         raise NotImplementedError()
 
+    def create_documents(self, documents):
+        """
+        Creates a batch of documents.
+
+        Backends that can store documents in batches override this, by
+        default the documents are created one at a time.
+
+        Args:
+            documents (list): A list of ``(data, content)`` tuples, as passed to ``create_document``.
+
+        Returns:
+            list: The enkelvoudig informatieobject dataclasses, in the same order.
+
+        """
+        return [self.create_document(data=data, content=content) for data, content in documents]
+
     def get_documents(self, page, page_size, filters=None):
         """
         Fetch all documents.
@@ -47,6 +84,55 @@ class BaseDRCStorageBackend:
         """
         raise NotImplementedError()
 
+    def get_documents_by_uuid(self, uuids):
+        """
+        Fetch the latest version of the documents with the given UUIDs.
+
+        Backends that can fetch the documents in a single query override
+        this, by default the documents are fetched one at a time.
+
+        Args:
+            uuids (list): The UUIDs of the documents.
+
+        Returns:
+            list: The enkelvoudig informatieobject dataclasses, in the order of ``uuids``. UUIDs that don't
+                exist are skipped.
+
+        """
+        documents = []
+        for uuid in uuids:
+            try:
+                documents.append(self.get_document(uuid=uuid))
+            except self.exception_class:
+                continue
+        return documents
+
+    def get_documents_by_cursor(self, page_size, after=None, before=None, filters=None, count=False):
+        """
+        Fetch a page of documents, ordered by registration date, using keyset pagination.
+
+        Only the latest version of each document is returned. A position is a
+        JSON serializable list that identifies a document in the ordering,
+        e.g. ``[begin_registratie, id]``. Fetching a page must not depend on
+        the number of documents before it.
+
+        Args:
+            page_size (int): The maximum number of documents to return.
+            after (list or None): Return the documents after this position.
+            before (list or None): Return the documents before this position.
+            filters (dict or None): A dict with the filters that need to be applied.
+            count (bool): Whether to count the total number of documents.
+
+        Returns:
+            dataclass: A cursor pagination dataclass, with the position of
+            each document in ``positions``.
+
+        Raises:
+            NotImpletedError: This is not implemented yet.
+
+        """
+        raise NotImplementedError()
+
     def get_document(self, uuid, version=None, filters=None):
         """
         Get a single a document.
@@ -63,15 +149,45 @@ class BaseDRCStorageBackend:
         """
         raise NotImplementedError()
 
+    def get_document_version(self, uuid, version=None, filters=None):
+        """
+        Get the version of a single document, used to answer conditional requests.
+
+        Backends should override this with a lookup that is cheaper than
+        ``get_document``, the default gets the whole document.
+
+        Args:
+            uuid (str): The cmis object id (only the uuid part)
+            version (int): The version, by default the latest version.
+            filters (dict): The same filters as ``get_document``.
+
+        Returns:
+            dataclass: A document versie dataclass.
+
+        Raises:
+            BackendException: The document can't be found.
+
+        """
+        document = self.get_document(uuid=uuid, version=version, filters=filters)
+        return self.document_version_dataclass(
+            uuid=document.uuid, versie=document.versie, begin_registratie=document.begin_registratie,
+            indicatie_gebruiksrecht=document.indicatie_gebruiksrecht, locked=document.locked,
+        )
+
     def get_document_content(self, uuid):
         """
-        Get a single a document.
+        Get the binary content of a single document.
+
+        The content should not be read into memory by the backend. Return a
+        file-like object opened in binary mode (preferably seekable, so byte
+        ranges can be served) or an iterable of ``bytes`` chunks. Plain
+        ``bytes`` are still accepted for backwards compatibility.
 
         Args:
             uuid (str): The cmis object id (only the uuid part)
 
         Returns:
-            dataclass: An enkelvoudig informatieobject dataclass.
+            tuple: The content (file-like, iterable of bytes or bytes) and the filename.
 
         Raises:
             NotImpletedError: This is not implemented yet.
@@ -97,6 +213,38 @@ class BaseDRCStorageBackend:
         """
         raise NotImplementedError()
 
+    def set_document_indicatie_gebruiksrecht(self, uuid, indicatie):
+        """
+        Set the indicatie gebruiksrecht of the latest version of a document, in place.
+
+        The indication follows from the gebruiksrechten of the document, so
+        it is set without a lock and without creating a new version. Backends
+        should override this with a single write, by default the document is
+        locked, updated and unlocked.
+
+        Args:
+            uuid (str): The uuid of the document.
+            indicatie (bool): The indication, ``None`` if it is unknown.
+
+        Returns:
+            bool: Whether the indication was changed.
+
+        Raises:
+            BackendException: The document can't be found.
+
+        """
+        document = self.get_document(uuid=uuid)
+        # unknown is shown as false
+        if document.indicatie_gebruiksrecht == bool(indicatie):
+            return False
+
+        lock = self.lock_document(uuid=uuid)
+        try:
+            self.update_document(uuid=uuid, lock=lock, data={'indicatie_gebruiksrecht': indicatie})
+        finally:
+            self.unlock_document(uuid=uuid, lock=lock)
+        return True
+
     def delete_document(self, uuid):
         """
         Deletes a document.
@@ -114,9 +262,37 @@ class BaseDRCStorageBackend:
         raise NotImplementedError()
 
     def lock_document(self, uuid):
+        """
+        Lock a document, so it can only be updated with the lock.
+
+        How long the lock is valid is kept by the adapter, see
+        :mod:`drc.backend.locks`.
+
+        Args:
+            uuid (str): The uuid of the document.
+
+        Returns:
+            str: The lock.
+
+        Raises:
+            BackendException: The document is already locked.
+
+        """
         raise NotImplementedError()
 
     def unlock_document(self, uuid, lock, force=False):
+        """
+        Unlock a document.
+
+        Args:
+            uuid (str): The uuid of the document.
+            lock (str): The lock that was returned by ``lock_document``.
+            force (bool): Unlock without checking the lock.
+
+        Raises:
+            BackendException: The lock is not correct.
+
+        """
         raise NotImplementedError()
 
     def create_document_case_connection(self, data):
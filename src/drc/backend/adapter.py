@@ -1,9 +1,18 @@
 import logging
+import threading
+from dataclasses import replace
 from uuid import uuid4
 
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from django.utils.module_loading import import_string
+from django.utils.translation import ugettext_lazy as _
+
+from .cache import document_cache
+from .exceptions import BackendException
+from .http import get_pool_stats
+from .locks import lock_manager
 
 logger = logging.getLogger(__name__)
 
@@ -17,59 +26,321 @@ class DRCStorageAdapter:
         if settings.CMIS_ENABLED:
             imported_class = import_string('drc_cmis.backend.CMISDRCStorageBackend')
 
-        self.backend = imported_class
+        self.backend_class = imported_class
+        self._backend = None
+        self._lock = threading.Lock()
+
+    def backend(self):
+        """
+        Return the backend instance, shared by all threads of this process.
+
+        Building a backend is not free (the CMIS backend looks up its
+        configuration and repository), so it is built once and reused.
+        """
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self.backend_class()
+        return self._backend
+
+    def reset_backend(self):
+        """
+        Drop the backend instance, e.g. after the backend configuration changed.
+        """
+        with self._lock:
+            self._backend = None
+
+    def stats(self):
+        """
+        Return the connection pool hit/miss counters of this process.
+        """
+        return get_pool_stats()
 
     # Documenten
     def creeer_enkelvoudiginformatieobject(self, gevalideerde_data):
+        data, inhoud = self._document_data(gevalideerde_data)
+        return self.backend().create_document(data=data, content=inhoud)
+
+    def creeer_enkelvoudiginformatieobjecten(self, lijst_gevalideerde_data):
+        documenten = [self._document_data(gevalideerde_data) for gevalideerde_data in lijst_gevalideerde_data]
+        return self.backend().create_documents(documents=documenten)
+
+    def _document_data(self, gevalideerde_data):
+        gevalideerde_data = gevalideerde_data.copy()
         inhoud = gevalideerde_data.pop('inhoud')
 
         # * Add a default identificatie (uuid4) is no identification is passed
         if not gevalideerde_data.get('identificatie'):
             gevalideerde_data['identificatie'] = uuid4()
+        return gevalideerde_data, inhoud
+
+    def lees_enkelvoudiginformatieobjecten(self, page, page_size, filters, autorisaties=None):
+        documents = self._lees_enkelvoudiginformatieobjecten(page, page_size, filters, autorisaties)
+        self._lock_status(documents.results)
+        return documents
+
+    def _lees_enkelvoudiginformatieobjecten(self, page, page_size, filters, autorisaties):
+        if filters:
+            filters = {key: value for key, value in filters.items() if value is not None}
+
+        backend = self.backend()
+        if autorisaties is None:
+            return backend.get_documents(page=page, page_size=page_size, filters=filters)
+        if not autorisaties:
+            return backend.pagination_dataclass(count=0, results=[])
+        if backend.supports_authorizations:
+            return backend.get_documents(page=page, page_size=page_size, filters=filters, authorizations=autorisaties)
+
+        # the pages of the backend don't line up with the pages of the
+        # allowed documents, every page would be read from the first one
+        raise BackendException(
+            {None: _('Paginanummers worden niet ondersteund voor deze autorisaties, gebruik paginering=cursor.')},
+            retreive_list=True, code='cursor-pagination-required'
+        )
 
-        data = self.backend().create_document(data=gevalideerde_data.copy(), content=inhoud)
-        return data
+    def lees_enkelvoudiginformatieobjecten_cursor(self, page_size, after=None, before=None, filters=None, count=False,
+                                                  autorisaties=None):
+        page = self._lees_enkelvoudiginformatieobjecten_cursor(page_size, after, before, filters, count, autorisaties)
+        self._lock_status(page.results)
+        return page
 
-    def lees_enkelvoudiginformatieobjecten(self, page, page_size, filters):
+    def _lees_enkelvoudiginformatieobjecten_cursor(self, page_size, after, before, filters, count, autorisaties):
         if filters:
             filters = {key: value for key, value in filters.items() if value is not None}
-        return self.backend().get_documents(page=page, page_size=page_size, filters=filters)
+
+        backend = self.backend()
+        kwargs = dict(page_size=page_size, after=after, before=before, filters=filters, count=count)
+        if autorisaties is None:
+            return backend.get_documents_by_cursor(**kwargs)
+        if not autorisaties:
+            return backend.cursor_pagination_dataclass(results=[], count=0 if count else None)
+        if backend.supports_authorizations:
+            return backend.get_documents_by_cursor(authorizations=autorisaties, **kwargs)
+
+        return self._filter_cursor_pages(backend, page_size, after, before, filters, autorisaties)
+
+    def _filter_cursor_pages(self, backend, page_size, after, before, filters, autorisaties):
+        """
+        Return the page of the documents ``autorisaties`` allows, for backends that can't filter in their queries.
+
+        The backend is asked for full pages, until the page is full. Only the
+        missing documents are taken from the last page, the positions are
+        those of the last document that was taken. The number of allowed
+        documents is unknown, ``count`` is ``None``.
+        """
+        backwards = before is not None
+        results = []
+        first = None
+        while True:
+            page = backend.get_documents_by_cursor(page_size=page_size, after=after, before=before, filters=filters)
+            first = first or page
+            allowed = [
+                (document, position) for document, position in zip(page.results, page.positions)
+                if autorisaties.allows(document.informatieobjecttype, document.vertrouwelijkheidaanduiding)
+            ]
+            missing = page_size - len(results)
+            if backwards:
+                if len(allowed) > missing:
+                    # continue before the first document that was taken
+                    allowed = allowed[-missing:]
+                    before = allowed[0][1]
+                else:
+                    before = page.previous_position
+                results[:0] = [document for document, position in allowed]
+            else:
+                if len(allowed) > missing:
+                    # continue after the last document that was taken
+                    allowed = allowed[:missing]
+                    after = allowed[-1][1]
+                else:
+                    after = page.next_position
+                results += [document for document, position in allowed]
+            if len(results) >= page_size or (before if backwards else after) is None:
+                break
+
+        if backwards:
+            return backend.cursor_pagination_dataclass(
+                results=results, next_position=first.next_position, previous_position=before
+            )
+        return backend.cursor_pagination_dataclass(
+            results=results, next_position=after, previous_position=first.previous_position
+        )
+
+    def lees_enkelvoudiginformatieobjecten_uuids(self, uuids, autorisaties=None):
+        return self._lock_status(self._lees_enkelvoudiginformatieobjecten_uuids(uuids, autorisaties))
+
+    def _lees_enkelvoudiginformatieobjecten_uuids(self, uuids, autorisaties):
+        # unique, in the requested order
+        uuids = list(dict.fromkeys(str(uuid) for uuid in uuids))
+
+        backend = self.backend()
+        if autorisaties is None:
+            return backend.get_documents_by_uuid(uuids=uuids)
+        if not autorisaties:
+            return []
+        if backend.supports_authorizations:
+            return backend.get_documents_by_uuid(uuids=uuids, authorizations=autorisaties)
+        return self._filter_documents(backend.get_documents_by_uuid(uuids=uuids), autorisaties)
+
+    def _filter_documents(self, documents, autorisaties):
+        # fallback for backends that can't filter in their queries
+        return [
+            document for document in documents
+            if autorisaties.allows(document.informatieobjecttype, document.vertrouwelijkheidaanduiding)
+        ]
+
+    def _lock_status(self, documents):
+        # an expired lock is still held by the backend, until it is released
+        locked = [document for document in documents if document.locked]
+        if locked:
+            leases = lock_manager.get_many(document.uuid for document in locked)
+            for document in locked:
+                lease = leases[str(document.uuid)]
+                document.locked = lease is None or not lease.verlopen
+        return documents
+
+    def _is_locked(self, uuid) -> bool:
+        # for a document the backend reports as locked
+        lease = lock_manager.get(uuid)
+        return lease is None or not lease.verlopen
 
     def lees_enkelvoudiginformatieobject(self, uuid, versie=None, filters=None):
         if filters:
             filters = {key: value for key, value in filters.items() if value is not None}
-        return self.backend().get_document(uuid=uuid, version=versie, filters=filters)
+        backend = self.backend()
+        versie = versie or (filters or {}).get('versie')
+        if filters and set(filters) - {'versie'}:
+            # which version is returned depends on more than the version number
+            document = backend.get_document(uuid=uuid, version=versie, filters=filters)
+        else:
+            document = document_cache.get(
+                uuid, int(versie) if versie else None, lambda versie: backend.get_document(uuid=uuid, version=versie)
+            )
+        return self._lock_status([document])[0]
+
+    def lees_enkelvoudiginformatieobject_versie(self, uuid, versie=None, filters=None):
+        if filters:
+            filters = {key: value for key, value in filters.items() if value is not None}
+        backend = self.backend()
+        versie = versie or (filters or {}).get('versie')
+        if not (filters and set(filters) - {'versie'}):
+            document = document_cache.get_cached(uuid, int(versie) if versie else None)
+            if document is not None:
+                return backend.document_version_dataclass(
+                    uuid=str(uuid), versie=document.versie, begin_registratie=document.begin_registratie,
+                    indicatie_gebruiksrecht=document.indicatie_gebruiksrecht,
+                    locked=document.locked and self._is_locked(uuid),
+                )
+        document_versie = backend.get_document_version(uuid=uuid, version=versie, filters=filters)
+        if document_versie.locked and not self._is_locked(uuid):
+            document_versie = replace(document_versie, locked=False)
+        return document_versie
 
     def lees_enkelvoudiginformatieobject_inhoud(self, uuid):
         return self.backend().get_document_content(uuid=uuid)
 
     def update_enkenvoudiginformatieobject(self, uuid, lock, gevalideerde_data):
         inhoud = gevalideerde_data.pop('inhoud', None)
-        return self.backend().update_document(
+        self.unlock_verlopen_enkelvoudiginformatieobject(uuid)
+        document = self.backend().update_document(
             uuid=uuid,
             lock=lock,
             data=gevalideerde_data.copy(),
             content=inhoud
         )
+        # using the lock renews it
+        lock_manager.renew(uuid, lock)
+        document_cache.invalidate(uuid)
+        return document
+
+    def zet_indicatie_gebruiksrecht(self, uuid, indicatie):
+        gewijzigd = self.backend().set_document_indicatie_gebruiksrecht(uuid=uuid, indicatie=indicatie)
+        if gewijzigd:
+            # the latest version changed in place
+            document_cache.invalidate(uuid, versions=True)
+        return gewijzigd
 
     def verwijder_enkelvoudiginformatieobject(self, uuid):
-        return self.backend().delete_document(uuid=uuid)
+        document = self.backend().delete_document(uuid=uuid)
+        document_cache.invalidate(uuid, versions=True)
+        return document
 
     def lock_enkelvoudiginformatieobject(self, uuid):
-        return self.backend().lock_document(uuid=uuid)
+        self.unlock_verlopen_enkelvoudiginformatieobject(uuid)
+        backend = self.backend()
+        # a lock without a lease would never expire
+        with transaction.atomic():
+            lock = backend.lock_document(uuid=uuid)
+            try:
+                with transaction.atomic():
+                    lock_manager.acquire(uuid, lock)
+            except Exception:
+                # backends outside the database aren't rolled back
+                backend.unlock_document(uuid=uuid, lock=lock)
+                raise
+        document_cache.invalidate(uuid)
+        return lock
+
+    def verleng_lock_enkelvoudiginformatieobject(self, uuid, lock):
+        """
+        Renew the lease on the lock (a heartbeat), see :mod:`drc.backend.locks`.
+        """
+        if not lock_manager.renew(uuid, lock):
+            raise BackendException({None: _('Het lock id is niet correct of verlopen.')}, update=True, code='wrong-lock')
+        return lock
 
     def unlock_enkelvoudiginformatieobject(self, uuid, lock, force=False):
-        return self.backend().unlock_document(uuid=uuid, lock=lock, force=force)
+        result = self.backend().unlock_document(uuid=uuid, lock=lock, force=force)
+        lock_manager.release(uuid)
+        document_cache.invalidate(uuid)
+        return result
+
+    def unlock_verlopen_enkelvoudiginformatieobject(self, uuid):
+        """
+        Release the lock of the document if its lease expired.
+
+        Returns whether a lock was released.
+        """
+        lease = lock_manager.get(uuid)
+        if lease is None or not lease.verlopen:
+            return False
+        # whoever ends the lease releases the lock
+        if not lock_manager.release(uuid, lease.lock):
+            return False
+        try:
+            self.backend().unlock_document(uuid=uuid, lock=lease.lock)
+        except BackendException:
+            # the document was unlocked (and maybe locked again) in the meantime
+            pass
+        document_cache.invalidate(uuid)
+        return True
 
     # Connecties
     def creeer_objectinformatieobject(self, gevalideerde_data):
         gevalideerde_data['registratiedatum'] = timezone.now()
         return self.backend().create_document_case_connection(data=gevalideerde_data.copy())
 
-    def lees_objectinformatieobjecten(self, filters=None):
+    def lees_objectinformatieobjecten(self, filters=None, autorisaties=None):
         if filters:
             filters = {key: value for key, value in filters.items() if value is not None}
-        return self.backend().get_document_case_connections(filters=filters)
+
+        backend = self.backend()
+        if autorisaties is None:
+            return backend.get_document_case_connections(filters=filters)
+        if not autorisaties:
+            return []
+        if backend.supports_authorizations:
+            return backend.get_document_case_connections(filters=filters, authorizations=autorisaties)
+
+        # look up the documents at once, to test them against the authorizations
+        connections = backend.get_document_case_connections(filters=filters)
+        uuids = [connection.informatieobject.rstrip('/').split('/')[-1] for connection in connections]
+        allowed = {
+            document.uuid for document in self._filter_documents(
+                backend.get_documents_by_uuid(uuids=list(dict.fromkeys(uuids))), autorisaties
+            )
+        }
+        return [connection for connection, uuid in zip(connections, uuids) if uuid in allowed]
 
     def lees_objectinformatieobject(self, uuid):
         return self.backend().get_document_case_connection(uuid=uuid)
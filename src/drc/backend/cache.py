@@ -0,0 +1,105 @@
+"""
+Read-through cache of document metadata, used by the adapter.
+
+A version of a document is not changed once it is stored, so the versions
+are cached without expiry, keyed by ``uuid`` and ``versie``. Which version is
+the latest, and whether the document is locked, does change. That is kept in
+a separate entry per document that expires after
+``DOCUMENT_CACHE_LATEST_TIMEOUT`` seconds and is removed when the document
+is updated, deleted, locked or unlocked. Setting the indicatie gebruiksrecht
+changes the latest version in place, which removes the cached versions too.
+
+Documents that are read inside a database transaction are not cached,
+because the transaction may still be rolled back.
+"""
+from dataclasses import replace
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+LATEST_KEY = 'drc:document:{uuid}'
+VERSION_KEY = 'drc:document:{uuid}:{versie}'
+
+
+class DocumentCache:
+    @property
+    def cache(self):
+        alias = settings.DOCUMENT_CACHE_ALIAS
+        return caches[alias] if alias else None
+
+    def get(self, uuid: str, versie: Optional[int], fetch: Callable):
+        """
+        Return the document, calling ``fetch(versie)`` when it is not cached.
+
+        ``fetch(None)`` returns the latest version.
+        """
+        cache = self.cache
+        if cache is None:
+            return fetch(versie)
+
+        uuid = str(uuid)
+        latest = cache.get(LATEST_KEY.format(uuid=uuid))
+        if latest is None:
+            document = fetch(None)
+            latest = {'versie': document.versie, 'locked': document.locked}
+            self._set(cache, uuid, latest, document)
+            if not versie or int(versie) == int(document.versie):
+                return document
+
+        versie = versie or latest['versie']
+        key = VERSION_KEY.format(uuid=uuid, versie=versie)
+        document = cache.get(key)
+        if document is None:
+            document = fetch(versie)
+            if self._can_cache():
+                cache.set(key, document, None)
+        # the lock applies to all versions
+        return replace(document, locked=latest['locked'])
+
+    def get_cached(self, uuid: str, versie: Optional[int] = None):
+        """
+        Return the document if it is cached, without reading it.
+        """
+        cache = self.cache
+        if cache is None:
+            return None
+
+        uuid = str(uuid)
+        latest = cache.get(LATEST_KEY.format(uuid=uuid))
+        if latest is None:
+            return None
+        return cache.get(VERSION_KEY.format(uuid=uuid, versie=versie or latest['versie']))
+
+    def _set(self, cache, uuid: str, latest: dict, document) -> None:
+        if not self._can_cache():
+            return
+        cache.set(VERSION_KEY.format(uuid=uuid, versie=document.versie), document, None)
+        cache.set(LATEST_KEY.format(uuid=uuid), latest, settings.DOCUMENT_CACHE_LATEST_TIMEOUT)
+
+    def _can_cache(self) -> bool:
+        return not connection.in_atomic_block
+
+    def invalidate(self, uuid: str, versions: bool = False) -> None:
+        """
+        Forget the latest version of the document, and all its versions if they
+        changed (it was deleted, or its latest version was changed in place).
+        """
+        cache = self.cache
+        if cache is None:
+            return
+
+        uuid = str(uuid)
+        keys = [LATEST_KEY.format(uuid=uuid)]
+        if versions:
+            latest = cache.get(keys[0])
+            if latest is not None:
+                keys += [VERSION_KEY.format(uuid=uuid, versie=versie) for versie in range(1, int(latest['versie']) + 1)]
+
+        cache.delete_many(keys)
+        # and again once the change is visible to other requests
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+document_cache = DocumentCache()
@@ -1,6 +1,38 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import date, datetime
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
+
+
+def _getstate(self):
+    return [getattr(self, field.name) for field in fields(self)]
+
+
+def _setstate(self, state):
+    # pickled before the class had slots
+    if isinstance(state, dict):
+        state = [state.get(field.name) for field in fields(self)]
+    for field, value in zip(fields(self), state):
+        # also for frozen dataclasses
+        object.__setattr__(self, field.name, value)
+
+
+def with_slots(cls):
+    """
+    Recreate the dataclass ``cls`` with ``__slots__`` for its fields.
+
+    Its instances don't have a ``__dict__`` then, which saves memory when a
+    backend returns many of them. ``dataclass(slots=True)`` is only available
+    from Python 3.10.
+    """
+    names = tuple(field.name for field in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        # the defaults are part of ``__init__`` already
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace.update(__slots__=names, __getstate__=_getstate, __setstate__=_setstate)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
 
 
 @dataclass
@@ -11,6 +43,34 @@ class PaginationObject:
     previous: str = None
 
 
+@dataclass
+class CursorPaginationObject:
+    results: list
+    # the positions to continue from, ``None`` if there is no next/previous page
+    next_position: Optional[List] = None
+    previous_position: Optional[List] = None
+    count: Optional[int] = None
+    # the position of each of the results
+    positions: Optional[List] = None
+
+
+@with_slots
+@dataclass(frozen=True)
+class DocumentVersie:
+    """
+    Identifies a version of a document, without its attributes.
+
+    The ``indicatie_gebruiksrecht`` and whether the document is locked are
+    included, because they are changed in place, without a new version.
+    """
+    uuid: str
+    versie: str
+    begin_registratie: datetime
+    indicatie_gebruiksrecht: Optional[bool] = None
+    locked: bool = False
+
+
+@with_slots
 @dataclass
 class EnkelvoudigInformatieObject:
     url: str
@@ -41,6 +101,9 @@ class EnkelvoudigInformatieObject:
     versie: str
     locked: bool
 
+    # determined by the storage backend, the content is updated separately
+    NOT_UPDATABLE = ('url', 'inhoud', 'bestandsomvang', 'versie', 'begin_registratie', 'locked')
+
     def __post_init__(self):
         # FIXME - this is NOT a default, but required for the archiving flow
         # with Contezza
@@ -62,15 +125,19 @@ class EnkelvoudigInformatieObject:
     def beginRegistratie(self):
         return self.begin_registratie.isoformat().replace('+00:00', 'Z')
 
+    def as_update_dict(self) -> Dict[str, Any]:
+        """
+        Return the attributes that can be updated and have a value.
+        """
+        return {
+            field.name: getattr(self, field.name) for field in fields(self)
+            if field.name not in self.NOT_UPDATABLE and getattr(self, field.name) is not None
+        }
+
     def update(self):
         from .adapter import drc_storage_adapter
         lock = drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
-        data = self.__dict__.copy()
-        del data['inhoud']
-        del data['url']
-        del data['bestandsomvang']
-        data = {k: v for k, v in data.items() if v is not None}
-        drc_storage_adapter.update_enkenvoudiginformatieobject(self.uuid, lock, data)
+        drc_storage_adapter.update_enkenvoudiginformatieobject(self.uuid, lock, self.as_update_dict())
         return drc_storage_adapter.unlock_enkelvoudiginformatieobject(self.uuid, lock)
 
     @property
@@ -89,7 +156,8 @@ class EnkelvoudigInformatieObject:
         }
 
 
-@dataclass
+@with_slots
+@dataclass(frozen=True)
 class ObjectInformatieObject:
     url: str
     informatieobject: str
@@ -1,10 +1,18 @@
 import logging
+import uuid as _uuid
 
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.paginator import InvalidPage, Paginator
+from django.db import transaction
+from django.db.models import F, Q
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
 from django.utils.module_loading import import_string
 from django.utils.translation import ugettext_lazy as _
 
+from drc.datamodel.blobs import IntegriteitError
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,48 +20,266 @@ class DjangoDRCStorageBackend(import_string(settings.ABSTRACT_BASE_CLASS)):
     """
     This is the backend that is used to store the documents in a CMIS compatible backend.
     """
+    supports_authorizations = True
+
     def create_document(self, data, content):
         from drc.datamodel.models import EnkelvoudigInformatieObject
-        eio = EnkelvoudigInformatieObject.objects.create(inhoud=content, **data)
+        try:
+            eio = EnkelvoudigInformatieObject.objects.create(inhoud=content, **data)
+        except IntegriteitError as exc:
+            raise self._integriteit_exception(exc, create=True)
         return eio
 
-    def get_documents(self, filters=None):
+    def create_documents(self, documents):
+        from drc.datamodel.models import (
+            EnkelvoudigInformatieObject, EnkelvoudigInformatieObjectCanonical
+        )
+        with transaction.atomic():
+            canonicals = EnkelvoudigInformatieObjectCanonical.objects.bulk_create([
+                EnkelvoudigInformatieObjectCanonical() for _ in documents
+            ])
+            eios = [
+                EnkelvoudigInformatieObject(canonical=canonical, inhoud=content, **data)
+                for canonical, (data, content) in zip(canonicals, documents)
+            ]
+            # bulk_create skips EnkelvoudigInformatieObject.save, which stores the content
+            try:
+                for eio in eios:
+                    eio.store_inhoud()
+            except IntegriteitError as exc:
+                raise self._integriteit_exception(exc, create=True)
+            eios = EnkelvoudigInformatieObject.objects.bulk_create(eios)
+            # and sets the pointer
+            for canonical, eio in zip(canonicals, eios):
+                canonical.latest = eio
+            EnkelvoudigInformatieObjectCanonical.objects.bulk_update(canonicals, ['latest'])
+        return [self._to_dataclass(eio) for eio in eios]
+
+    def _get_latest_documents(self, filters=None, authorizations=None):
         from drc.datamodel.models import EnkelvoudigInformatieObject
-        queryset = EnkelvoudigInformatieObject.objects.all()
-        for key, value in filters.items():
+        # only the latest version of each document
+        queryset = (
+            EnkelvoudigInformatieObject.objects
+            .filter(canonical__latest=F('pk'))
+            .select_related('canonical')
+        )
+        for key, value in (filters or {}).items():
             if value is not None and value != '':
-                logger.warning('Apply filter {}: {}'.format(key, value))
                 queryset = queryset.filter(**{key: value})
+        if authorizations is not None:
+            queryset = queryset.filter_for_predicate(authorizations)
         return queryset
 
-    def get_document(self, identification):
-        from drc.datamodel.models import EnkelvoudigInformatieObject
+    def get_documents(self, page=1, page_size=100, filters=None, authorizations=None):
+        paginator = Paginator(self._get_latest_documents(filters, authorizations).order_by('pk'), page_size)
         try:
-            return EnkelvoudigInformatieObject.objects.get(uuid=identification)
-        except ObjectDoesNotExist:
+            documents = paginator.page(page)
+        except InvalidPage:
+            raise self.exception_class({None: _('De pagina is ongeldig.')}, retreive_list=True, code='invalid-page')
+        return self.pagination_dataclass(
+            count=paginator.count,
+            results=[self._to_dataclass(eio) for eio in documents],
+        )
+
+    def get_documents_by_uuid(self, uuids, authorizations=None):
+        documents = {
+            str(eio.uuid): eio
+            for eio in self._get_latest_documents(authorizations=authorizations).filter(uuid__in=uuids)
+        }
+        return [self._to_dataclass(documents[uuid]) for uuid in uuids if uuid in documents]
+
+    def get_documents_by_cursor(self, page_size, after=None, before=None, filters=None, count=False,
+                                authorizations=None):
+        queryset = self._get_latest_documents(filters, authorizations)
+        total = queryset.count() if count else None
+
+        # fetch one extra document to know if there is another page
+        if before is not None:
+            begin_registratie, pk = self._parse_position(before)
+            documents = list(
+                queryset
+                .filter(Q(begin_registratie__lt=begin_registratie) | Q(begin_registratie=begin_registratie, pk__lt=pk))
+                .order_by('-begin_registratie', '-pk')[:page_size + 1]
+            )
+            has_previous, has_next = len(documents) > page_size, True
+            documents = documents[:page_size][::-1]
+        else:
+            if after is not None:
+                begin_registratie, pk = self._parse_position(after)
+                queryset = queryset.filter(
+                    Q(begin_registratie__gt=begin_registratie) | Q(begin_registratie=begin_registratie, pk__gt=pk)
+                )
+            documents = list(queryset.order_by('begin_registratie', 'pk')[:page_size + 1])
+            has_previous, has_next = after is not None, len(documents) > page_size
+            documents = documents[:page_size]
+
+        return self.cursor_pagination_dataclass(
+            results=[self._to_dataclass(eio) for eio in documents],
+            next_position=self._get_position(documents[-1]) if has_next and documents else None,
+            previous_position=self._get_position(documents[0]) if has_previous and documents else None,
+            count=total,
+            positions=[self._get_position(eio) for eio in documents],
+        )
+
+    def _get_position(self, eio):
+        return [eio.begin_registratie.isoformat(), eio.pk]
+
+    def _parse_position(self, position):
+        try:
+            begin_registratie, pk = position
+            begin_registratie, pk = parse_datetime(begin_registratie), int(pk)
+        except (TypeError, ValueError):
+            begin_registratie = None
+        if begin_registratie is None:
+            raise self.exception_class({None: _('De positie is ongeldig.')}, retreive_list=True, code='invalid-position')
+        return begin_registratie, pk
+
+    def _to_dataclass(self, eio):
+        download_path = reverse('enkelvoudiginformatieobjecten-download', kwargs={'version': '1', 'uuid': eio.uuid})
+        return self.eio_dataclass(
+            url=eio.url,
+            inhoud=f"{settings.HOST_URL}{download_path}",
+            creatiedatum=eio.creatiedatum,
+            ontvangstdatum=eio.ontvangstdatum,
+            verzenddatum=eio.verzenddatum,
+            integriteit_datum=eio.integriteit_datum,
+            ondertekening_datum=eio.ondertekening_datum,
+            titel=eio.titel,
+            identificatie=eio.identificatie,
+            bronorganisatie=eio.bronorganisatie,
+            vertrouwelijkheidaanduiding=eio.vertrouwelijkheidaanduiding,
+            auteur=eio.auteur,
+            status=eio.status,
+            beschrijving=eio.beschrijving,
+            indicatie_gebruiksrecht=eio.indicatie_gebruiksrecht,
+            ondertekening_soort=eio.ondertekening_soort,
+            informatieobjecttype=eio.informatieobjecttype,
+            formaat=eio.formaat,
+            taal=eio.taal,
+            bestandsnaam=eio.bestandsnaam,
+            link=eio.link,
+            integriteit_algoritme=eio.integriteit_algoritme,
+            integriteit_waarde=eio.integriteit_waarde,
+            bestandsomvang=eio.bestandsomvang,
+            begin_registratie=eio.begin_registratie,
+            versie=eio.versie,
+            locked=bool(eio.canonical.lock),
+        )
+
+    def _get_version(self, uuid, version=None, filters=None):
+        from drc.datamodel.models import EnkelvoudigInformatieObject
+        filters = filters or {}
+        queryset = EnkelvoudigInformatieObject.objects.filter(uuid=uuid)
+        version = version or filters.get('versie')
+        if version:
+            queryset = queryset.filter(versie=version)
+        if filters.get('registratie_op'):
+            queryset = queryset.filter(begin_registratie__lte=filters['registratie_op'])
+        return queryset.order_by('-versie')
+
+    def get_document(self, uuid, version=None, filters=None):
+        eio = self._get_version(uuid, version, filters).select_related('canonical').first()
+        if eio is None:
             raise self.exception_class({None: _('Het enkelvoudiginformatieobject kan niet worden gevonden.')}, retreive_single=True)
+        return self._to_dataclass(eio)
 
-    def update_document(self, identification, data, content):
+    def get_document_version(self, uuid, version=None, filters=None):
+        versie = (
+            self._get_version(uuid, version, filters)
+            .values('versie', 'begin_registratie', 'indicatie_gebruiksrecht', 'canonical__lock')
+            .first()
+        )
+        if versie is None:
+            raise self.exception_class({None: _('Het enkelvoudiginformatieobject kan niet worden gevonden.')}, retreive_single=True)
+        locked = bool(versie.pop('canonical__lock'))
+        return self.document_version_dataclass(uuid=str(uuid), locked=locked, **versie)
+
+    def get_document_content(self, uuid):
         from drc.datamodel.models import EnkelvoudigInformatieObject
-        try:
-            eio = EnkelvoudigInformatieObject.objects.get(uuid=identification)
-        except ObjectDoesNotExist:
-            raise self.exception_class({None: _('Het enkelvoudiginformatieobject kan niet worden gevonden.')}, update=True)
-        else:
+        eio = EnkelvoudigInformatieObject.objects.filter(uuid=uuid).order_by('-versie').first()
+        if eio is None or not eio.inhoud:
+            raise self.exception_class({None: _('Het enkelvoudiginformatieobject kan niet worden gevonden.')}, retreive_single=True)
+        # hand out the open file, the caller streams it in chunks
+        return eio.inhoud.open('rb'), eio.bestandsnaam or str(eio.uuid)
+
+    def update_document(self, uuid, lock, data, content=None):
+        with transaction.atomic():
+            eio = self._get_latest_documents().select_for_update().filter(uuid=uuid).first()
+            if eio is None:
+                raise self.exception_class({None: _('Het enkelvoudiginformatieobject kan niet worden gevonden.')}, update=True)
+            if not eio.canonical.lock:
+                raise self.exception_class({None: _('Het enkelvoudiginformatieobject is niet gelocked.')}, update=True, code='not-locked')
+            if lock != eio.canonical.lock:
+                raise self.exception_class({None: _('Het lock id is niet correct.')}, update=True, code='wrong-lock')
+
+            # a new version, which shares the stored content if it didn't change
+            eio.pk = None
+            eio.versie += 1
             for key, value in data.items():
                 setattr(eio, key, value)
-            eio.save()
-            return eio
+            if content is not None:
+                eio.inhoud = content
+                if 'integriteit' not in data:
+                    # the checksum of the previous content, computed again
+                    eio.integriteit = None
+            try:
+                eio.save()
+            except IntegriteitError as exc:
+                raise self._integriteit_exception(exc, update=True)
+        return self._to_dataclass(eio)
 
-    def delete_document(self, identification):
+    def set_document_indicatie_gebruiksrecht(self, uuid, indicatie):
         from drc.datamodel.models import EnkelvoudigInformatieObject
-        try:
-            eio = EnkelvoudigInformatieObject.objects.get(uuid=identification)
-        except ObjectDoesNotExist:
+        latest = self._get_latest_documents().filter(uuid=uuid).values('pk')
+        updated = (
+            EnkelvoudigInformatieObject.objects
+            .filter(pk__in=latest)
+            .exclude(indicatie_gebruiksrecht=indicatie)
+            .update(indicatie_gebruiksrecht=indicatie)
+        )
+        if not updated and not latest.exists():
+            raise self.exception_class({None: _('Het enkelvoudiginformatieobject kan niet worden gevonden.')}, update=True)
+        return bool(updated)
+
+    def _integriteit_exception(self, exc, **kwargs):
+        message = _('De checksum ({algoritme}) van de inhoud is {waarde}.').format(
+            algoritme=exc.algoritme, waarde=exc.waarde
+        )
+        return self.exception_class({'integriteit': [message]}, code='integriteit-mismatch', **kwargs)
+
+    def delete_document(self, uuid):
+        from drc.datamodel.models import EnkelvoudigInformatieObjectCanonical
+        eio = self._get_latest_documents().filter(uuid=uuid).first()
+        if eio is None:
             raise self.exception_class({None: _('Het enkelvoudiginformatieobject kan niet worden gevonden.')}, delete=True)
-        else:
-            eio.delete()
-            return eio
+        document = self._to_dataclass(eio)
+        # all versions, the stored content is released for each of them
+        EnkelvoudigInformatieObjectCanonical.objects.filter(pk=eio.canonical_id).delete()
+        return document
+
+    def _get_canonical_for_update(self, uuid, **kwargs):
+        from drc.datamodel.models import EnkelvoudigInformatieObject, EnkelvoudigInformatieObjectCanonical
+        canonical_id = EnkelvoudigInformatieObject.objects.filter(uuid=uuid).values('canonical_id')[:1]
+        canonical = EnkelvoudigInformatieObjectCanonical.objects.select_for_update().filter(pk=canonical_id).first()
+        if canonical is None:
+            raise self.exception_class({None: _('Het enkelvoudiginformatieobject kan niet worden gevonden.')}, **kwargs)
+        return canonical
+
+    def lock_document(self, uuid):
+        with transaction.atomic():
+            canonical = self._get_canonical_for_update(uuid, update=True)
+            if canonical.lock:
+                raise self.exception_class({None: _('Het enkelvoudiginformatieobject is al gelocked.')}, update=True, code='existing-lock')
+            canonical.lock = _uuid.uuid4().hex
+            type(canonical).objects.filter(pk=canonical.pk).update(lock=canonical.lock)
+        return canonical.lock
+
+    def unlock_document(self, uuid, lock, force=False):
+        with transaction.atomic():
+            canonical = self._get_canonical_for_update(uuid, update=True)
+            if not force and lock != canonical.lock:
+                raise self.exception_class({None: _('Het lock id is niet correct.')}, update=True, code='wrong-lock')
+            type(canonical).objects.filter(pk=canonical.pk).update(lock='')
 
     def create_document_case_connection(self, data):
         from drc.datamodel.models import ObjectInformatieObject, EnkelvoudigInformatieObject
@@ -63,14 +289,17 @@ class DjangoDRCStorageBackend(import_string(settings.ABSTRACT_BASE_CLASS)):
         oio = ObjectInformatieObject.objects.create(informatieobject=eio, **data)
         return oio
 
-    def get_document_case_connections(self, filters=None):
+    def get_document_case_connections(self, filters=None, authorizations=None):
         from drc.datamodel.models import ObjectInformatieObject
-        return ObjectInformatieObject.objects.all()
+        queryset = ObjectInformatieObject.objects.with_latest_version()
+        if authorizations is not None:
+            queryset = queryset.filter_for_predicate(authorizations)
+        return queryset
 
-    def get_document_case_connection(self, identification):
+    def get_document_case_connection(self, uuid):
         from drc.datamodel.models import ObjectInformatieObject
         try:
-            return ObjectInformatieObject.objects.get(uuid=identification)
+            return ObjectInformatieObject.objects.get(uuid=uuid)
         except ObjectDoesNotExist:
             raise self.exception_class({None: _('Het object informatieobject kan niet worden gevonden.')}, retreive_single=True)
 
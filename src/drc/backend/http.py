@@ -0,0 +1,144 @@
+"""
+A pooled HTTP session, shared by the backends and outgoing requests of a process.
+
+Creating a new session for every request means a new TCP (and TLS) connection
+for every call to the document storage. The session below keeps the
+connections open and reuses them, the pool size is configured with
+``HTTP_POOL_CONNECTIONS`` and ``HTTP_POOL_MAXSIZE``.
+
+The session is shared by all threads, and never closed while the process
+runs. Connections the other side closed while they were idle are replaced by
+urllib3, which checks a pooled connection before it is reused, and retries
+idempotent requests ``HTTP_RETRIES`` times if the connection drops anyway (but
+not if they time out).
+
+Requests without a timeout of their own get ``HTTP_TIMEOUT``, so a hanging
+server can't block a thread indefinitely.
+"""
+import logging
+import threading
+
+from django.conf import settings
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_session = None
+# counters of the sessions that were closed, so the totals survive a reset
+_retired = {'hits': 0, 'misses': 0}
+
+
+class DroppedConnectionRetry(Retry):
+    """
+    Retry requests of which the connection failed or dropped, but not timeouts.
+
+    A request that timed out would take ``HTTP_TIMEOUT`` again.
+    """
+    def increment(self, method=None, url=None, response=None, error=None, *args, **kwargs):
+        if isinstance(error, ReadTimeoutError):
+            raise error
+        return super().increment(method, url, response, error, *args, **kwargs)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = get_timeout()
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+def get_timeout():
+    """
+    Return the timeout for outgoing requests, ``None`` for no timeout.
+    """
+    return settings.HTTP_TIMEOUT or None
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        # requests follows the redirects itself
+        max_retries=DroppedConnectionRetry(total=settings.HTTP_RETRIES, redirect=False, raise_on_status=False),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _iter_pools(session: requests.Session):
+    for adapter in set(session.adapters.values()):
+        poolmanager = getattr(adapter, 'poolmanager', None)
+        if poolmanager is None:
+            continue
+        for key in poolmanager.pools.keys():
+            pool = poolmanager.pools.get(key)
+            if pool is not None:
+                yield pool
+
+
+def _count(session: requests.Session) -> dict:
+    hits = misses = 0
+    for pool in _iter_pools(session):
+        misses += pool.num_connections
+        hits += max(pool.num_requests - pool.num_connections, 0)
+    return {'hits': hits, 'misses': misses}
+
+
+def _close_session() -> None:
+    global _session
+    if _session is None:
+        return
+    for key, value in _count(_session).items():
+        _retired[key] += value
+    _session.close()
+    _session = None
+
+
+def get_session() -> requests.Session:
+    """
+    Return the HTTP session of this process.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def reset_session() -> None:
+    """
+    Close the HTTP session, a new one is created on the next request.
+
+    Only for tests: requests that use the session at the same time fail.
+    """
+    with _lock:
+        _close_session()
+
+
+def get_pool_stats() -> dict:
+    """
+    Return the connection pool hit/miss counters of this process.
+
+    A hit is a request that reused an open connection, a miss is a request
+    that needed a new connection.
+    """
+    with _lock:
+        stats = dict(_retired)
+        if _session is not None:
+            for key, value in _count(_session).items():
+                stats[key] += value
+    return stats
+
+
+def fetch(url: str, *args, **kwargs) -> requests.Response:
+    """
+    Drop-in replacement for ``requests.get``, usable as ``LINK_FETCHER``.
+    """
+    return get_session().get(url, *args, **kwargs)
@@ -0,0 +1,153 @@
+"""
+Leases on the locks of documents.
+
+A document is locked by its storage backend. The lock is valid for
+``DOCUMENT_LOCK_TTL`` seconds: the lease. The lease is renewed (a heartbeat)
+by locking the document again with the same lock, and by updating the
+document with it. A document with an expired lease is reported as not
+locked. Its lock is released by the backend when the document is locked or
+updated again, or by the ``release_expired_locks`` command.
+
+The leases are stored in the database, and cached per document in the cache of
+``DOCUMENT_CACHE_ALIAS``. Most documents are not locked, so the lease is
+only looked up for documents that the backend reports as locked, for a page
+of documents at once.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.utils import timezone
+
+LEASE_KEY = 'drc:lock:{uuid}'
+# cached "no lease", to tell it apart from a cache miss
+NO_LEASE = 'none'
+
+
+@dataclass
+class Lease:
+    lock: str
+    verloopt_op: Optional[datetime]
+
+    @property
+    def verlopen(self) -> bool:
+        return self.verloopt_op is not None and self.verloopt_op <= timezone.now()
+
+
+class LockManager:
+    @property
+    def cache(self):
+        alias = settings.DOCUMENT_CACHE_ALIAS
+        return caches[alias] if alias else None
+
+    def _verloopt_op(self) -> Optional[datetime]:
+        ttl = settings.DOCUMENT_LOCK_TTL
+        return timezone.now() + timedelta(seconds=ttl) if ttl else None
+
+    def get(self, uuid: str) -> Optional[Lease]:
+        """
+        Return the lease on the lock of the document, if there is one.
+
+        Locks taken by a backend without a lease don't expire.
+        """
+        from drc.datamodel.models import DocumentLock
+
+        cache = self.cache
+        key = LEASE_KEY.format(uuid=uuid)
+        if cache is not None:
+            lease = cache.get(key)
+            if lease is not None:
+                return None if lease == NO_LEASE else lease
+
+        row = DocumentLock.objects.filter(uuid=uuid).values('lock', 'verloopt_op').first()
+        lease = Lease(**row) if row else None
+        # a transaction may still be rolled back
+        if cache is not None and not connection.in_atomic_block:
+            cache.set(key, lease or NO_LEASE, settings.DOCUMENT_CACHE_LATEST_TIMEOUT)
+        return lease
+
+    def get_many(self, uuids: Iterable[str]) -> Dict[str, Optional[Lease]]:
+        """
+        Return the leases on the locks of the documents, by uuid.
+        """
+        from drc.datamodel.models import DocumentLock
+
+        uuids = [str(uuid) for uuid in uuids]
+        cache = self.cache
+        leases = {}
+        if cache is not None:
+            cached = cache.get_many([LEASE_KEY.format(uuid=uuid) for uuid in uuids])
+            for uuid in uuids:
+                lease = cached.get(LEASE_KEY.format(uuid=uuid))
+                if lease is not None:
+                    leases[uuid] = None if lease == NO_LEASE else lease
+
+        missing = [uuid for uuid in uuids if uuid not in leases]
+        if missing:
+            rows = DocumentLock.objects.filter(uuid__in=missing).values('uuid', 'lock', 'verloopt_op')
+            found = {str(row.pop('uuid')): Lease(**row) for row in rows}
+            for uuid in missing:
+                leases[uuid] = found.get(uuid)
+            # a transaction may still be rolled back
+            if cache is not None and not connection.in_atomic_block:
+                cache.set_many({
+                    LEASE_KEY.format(uuid=uuid): leases[uuid] or NO_LEASE for uuid in missing
+                }, settings.DOCUMENT_CACHE_LATEST_TIMEOUT)
+        return leases
+
+    def acquire(self, uuid: str, lock: str) -> Lease:
+        """
+        Start the lease on the lock the backend gave out.
+        """
+        from drc.datamodel.models import DocumentLock
+
+        lease = Lease(lock=lock, verloopt_op=self._verloopt_op())
+        DocumentLock.objects.update_or_create(uuid=uuid, defaults={'lock': lock, 'verloopt_op': lease.verloopt_op})
+        self._forget(uuid)
+        return lease
+
+    def renew(self, uuid: str, lock: str) -> bool:
+        """
+        Renew the lease, if ``lock`` is the current lock and it didn't expire.
+        """
+        from drc.datamodel.models import DocumentLock
+
+        leases = DocumentLock.objects.filter(uuid=uuid, lock=lock).exclude(verloopt_op__lte=timezone.now())
+        renewed = leases.update(verloopt_op=self._verloopt_op())
+        self._forget(uuid)
+        return bool(renewed)
+
+    def release(self, uuid: str, lock: Optional[str] = None) -> bool:
+        """
+        End the lease, only if it is on ``lock`` when that is given.
+        """
+        from drc.datamodel.models import DocumentLock
+
+        leases = DocumentLock.objects.filter(uuid=uuid)
+        if lock is not None:
+            leases = leases.filter(lock=lock)
+        deleted, _ = leases.delete()
+        self._forget(uuid)
+        return bool(deleted)
+
+    def expired(self):
+        """
+        Return the uuids of the documents with an expired lease.
+        """
+        from drc.datamodel.models import DocumentLock
+        return DocumentLock.objects.filter(verloopt_op__lte=timezone.now()).values_list('uuid', flat=True)
+
+    def _forget(self, uuid: str) -> None:
+        cache = self.cache
+        if cache is None:
+            return
+        key = LEASE_KEY.format(uuid=uuid)
+        cache.delete(key)
+        # and again once the change is visible to other requests
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+lock_manager = LockManager()
@@ -2,6 +2,10 @@ from vng_api_common.conf.api import *  # noqa - imports white-listed
 
 REST_FRAMEWORK = BASE_REST_FRAMEWORK.copy()
 REST_FRAMEWORK['PAGE_SIZE'] = 100
+# skips camelizing the representations that have camelCase keys already
+REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+    'drc.api.renderers.CamelCaseJSONRenderer',
+)
 
 SECURITY_DEFINITION_NAME = 'JWT-Claims'
 
@@ -28,7 +32,15 @@ SWAGGER_SETTINGS.update({
     # no geo things here
     'DEFAULT_FIELD_INSPECTORS': (
         'vng_api_common.inspectors.files.FileFieldInspector',
-    ) + BASE_SWAGGER_SETTINGS['DEFAULT_FIELD_INSPECTORS']
+    ) + BASE_SWAGGER_SETTINGS['DEFAULT_FIELD_INSPECTORS'],
+
+    'DEFAULT_PAGINATOR_INSPECTORS': (
+        'drc.api.inspectors.NullableCountPagination',
+        'drf_yasg.inspectors.CoreAPICompatInspector',
+    ),
 })
 
 GEMMA_URL_INFORMATIEMODEL_VERSIE = '1.0'
+
+# fetch remote resources over the pooled HTTP session
+LINK_FETCHER = 'drc.backend.http.fetch'
@@ -418,6 +418,46 @@ IS_HTTPS = os.getenv('IS_HTTPS', '1').lower() in ['true', '1', 'yes']
 # settings for sending notifications
 NOTIFICATIONS_KANAAL = 'documenten'
 NOTIFICATIONS_DISABLED = False
+# 'sync' sends notifications during the request, 'async' stores them in the
+# outbox, to be delivered by the send_notifications command
+NOTIFICATIONS_DELIVERY = os.getenv('NOTIFICATIONS_DELIVERY', 'sync')
+NOTIFICATIONS_BATCH_SIZE = int(os.getenv('NOTIFICATIONS_BATCH_SIZE', 100))
+NOTIFICATIONS_MAX_ATTEMPTS = int(os.getenv('NOTIFICATIONS_MAX_ATTEMPTS', 10))
+# seconds to wait before the first retry, doubled for every next attempt
+NOTIFICATIONS_RETRY_DELAY = int(os.getenv('NOTIFICATIONS_RETRY_DELAY', 30))
+
+# 'sync' writes the audit trails in the transaction of the request, 'async'
+# stores them in the outbox, to be written by the write_audittrails command
+AUDITTRAIL_DELIVERY = os.getenv('AUDITTRAIL_DELIVERY', 'sync')
+
+# the maximum number of documents per bulk create request
+BULK_CREATE_MAX_SIZE = int(os.getenv('BULK_CREATE_MAX_SIZE', 500))
+
+# seconds to cache the compiled authorizations of a client
+AUTHORIZATIONS_CACHE_TIMEOUT = int(os.getenv('AUTHORIZATIONS_CACHE_TIMEOUT', 300))
+
+# cache of document metadata, see drc.backend.cache. The alias of the cache to
+# use (empty to disable it), and the seconds the latest version is cached
+DOCUMENT_CACHE_ALIAS = os.getenv('DOCUMENT_CACHE_ALIAS', '')
+DOCUMENT_CACHE_LATEST_TIMEOUT = int(os.getenv('DOCUMENT_CACHE_LATEST_TIMEOUT', 300))
+
+# seconds a lock on a document is valid without being used or renewed, 0 to never expire
+DOCUMENT_LOCK_TTL = int(os.getenv('DOCUMENT_LOCK_TTL', 3600))
+
+# cache of catalogue (ZTC) resources, see drc.api.catalogue
+# the alias of the cache shared by the processes (empty to only cache per process)
+ZTC_CACHE_ALIAS = os.getenv('ZTC_CACHE_ALIAS', '')
+ZTC_CACHE_SIZE = int(os.getenv('ZTC_CACHE_SIZE', 1000))
+ZTC_CACHE_TTL = int(os.getenv('ZTC_CACHE_TTL', 300))
+ZTC_CACHE_NEGATIVE_TTL = int(os.getenv('ZTC_CACHE_NEGATIVE_TTL', 30))
+ZTC_CACHE_STALE_TTL = int(os.getenv('ZTC_CACHE_STALE_TTL', 3600))
+
+# seconds the credentials and clients for other APIs are kept, see drc.api.credentials
+API_CREDENTIALS_TTL = int(os.getenv('API_CREDENTIALS_TTL', 60))
+
+# concurrent remote validation, see drc.api.remote_validation
+REMOTE_VALIDATION_THREADS = int(os.getenv('REMOTE_VALIDATION_THREADS', 10))
+REMOTE_VALIDATION_TIMEOUT = float(os.getenv('REMOTE_VALIDATION_TIMEOUT', 10))
 
 # settings for private media files
 PRIVATE_MEDIA_ROOT = os.path.join(BASE_DIR, 'private-media')
@@ -429,6 +469,33 @@ SENDFILE_URL = PRIVATE_MEDIA_URL
 # settings for uploading large files
 MIN_UPLOAD_SIZE = int(os.getenv('MIN_UPLOAD_SIZE', 4 * 2**30))
 
+# settings for downloading large files, content is streamed in chunks of this size
+DOWNLOAD_CHUNK_SIZE = int(os.getenv('DOWNLOAD_CHUNK_SIZE', 64 * 2**10))
+
+# settings for chunked uploads, parts are written to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 64 * 2**10))
+UPLOAD_SESSION_ROOT = os.getenv('UPLOAD_SESSION_ROOT', os.path.join(PRIVATE_MEDIA_ROOT, 'upload-sessies'))
+# upload sessions that are not completed within this many hours are cleaned up
+UPLOAD_SESSION_MAX_AGE = int(os.getenv('UPLOAD_SESSION_MAX_AGE', 24))
+
+# settings for verifying the stored content with verify_integriteit: the number
+# of threads reading files, their combined bandwidth in bytes per second (0 for
+# no limit), and the file to resume from
+INTEGRITEIT_SCAN_THREADS = int(os.getenv('INTEGRITEIT_SCAN_THREADS', 4))
+INTEGRITEIT_SCAN_BANDWIDTH = int(os.getenv('INTEGRITEIT_SCAN_BANDWIDTH', 50 * 2**20))
+INTEGRITEIT_SCAN_CHECKPOINT = os.getenv(
+    'INTEGRITEIT_SCAN_CHECKPOINT', os.path.join(PRIVATE_MEDIA_ROOT, 'integriteit-scan.json')
+)
+
+# settings for the pooled HTTP session used for outgoing requests
+# number of hosts to keep a connection pool for, and connections per host
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 10))
+# times an idempotent request is retried when its connection drops
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', 1))
+# seconds to wait for a connection or a response of outgoing requests, 0 to wait forever
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 10))
+
 # Where to find the enkelvoudiginformatieobject
 ENKELVOUDIGINFORMATIEOBJECT_MODEL = 'datamodel.EnkelvoudigInformatieObject'
 ABSTRACT_BASE_CLASS = 'drc.backend.abstract.BaseDRCStorageBackend'
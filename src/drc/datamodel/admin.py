@@ -3,8 +3,10 @@ from django.contrib import admin
 from privates.admin import PrivateMediaMixin
 
 from .models import (
-    EnkelvoudigInformatieObject, EnkelvoudigInformatieObjectCanonical,
-    Gebruiksrechten, ObjectInformatieObject
+    Bestand, DocumentLock, EnkelvoudigInformatieObject,
+    EnkelvoudigInformatieObjectCanonical, Gebruiksrechten,
+    ObjectInformatieObject, UitgaandeAuditTrail, UitgaandeNotificatie,
+    UploadSessie
 )
 
 
@@ -20,6 +22,9 @@ class EnkelvoudigInformatieObjectInline(admin.StackedInline):
 
 def unlock(modeladmin, request, queryset):
     queryset.update(lock='')
+    DocumentLock.objects.filter(
+        uuid__in=EnkelvoudigInformatieObject.objects.filter(canonical__in=queryset).values('uuid')
+    ).delete()
 
 
 @admin.register(EnkelvoudigInformatieObjectCanonical)
@@ -35,6 +40,9 @@ class EnkelvoudigInformatieObjectCanonicalAdmin(PrivateMediaMixin, admin.ModelAd
     get_not_lock_display.short_description = 'free to change'
     get_not_lock_display.boolean = True
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_latest_version()
+
 
 @admin.register(EnkelvoudigInformatieObject)
 class EnkelvoudigInformatieObjectAdmin(admin.ModelAdmin):
@@ -48,7 +56,7 @@ class EnkelvoudigInformatieObjectAdmin(admin.ModelAdmin):
 @admin.register(ObjectInformatieObject)
 class ObjectInformatieObjectAdmin(admin.ModelAdmin):
     list_display = ['informatieobject', 'object', '__str__']
-    list_select_related = ('informatieobject',)
+    list_select_related = ('informatieobject__latest',)
     search_fields = ('informatieobject__titel', 'object')
 
 
@@ -56,3 +64,44 @@ class ObjectInformatieObjectAdmin(admin.ModelAdmin):
 class GebruiksrechtenAdmin(admin.ModelAdmin):
     list_display = ("uuid", "informatieobject")
     list_filter = ("informatieobject",)
+
+
+@admin.register(UploadSessie)
+class UploadSessieAdmin(admin.ModelAdmin):
+    list_display = ("uuid", "bestandsnaam", "ontvangen", "bestandsomvang", "aangemaakt")
+    search_fields = ("uuid", "bestandsnaam", "informatieobject")
+    ordering = ("-aangemaakt",)
+    readonly_fields = ("ontvangen",)
+
+
+@admin.register(UitgaandeNotificatie)
+class UitgaandeNotificatieAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "hoofd_object", "aangemaakt", "pogingen", "verzonden", "mislukt")
+    list_filter = ("mislukt", "kanaal")
+    search_fields = ("hoofd_object",)
+    ordering = ("-aangemaakt",)
+    readonly_fields = ("aangemaakt", "verzonden", "laatste_fout")
+
+
+@admin.register(UitgaandeAuditTrail)
+class UitgaandeAuditTrailAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "aangemaakt")
+    ordering = ("aangemaakt",)
+    readonly_fields = ("audittrails", "aangemaakt")
+
+
+@admin.register(Bestand)
+class BestandAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "bestandsomvang", "referenties")
+    search_fields = ("sha256",)
+    # maintained by the versions that refer to it
+    readonly_fields = ("sha256", "inhoud", "bestandsomvang", "referenties")
+
+
+@admin.register(DocumentLock)
+class DocumentLockAdmin(admin.ModelAdmin):
+    list_display = ("uuid", "verloopt_op")
+    search_fields = ("uuid",)
+    ordering = ("verloopt_op",)
+    # the lock itself is kept by the storage backend
+    readonly_fields = ("uuid", "lock")
@@ -0,0 +1,185 @@
+"""
+Content-addressed storage of the content of documents.
+
+The content of a version is stored once per SHA-256 hash, in
+``blobs/<ab>/<cd>/<hash>``, and shared by all versions with the same content.
+A :class:`drc.datamodel.models.Bestand` counts the versions that refer to it;
+the file is removed when the last of them is deleted.
+
+A content is referenced and collected with its row locked, so content that
+is stored again while its last reference is released is never lost: either
+the reference is added first and the content is not collected, or the
+content is collected first and stored again.
+
+Content stored before the blob store existed (in ``uploads/``) is not
+counted, and left alone.
+"""
+import hashlib
+import logging
+import os
+import uuid
+from typing import Tuple
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+from .constants import ChecksumAlgoritmes
+
+logger = logging.getLogger(__name__)
+
+BLOB_ROOT = 'blobs'
+
+# the checksum algorithms that can be computed, and verified
+HASH_ALGORITHMS = {
+    ChecksumAlgoritmes.md5: 'md5',
+    ChecksumAlgoritmes.sha_1: 'sha1',
+    ChecksumAlgoritmes.sha_256: 'sha256',
+    ChecksumAlgoritmes.sha_512: 'sha512',
+    ChecksumAlgoritmes.sha_3: 'sha3_256',
+}
+
+
+class IntegriteitError(Exception):
+    def __init__(self, algoritme: str, waarde: str):
+        super().__init__(f"The {algoritme} checksum of the content is {waarde}")
+        self.algoritme = algoritme
+        self.waarde = waarde
+
+
+class HashingFile(File):
+    """
+    A file that updates the hashes with every chunk that is read, so the
+    checksums are computed while the content is written to storage.
+    """
+    def __init__(self, file, hashes):
+        super().__init__(file, name=getattr(file, 'name', None))
+        self.hashes = hashes
+
+    def chunks(self, chunk_size=None):
+        for chunk in super().chunks(settings.UPLOAD_CHUNK_SIZE):
+            data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+            for hash in self.hashes.values():
+                hash.update(data)
+            yield chunk
+
+
+def blob_name(sha256: str) -> str:
+    return os.path.join(BLOB_ROOT, sha256[:2], sha256[2:4], sha256)
+
+
+class BestandQuerySet(models.QuerySet):
+    @property
+    def storage(self):
+        return self.model._meta.get_field('inhoud').storage
+
+    def store(self, content, algoritme: str = ChecksumAlgoritmes.sha_256, waarde: str = '') -> Tuple['Bestand', str]:
+        """
+        Store the content (if it isn't already) and add a reference to it.
+
+        The content is read once: it is written to a temporary file while the
+        SHA-256 hash (and the checksum with ``algoritme``) is computed, and
+        then moved in place, or removed if the content was already stored.
+
+        Returns the :class:`drc.datamodel.models.Bestand` and the checksum
+        with ``algoritme``, or an empty string if that algorithm isn't
+        supported.
+
+        :raises IntegriteitError: if ``waarde`` is not the checksum of the content
+        """
+        hashes = {ChecksumAlgoritmes.sha_256: hashlib.sha256()}
+        if algoritme in HASH_ALGORITHMS:
+            hashes.setdefault(algoritme, hashlib.new(HASH_ALGORITHMS[algoritme]))
+
+        storage = self.storage
+        temp_name = storage.save(os.path.join(BLOB_ROOT, 'tmp', uuid.uuid4().hex), HashingFile(content, hashes))
+        checksums = {key: hash.hexdigest() for key, hash in hashes.items()}
+        checksum = checksums.get(algoritme, '')
+
+        try:
+            if waarde and checksum and waarde.lower() != checksum:
+                raise IntegriteitError(algoritme, checksum)
+
+            sha256 = checksums[ChecksumAlgoritmes.sha_256]
+            with transaction.atomic():
+                bestand = self.select_for_update().filter(sha256=sha256).first()
+                updated = 0
+                if bestand is not None:
+                    updated = self.filter(pk=bestand.pk).update(referenties=F('referenties') + 1)
+                if updated != 1:
+                    # not stored, or collected in the meantime
+                    bestand = self._create(sha256, temp_name)
+                    temp_name = None
+                elif not storage.exists(bestand.inhoud.name):
+                    # the file was removed, but the collection was not committed
+                    self._move(temp_name, bestand.inhoud.name)
+                    temp_name = None
+        finally:
+            if temp_name is not None:
+                storage.delete(temp_name)
+
+        return bestand, checksum
+
+    def _move(self, temp_name: str, name: str) -> None:
+        storage = self.storage
+        os.makedirs(os.path.dirname(storage.path(name)), exist_ok=True)
+        # replaces a file left behind by an interrupted transaction, or stored
+        # concurrently, which has the same content
+        os.replace(storage.path(temp_name), storage.path(name))
+
+    def _create(self, sha256: str, temp_name: str):
+        name = blob_name(sha256)
+        self._move(temp_name, name)
+
+        try:
+            with transaction.atomic():
+                return self.create(
+                    sha256=sha256, inhoud=name, bestandsomvang=self.storage.size(name), referenties=1
+                )
+        except IntegrityError:
+            # stored concurrently by another request
+            bestand = self.select_for_update().get(sha256=sha256)
+            self.filter(pk=bestand.pk).update(referenties=F('referenties') + 1)
+            return bestand
+
+    def add_reference(self, name: str) -> None:
+        """
+        Add a reference to stored content, e.g. for a new version with the same content.
+
+        :raises drc.datamodel.models.Bestand.DoesNotExist: if the content was
+          collected in the meantime
+        """
+        updated = self.filter(inhoud=name).update(referenties=F('referenties') + 1)
+        if updated != 1 and name.startswith(f'{BLOB_ROOT}/'):
+            raise self.model.DoesNotExist(f"The content {name} is no longer stored")
+
+    def release(self, name: str) -> None:
+        """
+        Remove a reference to stored content, and remove the content if it was the last.
+        """
+        if not name:
+            return
+
+        with transaction.atomic():
+            updated = self.filter(inhoud=name, referenties__gt=0).update(referenties=F('referenties') - 1)
+            if not updated:
+                # not content-addressed
+                return
+            unreferenced = self.filter(inhoud=name, referenties=0).exists()
+
+        if unreferenced:
+            transaction.on_commit(lambda: self._collect(name))
+
+    def _collect(self, name: str) -> None:
+        with transaction.atomic():
+            # the same content may have been stored again in the meantime
+            bestand = self.select_for_update().filter(inhoud=name, referenties=0).first()
+            if bestand is None:
+                return
+            try:
+                self.storage.delete(name)
+            except OSError:
+                logger.warning("Could not remove %s", name, exc_info=True)
+                return
+            self.filter(pk=bestand.pk).delete()
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from drc.datamodel.models import UploadSessie
+
+
+class Command(BaseCommand):
+    help = "Remove upload sessions (and their uploaded parts) that were never completed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=int, default=settings.UPLOAD_SESSION_MAX_AGE,
+            help="Remove sessions that were started more than this many hours ago"
+        )
+
+    def handle(self, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        sessies = UploadSessie.objects.filter(aangemaakt__lt=cutoff)
+        self.stdout.write(f"Removing {sessies.count()} upload sessions...")
+
+        # delete one by one, so the uploaded parts are removed as well
+        for sessie in sessies.iterator():
+            sessie.delete()
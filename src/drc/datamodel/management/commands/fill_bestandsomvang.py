@@ -0,0 +1,40 @@
+from django.core.management import BaseCommand
+
+from drc.datamodel.models import EnkelvoudigInformatieObject
+
+
+class Command(BaseCommand):
+    help = "Store the size of the content of documents that were saved before it was stored"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="The number of documents to update per query"
+        )
+
+    def handle(self, **options):
+        documents = (
+            EnkelvoudigInformatieObject.objects
+            .filter(bestandsomvang__isnull=True)
+            .exclude(inhoud='')
+            .only('pk', 'inhoud')
+            .order_by('pk')
+        )
+
+        position, total, missing = 0, 0, 0
+        while True:
+            batch = list(documents.filter(pk__gt=position)[:options['batch_size']])
+            if not batch:
+                break
+
+            for eio in batch:
+                eio.bestandsomvang = eio.get_inhoud_size()
+                if eio.bestandsomvang is None:
+                    # reported by verify_integriteit
+                    missing += 1
+            EnkelvoudigInformatieObject.objects.bulk_update(batch, ['bestandsomvang'])
+
+            total += len(batch)
+            position = batch[-1].pk
+
+        self.stdout.write(f"Stored the size of {total} documents, {missing} files are missing")
@@ -0,0 +1,16 @@
+from django.core.management import BaseCommand
+
+from drc.backend import drc_storage_adapter
+from drc.backend.locks import lock_manager
+
+
+class Command(BaseCommand):
+    help = "Release the locks of documents whose lease expired"
+
+    def handle(self, **options):
+        released = 0
+        for uuid in list(lock_manager.expired()):
+            if drc_storage_adapter.unlock_verlopen_enkelvoudiginformatieobject(str(uuid)):
+                released += 1
+
+        self.stdout.write(f"Released {released} expired locks")
@@ -0,0 +1,123 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from requests import RequestException
+from vng_api_common.notifications.models import NotificationsConfig
+from zds_client import ClientError
+
+from drc.datamodel.models import UitgaandeNotificatie
+
+logger = logging.getLogger(__name__)
+
+# the delay between attempts doubles with every attempt, up to this maximum
+MAX_RETRY_DELAY = 60 * 60
+
+
+def get_retry_delay(pogingen: int) -> timedelta:
+    delay = settings.NOTIFICATIONS_RETRY_DELAY * 2 ** (pogingen - 1)
+    return timedelta(seconds=min(delay, MAX_RETRY_DELAY))
+
+
+class Command(BaseCommand):
+    help = "Deliver the notifications in the outbox to the NRC"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.NOTIFICATIONS_BATCH_SIZE,
+            help="The number of notifications to deliver per batch"
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help="Keep running and poll for new notifications, instead of stopping when the outbox is empty"
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help="Seconds to wait before polling again when the outbox is empty (with --loop)"
+        )
+        parser.add_argument(
+            '--purge-days', type=int, default=7,
+            help="Remove delivered notifications older than this many days"
+        )
+
+    def handle(self, **options):
+        cutoff = timezone.now() - timedelta(days=options['purge_days'])
+        UitgaandeNotificatie.objects.filter(verzonden__lt=cutoff).delete()
+
+        total = 0
+        while True:
+            processed, sent = self.send_batch(options['batch_size'])
+            total += sent
+            if processed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(f"Delivered {total} notifications")
+
+    def get_batch(self, batch_size: int):
+        # a notification waits for the older ones about the same main object,
+        # so consumers receive them in the order they happened
+        older_pending = UitgaandeNotificatie.objects.filter(
+            hoofd_object=OuterRef('hoofd_object'),
+            verzonden__isnull=True,
+            mislukt=False,
+            pk__lt=OuterRef('pk'),
+        )
+        return (
+            UitgaandeNotificatie.objects
+            .select_for_update(skip_locked=True)
+            .filter(verzonden__isnull=True, mislukt=False, volgende_poging__lte=timezone.now())
+            .annotate(wacht=Exists(older_pending))
+            .filter(wacht=False)
+            .order_by('pk')[:batch_size]
+        )
+
+    def send_batch(self, batch_size: int) -> tuple:
+        """
+        Deliver a batch of notifications.
+
+        Returns the number of notifications that were attempted and the
+        number of notifications that were delivered.
+
+        The rows are locked while they are delivered, and locked rows are
+        skipped, so multiple workers can run at the same time.
+        """
+        sent = 0
+        with transaction.atomic():
+            batch = list(self.get_batch(batch_size))
+            if not batch:
+                return 0, 0
+
+            client = NotificationsConfig.get_client()
+            for notificatie in batch:
+                try:
+                    client.create('notificaties', notificatie.bericht)
+                except (ClientError, RequestException) as exc:
+                    self.handle_failure(notificatie, exc)
+                else:
+                    notificatie.verzonden = timezone.now()
+                    notificatie.save(update_fields=['verzonden'])
+                    sent += 1
+        return len(batch), sent
+
+    def handle_failure(self, notificatie: UitgaandeNotificatie, exc: Exception) -> None:
+        notificatie.pogingen += 1
+        notificatie.laatste_fout = str(exc)
+        if notificatie.pogingen >= settings.NOTIFICATIONS_MAX_ATTEMPTS:
+            notificatie.mislukt = True
+            logger.error(
+                "Giving up on notification %s after %s attempts", notificatie.pk, notificatie.pogingen,
+                exc_info=exc
+            )
+        else:
+            notificatie.volgende_poging = timezone.now() + get_retry_delay(notificatie.pogingen)
+            logger.warning("Could not deliver notification %s, retrying later", notificatie.pk, exc_info=exc)
+        notificatie.save(update_fields=['pogingen', 'laatste_fout', 'mislukt', 'volgende_poging'])
@@ -0,0 +1,210 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from drc.datamodel.blobs import BLOB_ROOT, HASH_ALGORITHMS
+from drc.datamodel.constants import ChecksumAlgoritmes
+from drc.datamodel.models import EnkelvoudigInformatieObject
+
+logger = logging.getLogger(__name__)
+
+# files are read in chunks of this size
+CHUNK_SIZE = 2**20
+
+REPORT_FIELDS = ('uuid', 'versie', 'inhoud', 'status', 'algoritme', 'verwacht', 'berekend')
+
+
+class Throttle:
+    """
+    Limit the combined read rate of the threads to ``rate`` bytes per second.
+    """
+    def __init__(self, rate: int):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self, size: int) -> None:
+        if not self.rate:
+            return
+        # every read reserves the time it takes at the maximum rate
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now)
+            self._next = start + size / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+def get_expected_checksums(row: dict) -> Dict[str, str]:
+    expected = {}
+    algoritme, waarde = row['integriteit_algoritme'], row['integriteit_waarde']
+    if algoritme in HASH_ALGORITHMS and waarde:
+        expected[algoritme] = waarde.lower()
+    # content in the blob store is named after its hash
+    if row['inhoud'].startswith(f'{BLOB_ROOT}/'):
+        expected.setdefault(ChecksumAlgoritmes.sha_256, os.path.basename(row['inhoud']))
+    return expected
+
+
+class Command(BaseCommand):
+    help = "Verify the stored content of the documents, and report missing and damaged files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads', type=int, default=settings.INTEGRITEIT_SCAN_THREADS,
+            help="The number of threads reading files"
+        )
+        parser.add_argument(
+            '--bandwidth', type=int, default=settings.INTEGRITEIT_SCAN_BANDWIDTH,
+            help="The combined number of bytes per second to read, 0 for no limit"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help="The number of documents to verify per batch, the checkpoint is saved after every batch"
+        )
+        parser.add_argument(
+            '--checkpoint', default=settings.INTEGRITEIT_SCAN_CHECKPOINT,
+            help="The file to save the position in, to resume an interrupted run"
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help="Start from the beginning, instead of the position in the checkpoint"
+        )
+        parser.add_argument(
+            '--report', default='-',
+            help="The file to write the report (CSV) to, '-' for stdout"
+        )
+
+    def handle(self, **options):
+        self.storage = EnkelvoudigInformatieObject._meta.get_field('inhoud').storage
+        self.throttle = Throttle(options['bandwidth'])
+        self.lock = threading.Lock()
+        self.checkpoint = options['checkpoint']
+        self.totals = {'documenten': 0, 'gelezen': 0, 'ontbrekend': 0, 'afwijkend': 0}
+
+        position = 0 if options['restart'] else self.load_checkpoint()
+        if position:
+            self.stderr.write(f"Resuming after document {position}")
+
+        report_file = open(options['report'], 'a', newline='') if options['report'] != '-' else self.stdout
+        try:
+            self.report = csv.DictWriter(report_file, REPORT_FIELDS, lineterminator='\n')
+            if report_file is self.stdout or not report_file.tell():
+                self.report.writeheader()
+
+            with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+                while True:
+                    position = self.verify_batch(executor, position, options['batch_size'])
+                    if position is None:
+                        break
+                    self.save_checkpoint(position)
+        finally:
+            if report_file is not self.stdout:
+                report_file.close()
+
+        # the next run starts from the beginning
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+        self.stderr.write(
+            "Verified {documenten} documents, read {gelezen} bytes: "
+            "{ontbrekend} missing, {afwijkend} mismatched".format(**self.totals)
+        )
+
+    def load_checkpoint(self) -> int:
+        try:
+            with open(self.checkpoint) as infile:
+                return json.load(infile)['pk']
+        except FileNotFoundError:
+            return 0
+        except (ValueError, KeyError):
+            logger.warning("Ignoring the invalid checkpoint %s", self.checkpoint)
+            return 0
+
+    def save_checkpoint(self, position: int) -> None:
+        # written in full before it replaces the previous checkpoint
+        temp = f"{self.checkpoint}.tmp"
+        with open(temp, 'w') as outfile:
+            json.dump({'pk': position}, outfile)
+        os.replace(temp, self.checkpoint)
+
+    def verify_batch(self, executor, position: int, batch_size: int) -> Optional[int]:
+        """
+        Verify the documents after ``position`` (in primary key order).
+
+        Returns the position of the last document in the batch, or ``None``
+        if there were no documents left.
+        """
+        rows = list(
+            EnkelvoudigInformatieObject.objects
+            .filter(pk__gt=position)
+            .exclude(inhoud='')
+            .order_by('pk')
+            .values('pk', 'uuid', 'versie', 'inhoud', 'integriteit_algoritme', 'integriteit_waarde')
+            [:batch_size]
+        )
+        if not rows:
+            return None
+
+        # versions share their content, every file is read once
+        algorithms = {}
+        for row in rows:
+            row['verwacht'] = get_expected_checksums(row)
+            algorithms.setdefault(row['inhoud'], set()).update(row['verwacht'])
+        checksums = dict(zip(algorithms, executor.map(self.read, algorithms, algorithms.values())))
+
+        for row in rows:
+            self.totals['documenten'] += 1
+            self.verify(row, checksums[row['inhoud']])
+        return rows[-1]['pk']
+
+    def read(self, name: str, algorithms: Set[str]) -> Optional[Dict[str, str]]:
+        """
+        Return the checksums of the file with ``algorithms``, or ``None`` if it is missing.
+        """
+        if not algorithms:
+            # nothing to compare with
+            return {} if self.storage.exists(name) else None
+
+        hashes = {algoritme: hashlib.new(HASH_ALGORITHMS[algoritme]) for algoritme in algorithms}
+        size = 0
+        try:
+            with self.storage.open(name, 'rb') as infile:
+                while True:
+                    self.throttle.wait(CHUNK_SIZE)
+                    chunk = infile.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    for hash in hashes.values():
+                        hash.update(chunk)
+                    size += len(chunk)
+        except FileNotFoundError:
+            return None
+        finally:
+            with self.lock:
+                self.totals['gelezen'] += size
+        return {algoritme: hash.hexdigest() for algoritme, hash in hashes.items()}
+
+    def verify(self, row: dict, checksums: Optional[Dict[str, str]]) -> None:
+        base = {'uuid': row['uuid'], 'versie': row['versie'], 'inhoud': row['inhoud']}
+        if checksums is None:
+            self.totals['ontbrekend'] += 1
+            self.report.writerow(dict(base, status='ontbrekend'))
+            return
+
+        for algoritme, verwacht in row['verwacht'].items():
+            if checksums[algoritme] != verwacht:
+                self.totals['afwijkend'] += 1
+                self.report.writerow(dict(
+                    base, status='afwijkend', algoritme=algoritme, verwacht=verwacht, berekend=checksums[algoritme]
+                ))
+                return
@@ -0,0 +1,71 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db import models, transaction
+from django.db.models import Case, Value, When
+from django.utils.dateparse import parse_datetime
+
+from vng_api_common.audittrails.models import AuditTrail
+
+from drc.datamodel.models import UitgaandeAuditTrail
+
+
+class Command(BaseCommand):
+    help = "Write the audit trails in the outbox to the audit trail"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help="The number of requests to write the audit trails of per batch"
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help="Keep running and poll for new audit trails, instead of stopping when the outbox is empty"
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help="Seconds to wait before polling again when the outbox is empty (with --loop)"
+        )
+
+    def handle(self, **options):
+        total = 0
+        while True:
+            processed, written = self.write_batch(options['batch_size'])
+            total += written
+            if processed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(f"Wrote {total} audit trails")
+
+    def write_batch(self, batch_size: int) -> tuple:
+        """
+        Write the audit trails of a batch of requests, and remove them from the outbox.
+
+        Returns the number of requests that were processed and the number of
+        audit trails that were written.
+
+        The rows are locked while they are written, and locked rows are
+        skipped, so multiple workers can run at the same time.
+        """
+        with transaction.atomic():
+            batch = list(
+                UitgaandeAuditTrail.objects
+                .select_for_update(skip_locked=True)
+                .order_by('pk')[:batch_size]
+            )
+            if not batch:
+                return 0, 0
+
+            trails = [AuditTrail(**data) for uitgaand in batch for data in uitgaand.audittrails]
+            aanmaakdatums = {str(trail.uuid): parse_datetime(trail.aanmaakdatum) for trail in trails}
+            AuditTrail.objects.bulk_create(trails)
+            # aanmaakdatum is set when a trail is saved, keep the time of the request
+            AuditTrail.objects.filter(uuid__in=aanmaakdatums).update(aanmaakdatum=Case(
+                *[When(uuid=uuid, then=Value(aanmaakdatum)) for uuid, aanmaakdatum in aanmaakdatums.items()],
+                output_field=models.DateTimeField(),
+            ))
+            UitgaandeAuditTrail.objects.filter(pk__in=[uitgaand.pk for uitgaand in batch]).delete()
+        return len(batch), len(trails)
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.2 on 2026-10-17 09:12
+
+import django.core.validators
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datamodel', '0048_auto_20191029_1349'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSessie',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, help_text='Unieke resource identifier (UUID4)', unique=True)),
+                ('bestandsnaam', models.CharField(blank=True, help_text='De naam van het fysieke bestand waarin de inhoud van het informatieobject is vastgelegd, inclusief extensie.', max_length=255, verbose_name='bestandsnaam')),
+                ('bestandsomvang', models.BigIntegerField(help_text='Het totaal aantal bytes dat geupload wordt.', validators=[django.core.validators.MinValueValidator(1)], verbose_name='bestandsomvang')),
+                ('ontvangen', models.BigIntegerField(default=0, help_text='Het aantal bytes dat (aaneengesloten, vanaf het begin) ontvangen is. Een onderbroken upload wordt vanaf deze positie hervat.', verbose_name='ontvangen')),
+                ('informatieobject', models.URLField(blank=True, help_text='URL-referentie naar het INFORMATIEOBJECT waarvan een nieuwe versie gemaakt wordt. Leeg als er een nieuw INFORMATIEOBJECT aangemaakt wordt.', verbose_name='informatieobject')),
+                ('aangemaakt', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'upload sessie',
+                'verbose_name_plural': 'upload sessies',
+            },
+        ),
+    ]
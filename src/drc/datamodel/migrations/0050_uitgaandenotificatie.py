@@ -0,0 +1,36 @@
+# Generated by Django 2.2.2 on 2026-10-17 11:03
+
+import django.contrib.postgres.fields.jsonb
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datamodel', '0049_uploadsessie'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UitgaandeNotificatie',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kanaal', models.CharField(max_length=50, verbose_name='kanaal')),
+                ('hoofd_object', models.URLField(db_index=True, max_length=1000, verbose_name='hoofd object')),
+                ('bericht', django.contrib.postgres.fields.jsonb.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Het bericht zoals het naar het NRC gestuurd wordt.', verbose_name='bericht')),
+                ('aangemaakt', models.DateTimeField(auto_now_add=True)),
+                ('pogingen', models.PositiveIntegerField(default=0, verbose_name='pogingen')),
+                ('volgende_poging', models.DateTimeField(default=django.utils.timezone.now, verbose_name='volgende poging')),
+                ('verzonden', models.DateTimeField(blank=True, null=True, verbose_name='verzonden')),
+                ('mislukt', models.BooleanField(default=False, help_text='Het maximaal aantal pogingen is bereikt zonder dat het bericht afgeleverd is.', verbose_name='mislukt')),
+                ('laatste_fout', models.TextField(blank=True, verbose_name='laatste fout')),
+            ],
+            options={
+                'verbose_name': 'uitgaande notificatie',
+                'verbose_name_plural': 'uitgaande notificaties',
+                'index_together': {('verzonden', 'mislukt', 'volgende_poging')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.2 on 2026-10-17 12:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def set_latest(apps, _):
+    EnkelvoudigInformatieObjectCanonical = apps.get_model('datamodel', 'EnkelvoudigInformatieObjectCanonical')
+    EnkelvoudigInformatieObject = apps.get_model('datamodel', 'EnkelvoudigInformatieObject')
+
+    latest = (
+        EnkelvoudigInformatieObject.objects
+        .filter(canonical=models.OuterRef('pk'))
+        .order_by('-versie')
+        .values('pk')[:1]
+    )
+    EnkelvoudigInformatieObjectCanonical.objects.update(latest=models.Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datamodel', '0050_uitgaandenotificatie'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enkelvoudiginformatieobjectcanonical',
+            name='latest',
+            field=models.ForeignKey(blank=True, editable=False, help_text='De laatste versie van het INFORMATIEOBJECT.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='datamodel.EnkelvoudigInformatieObject'),
+        ),
+        migrations.RunPython(set_latest, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.2 on 2026-10-17 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datamodel', '0051_enkelvoudiginformatieobjectcanonical_latest'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enkelvoudiginformatieobject',
+            index=models.Index(fields=['begin_registratie', 'id'], name='datamodel_e_begin_r_a6cea0_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.2 on 2026-10-17 14:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datamodel', '0052_auto_20261017_1305'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enkelvoudiginformatieobject',
+            index=models.Index(
+                fields=['informatieobjecttype', 'vertrouwelijkheidaanduiding'], name='datamodel_e_informa_be7770_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.2 on 2026-10-17 15:02
+
+from django.db import migrations, models
+import privates.fields
+import privates.storages
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datamodel', '0053_auto_20261017_1412'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Bestand',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='sha256')),
+                ('inhoud', privates.fields.PrivateMediaFileField(max_length=255, storage=privates.storages.PrivateMediaFileSystemStorage(), unique=True, upload_to='blobs/', verbose_name='inhoud')),
+                ('bestandsomvang', models.BigIntegerField(verbose_name='bestandsomvang')),
+                ('referenties', models.PositiveIntegerField(default=0, help_text='Het aantal versies van INFORMATIEOBJECTen met deze inhoud.', verbose_name='referenties')),
+            ],
+            options={
+                'verbose_name': 'bestand',
+                'verbose_name_plural': 'bestanden',
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.2 on 2026-10-17 16:20
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_from_bestanden(apps, _):
+    # the size of content in the blob store is known, the size of older
+    # content is filled in by the fill_bestandsomvang command
+    EnkelvoudigInformatieObject = apps.get_model('datamodel', 'EnkelvoudigInformatieObject')
+    Bestand = apps.get_model('datamodel', 'Bestand')
+
+    bestanden = Bestand.objects.filter(inhoud=OuterRef('inhoud'))
+    EnkelvoudigInformatieObject.objects.exclude(inhoud='').update(
+        bestandsomvang=Subquery(bestanden.values('bestandsomvang')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datamodel', '0054_bestand'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enkelvoudiginformatieobject',
+            name='bestandsomvang',
+            field=models.BigIntegerField(blank=True, editable=False, help_text='Aantal bytes dat de inhoud van INFORMATIEOBJECT in beslag neemt.', null=True, verbose_name='bestandsomvang'),
+        ),
+        migrations.RunPython(fill_from_bestanden, migrations.RunPython.noop),
+    ]
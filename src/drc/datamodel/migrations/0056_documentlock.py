@@ -0,0 +1,50 @@
+# Generated by Django 2.2.2 on 2026-10-17 18:05
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def lease_existing_locks(apps, _):
+    # locks taken before the leases existed expire as if they were taken now
+    EnkelvoudigInformatieObjectCanonical = apps.get_model('datamodel', 'EnkelvoudigInformatieObjectCanonical')
+    DocumentLock = apps.get_model('datamodel', 'DocumentLock')
+
+    ttl = settings.DOCUMENT_LOCK_TTL
+    verloopt_op = timezone.now() + timedelta(seconds=ttl) if ttl else None
+    canonicals = (
+        EnkelvoudigInformatieObjectCanonical.objects
+        .exclude(lock='')
+        .filter(latest__isnull=False)
+        .values_list('latest__uuid', 'lock')
+    )
+    DocumentLock.objects.bulk_create([
+        DocumentLock(uuid=uuid, lock=lock, verloopt_op=verloopt_op)
+        for uuid, lock in canonicals.iterator()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datamodel', '0055_enkelvoudiginformatieobject_bestandsomvang'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentLock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(help_text='De UUID van het gelockte INFORMATIEOBJECT.', unique=True, verbose_name='uuid')),
+                ('lock', models.CharField(max_length=100, verbose_name='lock')),
+                ('verloopt_op', models.DateTimeField(blank=True, db_index=True, help_text='Het moment waarop het lock vervalt, als het niet verlengd wordt. Leeg als het niet vervalt.', null=True, verbose_name='verloopt op')),
+            ],
+            options={
+                'verbose_name': 'document lock',
+                'verbose_name_plural': 'document locks',
+            },
+        ),
+        migrations.RunPython(lease_existing_locks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 2.2.2 on 2026-10-17 18:40
+
+import django.contrib.postgres.fields.jsonb
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datamodel', '0056_documentlock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UitgaandeAuditTrail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('audittrails', django.contrib.postgres.fields.jsonb.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='De velden van de audit trails van het request.', verbose_name='audit trails')),
+                ('aangemaakt', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'uitgaande audit trail',
+                'verbose_name_plural': 'uitgaande audit trails',
+            },
+        ),
+    ]
@@ -1,9 +1,18 @@
 import logging
+import os
 import uuid as _uuid
+from typing import Optional
 
 from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MinValueValidator
 from django.db import models, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 from privates.fields import PrivateMediaFileField
@@ -18,8 +27,12 @@ from vng_api_common.validators import alphanumeric_excluding_diacritic
 
 from drc.backend import drc_storage_adapter
 
+from .blobs import BLOB_ROOT, BestandQuerySet
 from .constants import ChecksumAlgoritmes, OndertekeningSoorten, Statussen
-from .query import InformatieobjectQuerySet, InformatieobjectRelatedQuerySet
+from .query import (
+    CanonicalQuerySet, GebruiksrechtenQuerySet, InformatieobjectQuerySet,
+    ObjectInformatieobjectQuerySet
+)
 from .validators import validate_status
 
 logger = logging.getLogger(__name__)
@@ -162,15 +175,58 @@ class EnkelvoudigInformatieObjectCanonical(models.Model):
         default='', blank=True, max_length=100,
         help_text=_('Hash string, which represents id of the lock')
     )
+    # kept up to date when versions are saved, see EnkelvoudigInformatieObject.save
+    latest = models.ForeignKey(
+        'EnkelvoudigInformatieObject', on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='+', editable=False,
+        help_text=_('De laatste versie van het INFORMATIEOBJECT.')
+    )
+
+    objects = CanonicalQuerySet.as_manager()
 
     def __str__(self):
         return str(self.latest_version)
 
     @property
     def latest_version(self):
+        if self.latest_id is not None:
+            return self.latest
+
+        # no pointer (yet), e.g. after the latest version was deleted
         versies = self.enkelvoudiginformatieobject_set.order_by('-versie')
         return versies.first()
 
+    def update_latest(self) -> None:
+        """
+        Point ``latest`` to the version with the highest version number.
+        """
+        self.latest = self.enkelvoudiginformatieobject_set.order_by('-versie').first()
+        type(self).objects.filter(pk=self.pk).update(latest=self.latest)
+
+
+class Bestand(models.Model):
+    """
+    Content shared by the versions of ENKELVOUDIG INFORMATIEOBJECTen.
+
+    The content is stored once per SHA-256 hash, see :mod:`drc.datamodel.blobs`.
+    """
+    sha256 = models.CharField(_("sha256"), max_length=64, unique=True)
+    inhoud = PrivateMediaFileField(_("inhoud"), upload_to=f'{BLOB_ROOT}/', max_length=255, unique=True)
+    bestandsomvang = models.BigIntegerField(_("bestandsomvang"))
+    referenties = models.PositiveIntegerField(
+        _("referenties"), default=0,
+        help_text=_("Het aantal versies van INFORMATIEOBJECTen met deze inhoud.")
+    )
+
+    objects = BestandQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("bestand")
+        verbose_name_plural = _("bestanden")
+
+    def __str__(self):
+        return self.sha256
+
 
 class EnkelvoudigInformatieObject(APIMixin, InformatieObject):
     """
@@ -241,6 +297,12 @@ class EnkelvoudigInformatieObject(APIMixin, InformatieObject):
         'datum': integriteit_datum,
     })
 
+    # stored when the content is saved, so it can be shown without accessing storage
+    bestandsomvang = models.BigIntegerField(
+        _("bestandsomvang"), null=True, blank=True, editable=False,
+        help_text=_("Aantal bytes dat de inhoud van INFORMATIEOBJECT in beslag neemt.")
+    )
+
     versie = models.PositiveIntegerField(
         default=1,
         help_text=_('Het (automatische) versienummer van het INFORMATIEOBJECT. Deze begint bij 1 als het '
@@ -254,15 +316,84 @@ class EnkelvoudigInformatieObject(APIMixin, InformatieObject):
 
     class Meta:
         unique_together = ('uuid', 'versie')
+        indexes = [
+            # keyset pagination of the list
+            models.Index(fields=['begin_registratie', 'id']),
+            # filtering the lists by the authorizations
+            models.Index(fields=['informatieobjecttype', 'vertrouwelijkheidaanduiding']),
+        ]
 
-    @property
-    def bestandsomvang(self):
-        if self.inhoud:
-            try:
-                return self.inhoud.size
-            except FileNotFoundError:
-                return None
-        return None
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        self.store_inhoud()
+        super().save(*args, **kwargs)
+
+        # only move the pointer forward, an older version may be saved later
+        updated = EnkelvoudigInformatieObjectCanonical.objects.filter(
+            models.Q(latest__isnull=True) | models.Q(latest__versie__lte=self.versie),
+            pk=self.canonical_id,
+        ).update(latest=self)
+        if updated and EnkelvoudigInformatieObject.canonical.is_cached(self):
+            self.canonical.latest = self
+
+    @transaction.atomic
+    def delete(self, *args, **kwargs):
+        canonical, pk = self.canonical, self.pk
+        result = super().delete(*args, **kwargs)
+        if canonical.latest_id == pk:
+            canonical.update_latest()
+        return result
+
+    def store_inhoud(self) -> None:
+        """
+        Store new content by its hash, and keep the references to it up to date.
+
+        Called by :meth:`save`, and before ``bulk_create`` which skips it.
+
+        :raises drc.datamodel.blobs.IntegriteitError: if the ``integriteit``
+          doesn't match the new content
+        """
+        previous = None
+        if self.pk is not None:
+            previous = type(self).objects.filter(pk=self.pk).values_list('inhoud', flat=True).first()
+
+        if self.inhoud and not self.inhoud._committed:
+            # the checksum is computed while the content is stored: verified
+            # if it is given, and filled in if it isn't
+            algoritme = self.integriteit_algoritme or ChecksumAlgoritmes.sha_256
+            bestand, waarde = Bestand.objects.store(self.inhoud, algoritme, self.integriteit_waarde)
+            self.inhoud = bestand.inhoud.name
+            self.bestandsomvang = bestand.bestandsomvang
+            if waarde and not self.integriteit_waarde:
+                self.integriteit_algoritme = algoritme
+                self.integriteit_waarde = waarde
+                self.integriteit_datum = timezone.now().date()
+        elif self.inhoud.name == previous:
+            return
+        elif self.inhoud:
+            # the content of another version
+            Bestand.objects.add_reference(self.inhoud.name)
+            if self.bestandsomvang is None:
+                self.bestandsomvang = self.get_inhoud_size()
+        else:
+            self.bestandsomvang = None
+
+        if previous:
+            Bestand.objects.release(previous)
+
+    def get_inhoud_size(self) -> Optional[int]:
+        """
+        Read the size of the content from storage.
+
+        This is stored in ``bestandsomvang`` when the content is saved, use
+        that instead.
+        """
+        if not self.inhoud:
+            return None
+        try:
+            return self.inhoud.size
+        except FileNotFoundError:
+            return None
 
     @property
     def url(self):
@@ -270,6 +401,12 @@ class EnkelvoudigInformatieObject(APIMixin, InformatieObject):
         return f"{settings.HOST_URL}{path}"
 
 
+@receiver(post_delete, sender=EnkelvoudigInformatieObject)
+def release_inhoud(sender, instance, **kwargs):
+    # also for the versions deleted together with their canonical
+    Bestand.objects.release(instance.inhoud.name)
+
+
 class Gebruiksrechten(models.Model):
     uuid = models.UUIDField(
         unique=True, default=_uuid.uuid4,
@@ -293,7 +430,7 @@ class Gebruiksrechten(models.Model):
         help_text=_("Einddatum van de periode waarin de gebruiksrechtvoorwaarden van toepassing zijn.")
     )
 
-    objects = InformatieobjectRelatedQuerySet.as_manager()
+    objects = GebruiksrechtenQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("gebruiksrecht informatieobject")
@@ -305,22 +442,15 @@ class Gebruiksrechten(models.Model):
     @transaction.atomic
     def save(self, *args, **kwargs):
         # ensure the indication is set properly on the IO
-        eio = drc_storage_adapter.lees_enkelvoudiginformatieobject(self.informatieobject.split('/')[-1])
-        if not eio.indicatie_gebruiksrecht:
-            eio.indicatie_gebruiksrecht = True
-            eio.update()
-
+        drc_storage_adapter.zet_indicatie_gebruiksrecht(self.informatieobject.split('/')[-1], True)
         super().save(*args, **kwargs)
 
     @transaction.atomic
     def delete(self, *args, **kwargs):
         super().delete(*args, **kwargs)
-        informatieobject = self.informatieobject
-        other_gebruiksrechten = informatieobject.gebruiksrechten_set.exclude(pk=self.pk)
+        other_gebruiksrechten = Gebruiksrechten.objects.filter(informatieobject=self.informatieobject)
         if not other_gebruiksrechten.exists():
-            informatieobject_versie = self.informatieobject.latest_version
-            informatieobject_versie.indicatie_gebruiksrecht = None
-            informatieobject_versie.save()
+            drc_storage_adapter.zet_indicatie_gebruiksrecht(self.informatieobject.split('/')[-1], None)
 
     def unique_representation(self):
         informatieobject = self.informatieobject.latest_version
@@ -350,7 +480,7 @@ class ObjectInformatieObject(APIMixin, models.Model):
         help_text="Het type van het gerelateerde OBJECT."
     )
 
-    objects = InformatieobjectRelatedQuerySet.as_manager()
+    objects = ObjectInformatieobjectQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Oobject-informatieobject'
@@ -379,3 +509,168 @@ class ObjectInformatieObject(APIMixin, models.Model):
     def url(self):
         path = reverse('objectinformatieobjecten-detail', kwargs={'version': '1', 'uuid': self.uuid})
         return f"{settings.HOST_URL}{path}"
+
+
+class UploadSessie(models.Model):
+    """
+    A resumable upload of the content of an ENKELVOUDIG INFORMATIEOBJECT.
+
+    The content is uploaded in parts, which are written to a temporary file on
+    disk at their offset. Once all bytes are received, the session is completed
+    by creating a new document (or a new version of an existing document) with
+    the uploaded file as content.
+    """
+    uuid = models.UUIDField(
+        unique=True, default=_uuid.uuid4,
+        help_text="Unieke resource identifier (UUID4)"
+    )
+    bestandsnaam = models.CharField(
+        _("bestandsnaam"), max_length=255, blank=True,
+        help_text=_("De naam van het fysieke bestand waarin de inhoud van het "
+                    "informatieobject is vastgelegd, inclusief extensie.")
+    )
+    bestandsomvang = models.BigIntegerField(
+        _("bestandsomvang"), validators=[MinValueValidator(1)],
+        help_text=_("Het totaal aantal bytes dat geupload wordt.")
+    )
+    ontvangen = models.BigIntegerField(
+        _("ontvangen"), default=0,
+        help_text=_("Het aantal bytes dat (aaneengesloten, vanaf het begin) ontvangen is. "
+                    "Een onderbroken upload wordt vanaf deze positie hervat.")
+    )
+    informatieobject = models.URLField(
+        _("informatieobject"), blank=True,
+        help_text=_("URL-referentie naar het INFORMATIEOBJECT waarvan een nieuwe versie "
+                    "gemaakt wordt. Leeg als er een nieuw INFORMATIEOBJECT aangemaakt wordt.")
+    )
+    aangemaakt = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("upload sessie")
+        verbose_name_plural = _("upload sessies")
+
+    def __str__(self):
+        return f"{self.bestandsnaam or self.uuid} ({self.ontvangen}/{self.bestandsomvang})"
+
+    @property
+    def path(self) -> str:
+        return os.path.join(settings.UPLOAD_SESSION_ROOT, f"{self.uuid}.part")
+
+    @property
+    def voltooid(self) -> bool:
+        return self.ontvangen >= self.bestandsomvang
+
+    def write_part(self, stream, offset: int, length: int) -> int:
+        """
+        Write ``length`` bytes read from ``stream`` at ``offset`` in the file.
+
+        The stream is copied in chunks, so memory use doesn't depend on the
+        size of the part. Returns the number of bytes written, which is less
+        than ``length`` if the stream ended early (e.g. a dropped connection).
+        """
+        os.makedirs(settings.UPLOAD_SESSION_ROOT, exist_ok=True)
+        mode = 'r+b' if os.path.exists(self.path) else 'wb'
+
+        written = 0
+        with open(self.path, mode) as outfile:
+            outfile.seek(offset)
+            while written < length:
+                chunk = stream.read(min(settings.UPLOAD_CHUNK_SIZE, length - written))
+                if not chunk:
+                    break
+                outfile.write(chunk)
+                written += len(chunk)
+
+        self.ontvangen = max(self.ontvangen, offset + written)
+        self.save(update_fields=['ontvangen'])
+        return written
+
+    def open(self) -> File:
+        return File(open(self.path, 'rb'), name=self.bestandsnaam or f"{self.uuid}.bin")
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        return result
+
+
+class DocumentLock(models.Model):
+    """
+    The lease on the lock of a document, see :mod:`drc.backend.locks`.
+
+    The lock itself is kept by the storage backend, the lease determines how
+    long it is valid.
+    """
+    uuid = models.UUIDField(
+        _("uuid"), unique=True,
+        help_text=_("De UUID van het gelockte INFORMATIEOBJECT.")
+    )
+    lock = models.CharField(_("lock"), max_length=100)
+    verloopt_op = models.DateTimeField(
+        _("verloopt op"), null=True, blank=True, db_index=True,
+        help_text=_("Het moment waarop het lock vervalt, als het niet verlengd wordt. Leeg als het niet vervalt.")
+    )
+
+    class Meta:
+        verbose_name = _("document lock")
+        verbose_name_plural = _("document locks")
+
+    def __str__(self):
+        return f"{self.uuid} ({self.lock})"
+
+
+class UitgaandeNotificatie(models.Model):
+    """
+    A notification that still has to be delivered to the NRC (outbox).
+
+    The notification is stored in the same transaction as the write it
+    reports, and is delivered afterwards by the ``send_notifications``
+    command. Notifications about the same ``hoofd_object`` are delivered in
+    the order they were created.
+    """
+    kanaal = models.CharField(_("kanaal"), max_length=50)
+    hoofd_object = models.URLField(_("hoofd object"), max_length=1000, db_index=True)
+    bericht = JSONField(
+        _("bericht"), encoder=DjangoJSONEncoder,
+        help_text=_("Het bericht zoals het naar het NRC gestuurd wordt.")
+    )
+    aangemaakt = models.DateTimeField(auto_now_add=True)
+    pogingen = models.PositiveIntegerField(_("pogingen"), default=0)
+    volgende_poging = models.DateTimeField(_("volgende poging"), default=timezone.now)
+    verzonden = models.DateTimeField(_("verzonden"), null=True, blank=True)
+    mislukt = models.BooleanField(
+        _("mislukt"), default=False,
+        help_text=_("Het maximaal aantal pogingen is bereikt zonder dat het bericht afgeleverd is.")
+    )
+    laatste_fout = models.TextField(_("laatste fout"), blank=True)
+
+    class Meta:
+        verbose_name = _("uitgaande notificatie")
+        verbose_name_plural = _("uitgaande notificaties")
+        index_together = [('verzonden', 'mislukt', 'volgende_poging')]
+
+    def __str__(self):
+        return f"{self.bericht.get('actie')} {self.bericht.get('resourceUrl')}"
+
+
+class UitgaandeAuditTrail(models.Model):
+    """
+    The audit trails of a request that still have to be written (outbox).
+
+    The audit trails are stored in the same transaction as the changes they
+    describe, and are written to the audit trail by the ``write_audittrails``
+    command.
+    """
+    audittrails = JSONField(
+        _("audit trails"), encoder=DjangoJSONEncoder,
+        help_text=_("De velden van de audit trails van het request.")
+    )
+    aangemaakt = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("uitgaande audit trail")
+        verbose_name_plural = _("uitgaande audit trails")
+
+    def __str__(self):
+        return ", ".join(f"{trail.get('actie')} {trail.get('resource_url')}" for trail in self.audittrails)
@@ -1,11 +1,111 @@
+from typing import Dict, Iterator, Tuple
+
 from django.apps import apps
 from django.db import models
-from django.db.models import Case, IntegerField, Value, When
+from django.db.models import (
+    BooleanField, CharField, Exists, Expression, F, OuterRef
+)
+from django.db.models.functions import Cast, Right
 
 from vng_api_common.constants import VertrouwelijkheidsAanduiding
 from vng_api_common.scopes import Scope
 
 
+class AuthorizationPredicate:
+    """
+    The authorizations for a scope, compiled to the maximum confidentiality
+    level per ``informatieobjecttype``.
+
+    Built once per client and scope (see
+    :func:`drc.api.data_filtering.get_authorization_predicate`), it can be
+    tested against documents in Python and turned into a single SQL
+    predicate.
+    """
+    def __init__(self, max_orders: Dict[str, int]):
+        # informatieobjecttype -> order of the max_vertrouwelijkheidaanduiding (inclusive)
+        self.max_orders = max_orders
+
+    @classmethod
+    def from_authorizations(cls, scope: Scope, authorizations) -> 'AuthorizationPredicate':
+        max_orders = {}
+        for authorization in authorizations:
+            # test if this authorization has the scope that's needed
+            if not scope.is_contained_in(authorization.scopes):
+                continue
+
+            order = VertrouwelijkheidsAanduiding.get_choice(authorization.max_vertrouwelijkheidaanduiding).order
+            informatieobjecttype = authorization.informatieobjecttype
+            max_orders[informatieobjecttype] = max(order, max_orders.get(informatieobjecttype, order))
+        return cls(max_orders)
+
+    def __bool__(self):
+        return bool(self.max_orders)
+
+    def __eq__(self, other):
+        return isinstance(other, AuthorizationPredicate) and self.max_orders == other.max_orders
+
+    def allows(self, informatieobjecttype: str, vertrouwelijkheidaanduiding: str) -> bool:
+        max_order = self.max_orders.get(informatieobjecttype)
+        if max_order is None:
+            return False
+        return VertrouwelijkheidsAanduiding.get_choice(vertrouwelijkheidaanduiding).order <= max_order
+
+    def pairs(self) -> Iterator[Tuple[str, str]]:
+        """
+        Yield every allowed ``(informatieobjecttype, vertrouwelijkheidaanduiding)`` combination.
+        """
+        choices = VertrouwelijkheidsAanduiding.choices
+        for informatieobjecttype, max_order in sorted(self.max_orders.items()):
+            for value, _label in choices:
+                if VertrouwelijkheidsAanduiding.get_choice(value).order <= max_order:
+                    yield informatieobjecttype, value
+
+
+class InAuthorizations(Expression):
+    """
+    Test if the document is allowed by an :class:`AuthorizationPredicate`.
+
+    Compiles to ``(informatieobjecttype, vertrouwelijkheidaanduiding) IN
+    (VALUES ...)``, a semi-join against the allowed combinations that can use
+    the index on both columns, instead of a ``CASE`` per
+    ``informatieobjecttype``.
+    """
+    output_field = BooleanField()
+
+    def __init__(self, predicate: AuthorizationPredicate, prefix: str = ''):
+        super().__init__()
+        self.predicate = predicate
+        self.informatieobjecttype = F(f'{prefix}informatieobjecttype')
+        self.vertrouwelijkheidaanduiding = F(f'{prefix}vertrouwelijkheidaanduiding')
+
+    def get_source_expressions(self):
+        return [self.informatieobjecttype, self.vertrouwelijkheidaanduiding]
+
+    def set_source_expressions(self, exprs):
+        self.informatieobjecttype, self.vertrouwelijkheidaanduiding = exprs
+
+    def resolve_expression(self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False):
+        clone = self.copy()
+        clone.is_summary = summarize
+        clone.set_source_expressions([
+            expr.resolve_expression(query, allow_joins, reuse, summarize, for_save)
+            for expr in self.get_source_expressions()
+        ])
+        return clone
+
+    def as_sql(self, compiler, connection):
+        iot_sql, iot_params = compiler.compile(self.informatieobjecttype)
+        va_sql, va_params = compiler.compile(self.vertrouwelijkheidaanduiding)
+
+        values, params = [], []
+        for pair in self.predicate.pairs():
+            values.append('(%s, %s)')
+            params.extend(pair)
+
+        sql = f"({iot_sql}, {va_sql}) IN (VALUES {', '.join(values)})"
+        return sql, iot_params + va_params + params
+
+
 class AuthorizationsFilterMixin:
     authorizations_lookup = None
 
@@ -36,61 +136,25 @@ class AuthorizationsFilterMixin:
         :return: a queryset of filtered results according to the
           authorizations provided
         """
-        # keep a list of allowed informatieobjecttypen
-        informatieobjecttypen = []
+        predicate = AuthorizationPredicate.from_authorizations(scope, authorizations)
+        return self.filter_for_predicate(predicate)
 
-        # annotate the queryset so we can map a string value to a logical number
-        order_case = VertrouwelijkheidsAanduiding.get_order_expression(
-            "vertrouwelijkheidaanduiding"
+    def filter_for_predicate(self, predicate: AuthorizationPredicate) -> models.QuerySet:
+        """
+        Filter objects allowed by the compiled authorizations.
+        """
+        if not predicate:
+            return self.none()
+
+        # related objects are authorized through the latest version of their
+        # informatieobject, which the canonical points to
+        prefix = f"{self.authorizations_lookup}__latest__" if self.authorizations_lookup else ''
+        return (
+            self
+            .annotate(_geautoriseerd=InAuthorizations(predicate, prefix=prefix))
+            .filter(_geautoriseerd=True)
         )
 
-        # build the case/when to map the max_vertrouwelijkheidaanduiding based
-        # on the ``informatieobjecttype``
-        vertrouwelijkheidaanduiding_whens = []
-        for authorization in authorizations:
-            # test if this authorization has the scope that's needed
-            if not scope.is_contained_in(authorization.scopes):
-                continue
-
-            # this informatieobjecttype is allowed
-            informatieobjecttypen.append(authorization.informatieobjecttype)
-
-            # extract the order and map it to the database value
-            choice_item = VertrouwelijkheidsAanduiding.get_choice(
-                authorization.max_vertrouwelijkheidaanduiding
-            )
-            vertrouwelijkheidaanduiding_whens.append(
-                When(
-                    **{"informatieobjecttype": authorization.informatieobjecttype},
-                    then=Value(choice_item.order),
-                )
-            )
-
-        # apply the order annnotation so we can filter later
-        annotations = {"_va_order": order_case}
-        # filtering:
-        # * only allow the white-listed informatieobjecttypen, explicitly
-        # * apply the filtering to limit cases within case-types to the maximal
-        #   confidentiality level
-        filters = {
-            "informatieobjecttype__in": informatieobjecttypen,
-            "_va_order__lte": Case(
-                *vertrouwelijkheidaanduiding_whens, output_field=IntegerField()
-            ),
-        }
-        if self.authorizations_lookup:
-            # If the current queryset is not an InformatieObjectQuerySet, first
-            # retrieve the canonical IDs of EnkelvoudigInformatieObjects
-            # for which the user is authorized and then return the objects
-            # related to those EnkelvoudigInformatieObjectCanonicals
-            model = apps.get_model('datamodel', 'EnkelvoudigInformatieObject')
-            filtered = model.objects.annotate(**annotations).filter(**filters).values('canonical')
-            queryset = self.filter(informatieobject__in=filtered)
-        # bring it all together now to build the resulting queryset
-        else:
-            queryset = self.annotate(**annotations).filter(**filters)
-        return queryset
-
 
 class InformatieobjectQuerySet(AuthorizationsFilterMixin, models.QuerySet):
     pass
@@ -98,3 +162,35 @@ class InformatieobjectQuerySet(AuthorizationsFilterMixin, models.QuerySet):
 
 class InformatieobjectRelatedQuerySet(AuthorizationsFilterMixin, models.QuerySet):
     authorizations_lookup = "informatieobject"
+
+
+class GebruiksrechtenQuerySet(AuthorizationsFilterMixin, models.QuerySet):
+    def filter_for_predicate(self, predicate: AuthorizationPredicate) -> models.QuerySet:
+        # the informatieobject is a URL, ending with the uuid of the document
+        if not predicate:
+            return self.none()
+
+        model = apps.get_model('datamodel', 'EnkelvoudigInformatieObject')
+        documents = (
+            model.objects
+            .filter(canonical__latest=F('pk'))
+            .annotate(_uuid=Cast('uuid', CharField()), _geautoriseerd=InAuthorizations(predicate))
+            .filter(_geautoriseerd=True, _uuid=Right(OuterRef('informatieobject'), 36))
+        )
+        return self.annotate(_geautoriseerd=Exists(documents)).filter(_geautoriseerd=True)
+
+
+class ObjectInformatieobjectQuerySet(InformatieobjectRelatedQuerySet):
+    def with_latest_version(self):
+        """
+        Fetch the latest version of the related informatieobjecten in the same query.
+        """
+        return self.select_related('informatieobject__latest')
+
+
+class CanonicalQuerySet(models.QuerySet):
+    def with_latest_version(self):
+        """
+        Fetch the latest version of each canonical in the same query.
+        """
+        return self.select_related('latest')
@@ -1,6 +1,7 @@
 import datetime
 import uuid
 
+from django.core.files.base import ContentFile
 from django.utils import timezone
 
 import factory
@@ -13,14 +14,9 @@ from drc.backend import drc_storage_adapter
 fake = Faker()
 
 
-# class EnkelvoudigInformatieObjectCanonicalFactory(factory.django.DjangoModelFactory):
-#     class Meta:
-#         model = 'datamodel.EnkelvoudigInformatieObjectCanonical'
-
-#     latest_version = factory.RelatedFactory(
-#         'drc.datamodel.tests.factories.EnkelvoudigInformatieObjectFactory',
-#         'canonical'
-#     )
+class EnkelvoudigInformatieObjectCanonicalFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = 'datamodel.EnkelvoudigInformatieObjectCanonical'
 
 
 class EnkelvoudigInformatieObjectFactory(factory.django.DjangoModelFactory):
@@ -50,6 +46,28 @@ class EnkelvoudigInformatieObjectFactory(factory.django.DjangoModelFactory):
         return eio
 
 
+class EnkelvoudigInformatieObjectModelFactory(factory.django.DjangoModelFactory):
+    """
+    Save the model itself, for the tests of the stored content.
+
+    Set the lock with ``canonical__lock`` and the content with ``content``.
+    """
+    canonical = factory.SubFactory(EnkelvoudigInformatieObjectCanonicalFactory)
+    bronorganisatie = '159351741'
+    creatiedatum = datetime.date(2018, 6, 27)
+    titel = 'some titel'
+    auteur = 'some auteur'
+    taal = 'nld'
+    inhoud = factory.LazyAttribute(lambda eio: ContentFile(eio.content, name='dummy.txt'))
+    informatieobjecttype = 'https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1'
+
+    class Meta:
+        model = 'datamodel.EnkelvoudigInformatieObject'
+
+    class Params:
+        content = b'some content'
+
+
 class ObjectInformatieObjectFactory(factory.django.DjangoModelFactory):
     # informatieobject = factory.SubFactory(EnkelvoudigInformatieObjectCanonicalFactory)
     object = factory.Faker('url')
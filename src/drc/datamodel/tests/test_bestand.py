@@ -0,0 +1,172 @@
+import hashlib
+from datetime import date
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from privates.test import temp_private_root
+
+from drc.backend.django import DjangoDRCStorageBackend
+from drc.datamodel.blobs import IntegriteitError, blob_name
+from drc.datamodel.constants import ChecksumAlgoritmes
+from drc.datamodel.models import Bestand, EnkelvoudigInformatieObject
+
+from .factories import EnkelvoudigInformatieObjectModelFactory
+
+CONTENT = b'some content'
+
+
+@temp_private_root()
+class BestandTests(TransactionTestCase):
+
+    def test_stored_by_hash(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+
+        bestand = Bestand.objects.get()
+        self.assertEqual(bestand.sha256, hashlib.sha256(CONTENT).hexdigest())
+        self.assertEqual(eio.inhoud.name, blob_name(bestand.sha256))
+        self.assertEqual(bestand.referenties, 1)
+        self.assertEqual(bestand.bestandsomvang, len(CONTENT))
+        with eio.inhoud.open('rb') as inhoud:
+            self.assertEqual(inhoud.read(), CONTENT)
+
+    def test_same_content_shared(self):
+        eio1 = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+        eio2 = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+        EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock', content=b'other content')
+
+        self.assertEqual(eio1.inhoud.name, eio2.inhoud.name)
+        self.assertEqual(Bestand.objects.count(), 2)
+        self.assertEqual(Bestand.objects.get(inhoud=eio1.inhoud.name).referenties, 2)
+
+    def test_new_version_without_content(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+
+        DjangoDRCStorageBackend().update_document(uuid=eio.uuid, lock='lock', data={'titel': 'other titel'})
+
+        versies = EnkelvoudigInformatieObject.objects.filter(uuid=eio.uuid).order_by('versie')
+        self.assertEqual([versie.titel for versie in versies], ['some titel', 'other titel'])
+        self.assertEqual(versies[0].inhoud.name, versies[1].inhoud.name)
+        self.assertEqual(Bestand.objects.get().referenties, 2)
+
+    def test_new_version_with_content(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+
+        DjangoDRCStorageBackend().update_document(
+            uuid=eio.uuid, lock='lock', data={}, content=ContentFile(b'new content', name='dummy.txt')
+        )
+
+        self.assertEqual(Bestand.objects.count(), 2)
+        self.assertEqual(sorted(Bestand.objects.values_list('referenties', flat=True)), [1, 1])
+
+    def test_collected_with_last_reference(self):
+        eio1 = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+        eio2 = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+        bestand = Bestand.objects.get()
+        storage = bestand.inhoud.storage
+
+        eio1.delete()
+
+        bestand.refresh_from_db()
+        self.assertEqual(bestand.referenties, 1)
+        self.assertTrue(storage.exists(bestand.inhoud.name))
+
+        DjangoDRCStorageBackend().delete_document(uuid=eio2.uuid)
+
+        self.assertFalse(Bestand.objects.exists())
+        self.assertFalse(storage.exists(bestand.inhoud.name))
+
+    def test_stored_again_before_collected(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+
+        with transaction.atomic():
+            eio.delete()
+            eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+
+        bestand = Bestand.objects.get()
+        self.assertEqual(bestand.referenties, 1)
+        self.assertEqual(eio.inhoud.name, bestand.inhoud.name)
+        self.assertTrue(bestand.inhoud.storage.exists(bestand.inhoud.name))
+
+    def test_stored_again_after_removed(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+        bestand = Bestand.objects.get()
+        # the file was removed, but removing the row was not committed
+        Bestand.objects.filter(pk=bestand.pk).update(referenties=0)
+        EnkelvoudigInformatieObject.objects.filter(pk=eio.pk).delete()
+        bestand.inhoud.storage.delete(bestand.inhoud.name)
+
+        EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+
+        bestand.refresh_from_db()
+        self.assertEqual(bestand.referenties, 1)
+        with bestand.inhoud.open('rb') as inhoud:
+            self.assertEqual(inhoud.read(), CONTENT)
+
+    def test_reference_to_collected_content(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+        name = eio.inhoud.name
+        eio.delete()
+
+        with self.assertRaises(Bestand.DoesNotExist):
+            Bestand.objects.add_reference(name)
+
+
+@temp_private_root()
+class IntegriteitTests(TransactionTestCase):
+
+    def test_filled_in(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+
+        self.assertEqual(eio.integriteit_algoritme, ChecksumAlgoritmes.sha_256)
+        self.assertEqual(eio.integriteit_waarde, hashlib.sha256(CONTENT).hexdigest())
+        self.assertIsNotNone(eio.integriteit_datum)
+
+    def test_filled_in_with_algoritme(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(
+            canonical__lock='lock', integriteit_algoritme=ChecksumAlgoritmes.md5
+        )
+
+        self.assertEqual(eio.integriteit_waarde, hashlib.md5(CONTENT).hexdigest())
+
+    def test_verified(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(
+            canonical__lock='lock',
+            integriteit_algoritme=ChecksumAlgoritmes.sha_1,
+            integriteit_waarde=hashlib.sha1(CONTENT).hexdigest().upper(),
+            integriteit_datum=date(2018, 6, 27),
+        )
+
+        self.assertEqual(eio.integriteit_datum, date(2018, 6, 27))
+
+    def test_mismatch(self):
+        with self.assertRaises(IntegriteitError):
+            EnkelvoudigInformatieObjectModelFactory.create(
+                canonical__lock='lock',
+                integriteit_algoritme=ChecksumAlgoritmes.sha_256,
+                integriteit_waarde=hashlib.sha256(b'other content').hexdigest(),
+                integriteit_datum=date(2018, 6, 27),
+            )
+
+        self.assertFalse(EnkelvoudigInformatieObject.objects.exists())
+        self.assertFalse(Bestand.objects.exists())
+
+    def test_not_supported(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(
+            canonical__lock='lock',
+            integriteit_algoritme=ChecksumAlgoritmes.crc_32,
+            integriteit_waarde='not verified',
+            integriteit_datum=date(2018, 6, 27),
+        )
+
+        self.assertEqual(eio.integriteit_waarde, 'not verified')
+
+    def test_new_content_computed_again(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+
+        document = DjangoDRCStorageBackend().update_document(
+            uuid=eio.uuid, lock='lock', data={}, content=ContentFile(b'new content', name='dummy.txt')
+        )
+
+        self.assertEqual(document.integriteit_waarde, hashlib.sha256(b'new content').hexdigest())
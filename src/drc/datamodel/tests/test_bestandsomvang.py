@@ -0,0 +1,53 @@
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase
+
+from privates.test import temp_private_root
+
+from drc.backend.django import DjangoDRCStorageBackend
+from drc.datamodel.models import EnkelvoudigInformatieObject
+
+from .factories import EnkelvoudigInformatieObjectModelFactory
+
+
+@temp_private_root()
+class BestandsomvangTests(TestCase):
+
+    def test_stored_with_content(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+
+        eio.refresh_from_db()
+        self.assertEqual(eio.bestandsomvang, len(b'some content'))
+
+    def test_new_version(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+        backend = DjangoDRCStorageBackend()
+
+        document = backend.update_document(uuid=eio.uuid, lock='lock', data={'titel': 'other titel'})
+        self.assertEqual(document.bestandsomvang, len(b'some content'))
+
+        document = backend.update_document(
+            uuid=eio.uuid, lock='lock', data={}, content=ContentFile(b'new content', name='dummy.txt')
+        )
+        self.assertEqual(document.bestandsomvang, len(b'new content'))
+
+    def test_serialized_without_storage(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+        eio.inhoud.delete(save=False)
+
+        document = DjangoDRCStorageBackend()._to_dataclass(
+            EnkelvoudigInformatieObject.objects.select_related('canonical').get(pk=eio.pk)
+        )
+
+        self.assertEqual(document.bestandsomvang, len(b'some content'))
+
+    def test_fill_command(self):
+        eio = EnkelvoudigInformatieObjectModelFactory.create(canonical__lock='lock')
+        EnkelvoudigInformatieObject.objects.update(bestandsomvang=None)
+
+        call_command('fill_bestandsomvang', stdout=StringIO())
+
+        eio.refresh_from_db()
+        self.assertEqual(eio.bestandsomvang, len(b'some content'))
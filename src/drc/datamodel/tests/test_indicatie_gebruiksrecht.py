@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from drc.backend import BackendException
+from drc.backend.abstract import BaseDRCStorageBackend
+from drc.backend.django import DjangoDRCStorageBackend
+from drc.datamodel.models import (
+    EnkelvoudigInformatieObject, EnkelvoudigInformatieObjectCanonical,
+    Gebruiksrechten
+)
+
+
+class IndicatieGebruiksrechtTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.eio = EnkelvoudigInformatieObject.objects.create(
+            canonical=EnkelvoudigInformatieObjectCanonical.objects.create(),
+            bronorganisatie='159351741',
+            creatiedatum='2018-06-27',
+            titel='some titel',
+            auteur='some auteur',
+            taal='nld',
+            informatieobjecttype='https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1',
+        )
+        self.url = f'http://testserver/api/v1/enkelvoudiginformatieobjecten/{self.eio.uuid}'
+
+    def test_set_in_place(self):
+        backend = DjangoDRCStorageBackend()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(backend.set_document_indicatie_gebruiksrecht(str(self.eio.uuid), True))
+
+        self.eio.refresh_from_db()
+        self.assertTrue(self.eio.indicatie_gebruiksrecht)
+        self.assertEqual(self.eio.versie, 1)
+        self.assertEqual(EnkelvoudigInformatieObject.objects.count(), 1)
+
+    def test_unchanged(self):
+        backend = DjangoDRCStorageBackend()
+        backend.set_document_indicatie_gebruiksrecht(str(self.eio.uuid), True)
+
+        self.assertFalse(backend.set_document_indicatie_gebruiksrecht(str(self.eio.uuid), True))
+
+    def test_latest_version(self):
+        self.eio.pk = None
+        self.eio.versie = 2
+        self.eio.save()
+
+        DjangoDRCStorageBackend().set_document_indicatie_gebruiksrecht(str(self.eio.uuid), True)
+
+        self.assertEqual(
+            list(EnkelvoudigInformatieObject.objects.order_by('versie').values_list('indicatie_gebruiksrecht', flat=True)),
+            [None, True]
+        )
+
+    def test_default_unknown_is_false(self):
+        backend = DjangoDRCStorageBackend()
+
+        # the implementation for backends without a single write
+        with patch.object(backend, 'lock_document') as lock_document:
+            changed = BaseDRCStorageBackend.set_document_indicatie_gebruiksrecht(backend, str(self.eio.uuid), None)
+
+        self.assertFalse(changed)
+        lock_document.assert_not_called()
+
+    def test_not_found(self):
+        with self.assertRaises(BackendException):
+            DjangoDRCStorageBackend().set_document_indicatie_gebruiksrecht(
+                '3a1bc9e1-4fe0-4a1c-8a2c-1d8d0b2e3f4a', True
+            )
+
+    def test_gebruiksrechten(self):
+        gebruiksrechten = Gebruiksrechten.objects.create(
+            informatieobject=self.url,
+            startdatum='2018-12-24T00:00:00Z',
+            omschrijving_voorwaarden='Een hele set onredelijke voorwaarden',
+        )
+
+        self.eio.refresh_from_db()
+        self.assertTrue(self.eio.indicatie_gebruiksrecht)
+        self.assertEqual(EnkelvoudigInformatieObject.objects.count(), 1)
+
+        gebruiksrechten.delete()
+
+        self.eio.refresh_from_db()
+        self.assertIsNone(self.eio.indicatie_gebruiksrecht)
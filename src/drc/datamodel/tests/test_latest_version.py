@@ -0,0 +1,76 @@
+from django.core.files.base import ContentFile
+from django.test import TestCase
+
+from privates.test import temp_private_root
+
+from drc.datamodel.models import (
+    EnkelvoudigInformatieObject, EnkelvoudigInformatieObjectCanonical,
+    ObjectInformatieObject
+)
+
+
+@temp_private_root()
+class LatestVersionTests(TestCase):
+
+    def _create_versie(self, canonical, versie, **kwargs):
+        return EnkelvoudigInformatieObject.objects.create(
+            canonical=canonical,
+            versie=versie,
+            bronorganisatie='159351741',
+            identificatie=f'DOCUMENT-{versie}',
+            creatiedatum='2018-06-27',
+            titel=f'versie {versie}',
+            auteur='some auteur',
+            taal='nld',
+            inhoud=ContentFile(b'some content', name='dummy.txt'),
+            informatieobjecttype='https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1',
+            **kwargs
+        )
+
+    def test_latest_follows_new_versions(self):
+        canonical = EnkelvoudigInformatieObjectCanonical.objects.create()
+        self._create_versie(canonical, 1)
+        versie_2 = self._create_versie(canonical, 2)
+
+        canonical.refresh_from_db()
+
+        self.assertEqual(canonical.latest, versie_2)
+        with self.assertNumQueries(0):
+            self.assertEqual(canonical.latest_version.versie, 2)
+
+    def test_saving_older_version_keeps_latest(self):
+        canonical = EnkelvoudigInformatieObjectCanonical.objects.create()
+        versie_1 = self._create_versie(canonical, 1)
+        versie_2 = self._create_versie(canonical, 2)
+
+        versie_1.titel = 'gewijzigd'
+        versie_1.save()
+
+        canonical.refresh_from_db()
+        self.assertEqual(canonical.latest, versie_2)
+
+    def test_delete_latest_version(self):
+        canonical = EnkelvoudigInformatieObjectCanonical.objects.create()
+        versie_1 = self._create_versie(canonical, 1)
+        versie_2 = self._create_versie(canonical, 2)
+
+        versie_2.delete()
+
+        canonical.refresh_from_db()
+        self.assertEqual(canonical.latest, versie_1)
+
+    def test_with_latest_version(self):
+        for i in range(3):
+            canonical = EnkelvoudigInformatieObjectCanonical.objects.create()
+            self._create_versie(canonical, 1)
+            ObjectInformatieObject.objects.create(
+                informatieobject=canonical, object=f'https://example.com/zaken/{i}', object_type='zaak'
+            )
+
+        with self.assertNumQueries(1):
+            titels = [str(canonical) for canonical in EnkelvoudigInformatieObjectCanonical.objects.with_latest_version()]
+        self.assertEqual(len(titels), 3)
+
+        with self.assertNumQueries(1):
+            titels = [oio.get_title() for oio in ObjectInformatieObject.objects.with_latest_version()]
+        self.assertEqual(titels, ['versie 1'] * 3)
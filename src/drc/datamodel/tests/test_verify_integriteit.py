@@ -0,0 +1,69 @@
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from privates.test import temp_private_root
+
+from .factories import EnkelvoudigInformatieObjectModelFactory
+
+
+@temp_private_root()
+class VerifyIntegriteitTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.checkpoint = os.path.join(tempfile.mkdtemp(), 'checkpoint.json')
+
+    def _verify(self, **options):
+        stdout = StringIO()
+        call_command(
+            'verify_integriteit', checkpoint=self.checkpoint, bandwidth=0,
+            stdout=stdout, stderr=StringIO(), **options
+        )
+        return list(csv.DictReader(StringIO(stdout.getvalue())))
+
+    def test_report(self):
+        intact = EnkelvoudigInformatieObjectModelFactory.create(content=b'intact')
+        damaged = EnkelvoudigInformatieObjectModelFactory.create(content=b'damaged')
+        missing = EnkelvoudigInformatieObjectModelFactory.create(content=b'missing')
+        with open(damaged.inhoud.path, 'wb') as outfile:
+            outfile.write(b'bit rot')
+        os.remove(missing.inhoud.path)
+
+        report = self._verify(batch_size=2)
+
+        self.assertEqual(
+            [(row['uuid'], row['status']) for row in report],
+            [(str(damaged.uuid), 'afwijkend'), (str(missing.uuid), 'ontbrekend')]
+        )
+        self.assertEqual(report[0]['verwacht'], damaged.integriteit_waarde)
+        self.assertNotIn(str(intact.uuid), [row['uuid'] for row in report])
+        # the run is complete
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resume(self):
+        first = EnkelvoudigInformatieObjectModelFactory.create(content=b'first')
+        second = EnkelvoudigInformatieObjectModelFactory.create(content=b'second')
+        for eio in (first, second):
+            os.remove(eio.inhoud.path)
+        with open(self.checkpoint, 'w') as outfile:
+            json.dump({'pk': first.pk}, outfile)
+
+        report = self._verify()
+
+        self.assertEqual([row['uuid'] for row in report], [str(second.uuid)])
+
+    def test_restart(self):
+        first = EnkelvoudigInformatieObjectModelFactory.create(content=b'first')
+        os.remove(first.inhoud.path)
+        with open(self.checkpoint, 'w') as outfile:
+            json.dump({'pk': first.pk}, outfile)
+
+        report = self._verify(restart=True)
+
+        self.assertEqual([row['uuid'] for row in report], [str(first.uuid)])
@@ -0,0 +1,118 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import requests
+
+from django.test import SimpleTestCase, override_settings
+
+from drc.backend import http
+from drc.backend.adapter import DRCStorageAdapter
+
+
+class OKHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+class ClosingHandler(OKHandler):
+    def do_GET(self):
+        super().do_GET()
+        # without telling the client, like a server closing an idle connection
+        self.close_connection = True
+
+
+class BackendInstanceTests(SimpleTestCase):
+
+    def test_backend_is_reused(self):
+        adapter = DRCStorageAdapter()
+
+        self.assertIs(adapter.backend(), adapter.backend())
+
+    def test_reset_backend(self):
+        adapter = DRCStorageAdapter()
+        backend = adapter.backend()
+
+        adapter.reset_backend()
+
+        self.assertIsNot(adapter.backend(), backend)
+
+
+@override_settings(HTTP_POOL_CONNECTIONS=1, HTTP_POOL_MAXSIZE=1)
+class HTTPSessionTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = HTTPServer(('127.0.0.1', 0), OKHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        http.reset_session()
+        self.addCleanup(http.reset_session)
+
+    def test_session_is_reused(self):
+        self.assertIs(http.get_session(), http.get_session())
+
+    def test_pool_hits_and_misses(self):
+        before = http.get_pool_stats()
+
+        for _ in range(3):
+            http.fetch(self.url)
+
+        stats = http.get_pool_stats()
+        self.assertEqual(stats['misses'] - before['misses'], 1)
+        self.assertEqual(stats['hits'] - before['hits'], 2)
+
+    def test_session_is_not_recycled(self):
+        session = http.get_session()
+        http.fetch(self.url)
+
+        with patch('time.monotonic', return_value=10 ** 6):
+            self.assertIs(http.get_session(), session)
+
+    def test_closed_connection_is_replaced(self):
+        server = HTTPServer(('127.0.0.1', 0), ClosingHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_port}/"
+
+        for _ in range(3):
+            self.assertEqual(http.fetch(url).content, b'ok')
+
+    @override_settings(HTTP_RETRIES=2)
+    def test_retries(self):
+        http.reset_session()
+
+        adapter = http.get_session().get_adapter(self.url)
+
+        self.assertEqual(adapter.max_retries.total, 2)
+
+    @override_settings(HTTP_TIMEOUT=0.2)
+    def test_timeout(self):
+        # accepts the connection, but never answers
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        self.addCleanup(server.close)
+
+        with self.assertRaises(requests.Timeout):
+            http.fetch(f"http://127.0.0.1:{server.getsockname()[1]}/")
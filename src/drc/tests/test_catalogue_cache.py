@@ -0,0 +1,189 @@
+import threading
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from drc.api.catalogue import CachedResponse, CatalogueCache
+
+URL = 'https://example.com/ztc/api/v1/catalogussen/1/informatieobjecttypen/1'
+
+
+class Fetcher:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+        self.called = threading.Event()
+
+    def __call__(self, url):
+        self.calls += 1
+        self.called.set()
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@override_settings(ZTC_CACHE_SIZE=2, ZTC_CACHE_TTL=60, ZTC_CACHE_NEGATIVE_TTL=10, ZTC_CACHE_STALE_TTL=600)
+@patch('drc.api.catalogue.time.monotonic')
+class CatalogueCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = CatalogueCache()
+
+    def test_cached_until_expired(self, mock_time):
+        mock_time.return_value = 0
+        fetch = Fetcher(CachedResponse(200, {'omschrijving': 'foo'}))
+
+        self.cache.get(URL, fetch)
+        mock_time.return_value = 59
+        response = self.cache.get(URL, fetch)
+
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(response.json(), {'omschrijving': 'foo'})
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 1, 'stale': 0, 'size': 1})
+
+    def test_stale_while_revalidate(self, mock_time):
+        mock_time.return_value = 0
+        fetch = Fetcher(CachedResponse(200, {'omschrijving': 'oud'}), CachedResponse(200, {'omschrijving': 'nieuw'}))
+        self.cache.get(URL, fetch)
+        fetch.called.clear()
+
+        mock_time.return_value = 61
+        response = self.cache.get(URL, fetch)
+
+        # the stale response is served, while it's refreshed in the background
+        self.assertEqual(response.json(), {'omschrijving': 'oud'})
+        self.assertTrue(fetch.called.wait(5))
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread() and thread.daemon:
+                thread.join(5)
+        self.assertEqual(self.cache.get(URL, fetch).json(), {'omschrijving': 'nieuw'})
+
+    def test_stale_kept_when_refresh_fails(self, mock_time):
+        mock_time.return_value = 0
+        fetch = Fetcher(CachedResponse(200, {'omschrijving': 'oud'}), ConnectionError('ZTC is down'))
+        self.cache.get(URL, fetch)
+
+        mock_time.return_value = 61
+        with patch('drc.api.catalogue.threading.Thread') as mock_thread:
+            self.cache.get(URL, fetch)
+            self.cache._refresh(*mock_thread.call_args[1]['args'])
+
+            self.assertEqual(self.cache.get(URL, fetch).json(), {'omschrijving': 'oud'})
+
+    def test_refetched_after_stale_period(self, mock_time):
+        mock_time.return_value = 0
+        fetch = Fetcher(CachedResponse(200), CachedResponse(200))
+        self.cache.get(URL, fetch)
+
+        mock_time.return_value = 661
+        self.cache.get(URL, fetch)
+
+        self.assertEqual(fetch.calls, 2)
+
+    def test_negative_caching(self, mock_time):
+        mock_time.return_value = 0
+        fetch = Fetcher(CachedResponse(404), CachedResponse(200))
+
+        self.assertEqual(self.cache.get(URL, fetch).status_code, 404)
+        mock_time.return_value = 9
+        self.assertEqual(self.cache.get(URL, fetch).status_code, 404)
+        mock_time.return_value = 11
+        self.assertEqual(self.cache.get(URL, fetch).status_code, 200)
+
+    def test_errors_not_cached(self, mock_time):
+        mock_time.return_value = 0
+        fetch = Fetcher(CachedResponse(500), ConnectionError('ZTC is down'), CachedResponse(200))
+
+        self.assertEqual(self.cache.get(URL, fetch).status_code, 500)
+        with self.assertRaises(ConnectionError):
+            self.cache.get(URL, fetch)
+        self.assertEqual(self.cache.get(URL, fetch).status_code, 200)
+
+    def test_size_bound(self, mock_time):
+        mock_time.return_value = 0
+        fetch = Fetcher(*[CachedResponse(200) for i in range(4)])
+
+        self.cache.get(f'{URL}/1', fetch)
+        self.cache.get(f'{URL}/2', fetch)
+        # the least recently used is evicted
+        self.cache.get(f'{URL}/1', fetch)
+        self.cache.get(f'{URL}/3', fetch)
+        self.cache.get(f'{URL}/1', fetch)
+        self.cache.get(f'{URL}/2', fetch)
+
+        self.assertEqual(fetch.calls, 4)
+
+
+@override_settings(
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'ztc': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'ztc'},
+    },
+    ZTC_CACHE_ALIAS='ztc', ZTC_CACHE_SIZE=2, ZTC_CACHE_TTL=60, ZTC_CACHE_NEGATIVE_TTL=10, ZTC_CACHE_STALE_TTL=600
+)
+@patch('drc.api.catalogue.time.time')
+@patch('drc.api.catalogue.time.monotonic')
+class SharedCatalogueCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        caches['ztc'].clear()
+        # like two processes
+        self.cache = CatalogueCache()
+        self.other = CatalogueCache()
+
+    def _at(self, mock_monotonic, mock_time, seconds):
+        # the processes have their own monotonic clock
+        mock_monotonic.return_value = 1000 + seconds
+        mock_time.return_value = 1500000000 + seconds
+
+    def test_fetched_once(self, mock_monotonic, mock_time):
+        self._at(mock_monotonic, mock_time, 0)
+        fetch = Fetcher(CachedResponse(200, {'omschrijving': 'foo'}))
+        self.cache.get(URL, fetch)
+
+        self._at(mock_monotonic, mock_time, 30)
+        response = self.other.get(URL, fetch)
+
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(response.json(), {'omschrijving': 'foo'})
+        # and kept by the other process from now on
+        with patch.object(caches['ztc'], 'get') as mock_get:
+            self.other.get(URL, fetch)
+        mock_get.assert_not_called()
+
+    def test_expires(self, mock_monotonic, mock_time):
+        self._at(mock_monotonic, mock_time, 0)
+        fetch = Fetcher(CachedResponse(404), CachedResponse(200))
+        self.cache.get(URL, fetch)
+
+        self._at(mock_monotonic, mock_time, 11)
+        self.assertEqual(self.other.get(URL, fetch).status_code, 200)
+        self.assertEqual(fetch.calls, 2)
+
+    def test_refreshed_by_other_process(self, mock_monotonic, mock_time):
+        self._at(mock_monotonic, mock_time, 0)
+        self.cache.get(URL, Fetcher(CachedResponse(200, {'omschrijving': 'oud'})))
+        self.other.get(URL, Fetcher())
+
+        self._at(mock_monotonic, mock_time, 61)
+        self.cache.invalidate(URL)
+        self.cache.get(URL, Fetcher(CachedResponse(200, {'omschrijving': 'nieuw'})))
+
+        # the other process has an expired response, the shared one is fresh
+        fetch = Fetcher()
+        self.assertEqual(self.other.get(URL, fetch).json(), {'omschrijving': 'nieuw'})
+        self.assertEqual(fetch.calls, 0)
+
+    def test_invalidate(self, mock_monotonic, mock_time):
+        self._at(mock_monotonic, mock_time, 0)
+        fetch = Fetcher(CachedResponse(200), CachedResponse(200))
+        self.cache.get(URL, fetch)
+
+        self.cache.invalidate(URL)
+
+        self.other.get(URL, fetch)
+        self.assertEqual(fetch.calls, 2)
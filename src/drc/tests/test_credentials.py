@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from vng_api_common.models import APICredential
+
+from drc.api.credentials import CredentialRegistry, credentials
+
+ZRC = 'https://example.com/zrc/api/v1/'
+ZAAK_1 = '1c8e36be-338c-4c07-ac5e-1adf55bec04a'
+ZAAK_2 = '2e7b4d8c-5a1f-4f0e-9d3a-7c6b5e4d3c2b'
+
+
+class Client:
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.auth = None
+
+    @classmethod
+    def from_url(cls, url):
+        return cls(url[:url.index('/api/v1/') + len('/api/v1/')])
+
+
+@override_settings(API_CREDENTIALS_TTL=60, ZDS_CLIENT_CLASS='drc.tests.test_credentials.Client')
+@patch('drc.api.credentials.time.monotonic', return_value=0)
+class CredentialRegistryTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        APICredential.objects.create(api_root='https://example.com/', client_id='algemeen', secret='geheim')
+        APICredential.objects.create(api_root=ZRC, client_id='zrc', secret='geheim')
+        self.registry = CredentialRegistry()
+
+    def test_longest_api_root(self, mock_time):
+        self.assertEqual(self.registry.get_api_root(f'{ZRC}zaken/1'), ZRC)
+        self.assertEqual(self.registry.get_api_root('https://example.com/ztc/api/v1/'), 'https://example.com/')
+        self.assertIsNone(self.registry.get_api_root('https://other.example.com/zrc/api/v1/zaken/1'))
+
+    def test_auth_cached(self, mock_time):
+        with self.assertNumQueries(2):
+            auth = self.registry.get_auth(f'{ZRC}zaken/1', scopes=['zds.scopes.zaken.lezen'])
+            self.assertEqual(auth.client_id, 'zrc')
+
+        with self.assertNumQueries(0):
+            self.assertIs(self.registry.get_auth(f'{ZRC}zaken/2', scopes=['zds.scopes.zaken.lezen']), auth)
+
+        # other claims, other auth
+        with self.assertNumQueries(1):
+            self.assertIsNot(self.registry.get_auth(f'{ZRC}zaken/2', scopes=['zds.scopes.zaken.aanmaken']), auth)
+
+    def test_expires(self, mock_time):
+        self.registry.get_auth(f'{ZRC}zaken/1')
+        mock_time.return_value = 61
+
+        with self.assertNumQueries(2):
+            self.registry.get_auth(f'{ZRC}zaken/1')
+
+    def test_no_credentials(self, mock_time):
+        with self.assertNumQueries(1):
+            self.assertIsNone(self.registry.get_auth('https://other.example.com/zrc/api/v1/zaken/1'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.registry.get_auth('https://other.example.com/zrc/api/v1/zaken/2'))
+
+    def test_client_reused(self, mock_time):
+        with patch.object(Client, 'from_url', wraps=Client.from_url) as from_url:
+            client = self.registry.get_client(f'{ZRC}zaken/{ZAAK_1}')
+
+            self.assertEqual(client.base_url, ZRC)
+            self.assertEqual(client.auth.client_id, 'zrc')
+            with self.assertNumQueries(0):
+                self.assertIs(self.registry.get_client(f'{ZRC}zaken/{ZAAK_2}/zaakinformatieobjecten'), client)
+
+        # only built once
+        from_url.assert_called_once_with(f'{ZRC}zaken/{ZAAK_1}')
+
+    def test_cleared_when_credentials_change(self, mock_time):
+        credentials.get_auth(f'{ZRC}zaken/1')
+
+        APICredential.objects.get(api_root=ZRC).delete()
+
+        self.assertEqual(credentials.get_auth(f'{ZRC}zaken/1').client_id, 'algemeen')
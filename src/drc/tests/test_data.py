@@ -0,0 +1,64 @@
+import pickle
+from dataclasses import FrozenInstanceError, replace
+from datetime import date, datetime, timezone
+
+from django.test import SimpleTestCase
+
+from drc.backend.data import (
+    DocumentVersie, EnkelvoudigInformatieObject, ObjectInformatieObject
+)
+
+
+def get_document(**kwargs):
+    values = dict(
+        url='http://testserver/api/v1/enkelvoudiginformatieobjecten/e8e15b0d',
+        inhoud='http://testserver/api/v1/enkelvoudiginformatieobjecten/e8e15b0d/download',
+        creatiedatum=date(2018, 6, 27), ontvangstdatum=None, verzenddatum=None,
+        integriteit_datum=None, ondertekening_datum=None, titel='some titel', identificatie='',
+        bronorganisatie='159351741', vertrouwelijkheidaanduiding='openbaar', auteur='some auteur',
+        status=None, beschrijving='', indicatie_gebruiksrecht=None, ondertekening_soort='',
+        informatieobjecttype='https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1',
+        formaat='', taal='nld', bestandsnaam='', link='', integriteit_algoritme='',
+        integriteit_waarde='', bestandsomvang=10, begin_registratie=None, versie=1, locked=False,
+    )
+    values.update(kwargs)
+    return EnkelvoudigInformatieObject(**values)
+
+
+class DataTests(SimpleTestCase):
+
+    def test_slots(self):
+        document = get_document()
+
+        self.assertFalse(hasattr(document, '__dict__'))
+        with self.assertRaises(AttributeError):
+            document.extra = 'value'
+        # set by __post_init__
+        self.assertIs(document.indicatie_gebruiksrecht, False)
+
+    def test_pickle(self):
+        document = get_document()
+        versie = DocumentVersie(uuid='e8e15b0d', versie=1, begin_registratie=None)
+
+        self.assertEqual(pickle.loads(pickle.dumps(document)), document)
+        self.assertEqual(pickle.loads(pickle.dumps(versie)), versie)
+
+    def test_frozen(self):
+        oio = ObjectInformatieObject(
+            url='', informatieobject='', object='', object_type='zaak', aard_relatie='hoort_bij',
+            titel='', beschrijving='', registratiedatum='',
+        )
+
+        with self.assertRaises(FrozenInstanceError):
+            oio.titel = 'changed'
+        self.assertEqual(replace(oio, titel='changed').titel, 'changed')
+
+    def test_as_update_dict(self):
+        data = get_document(
+            status='definitief', begin_registratie=datetime(2018, 6, 27, tzinfo=timezone.utc), locked=True
+        ).as_update_dict()
+
+        self.assertEqual(data['status'], 'definitief')
+        self.assertEqual(data['titel'], 'some titel')
+        for name in ('url', 'inhoud', 'bestandsomvang', 'versie', 'begin_registratie', 'locked', 'ontvangstdatum'):
+            self.assertNotIn(name, data)
@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+from unittest.mock import Mock, patch
+
+from django.core.cache import caches
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+
+from drc.backend import drc_storage_adapter
+from drc.backend.cache import DocumentCache
+
+UUID = 'e8e15b0d-7f5f-4eda-9d24-7e1bd8b47c3a'
+
+
+@dataclass
+class Document:
+    versie: int
+    titel: str
+    locked: bool = False
+
+
+class Fetcher:
+    def __init__(self, versies, locked=False):
+        self.versies = versies
+        self.locked = locked
+        self.calls = []
+
+    def __call__(self, versie):
+        self.calls.append(versie)
+        versie = versie or len(self.versies)
+        return Document(versie=versie, titel=self.versies[versie - 1], locked=self.locked)
+
+
+@override_settings(
+    DOCUMENT_CACHE_ALIAS='documents',
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'documents': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'documents'},
+    }
+)
+class DocumentCacheTests(TransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        caches['documents'].clear()
+        self.cache = DocumentCache()
+
+    def test_latest(self):
+        fetch = Fetcher(['een', 'twee'])
+
+        self.assertEqual(self.cache.get(UUID, None, fetch).titel, 'twee')
+        self.assertEqual(self.cache.get(UUID, None, fetch).titel, 'twee')
+        self.assertEqual(self.cache.get(UUID, 2, fetch).titel, 'twee')
+        self.assertEqual(fetch.calls, [None])
+
+    def test_versions(self):
+        fetch = Fetcher(['een', 'twee'])
+
+        self.assertEqual(self.cache.get(UUID, 1, fetch).titel, 'een')
+        self.assertEqual(self.cache.get(UUID, 1, fetch).titel, 'een')
+        self.assertEqual(fetch.calls, [None, 1])
+
+    def test_invalidate(self):
+        fetch = Fetcher(['een'])
+        self.cache.get(UUID, None, fetch)
+        fetch.versies.append('twee')
+        fetch.locked = True
+
+        self.cache.invalidate(UUID)
+
+        document = self.cache.get(UUID, 1, fetch)
+        # the cached version, with the current lock
+        self.assertEqual(document.titel, 'een')
+        self.assertTrue(document.locked)
+        self.assertEqual(self.cache.get(UUID, None, fetch).titel, 'twee')
+        self.assertEqual(fetch.calls, [None, None])
+
+    def test_invalidate_deleted(self):
+        self.cache.get(UUID, None, Fetcher(['een', 'twee']))
+
+        self.cache.invalidate(UUID, versions=True)
+
+        self.assertIsNone(caches['documents'].get(f'drc:document:{UUID}:2'))
+
+    def test_not_cached_in_transaction(self):
+        fetch = Fetcher(['een'])
+
+        with transaction.atomic():
+            self.cache.get(UUID, None, fetch)
+        self.cache.get(UUID, None, fetch)
+
+        self.assertEqual(fetch.calls, [None, None])
+
+    def test_disabled(self):
+        fetch = Fetcher(['een'])
+
+        with override_settings(DOCUMENT_CACHE_ALIAS=''):
+            self.cache.get(UUID, None, fetch)
+            self.cache.get(UUID, None, fetch)
+
+        self.assertEqual(fetch.calls, [None, None])
+
+    def test_adapter(self):
+        backend = Mock(get_document=Mock(return_value=Document(versie=1, titel='een')))
+
+        with patch.object(drc_storage_adapter, 'backend', return_value=backend):
+            drc_storage_adapter.lees_enkelvoudiginformatieobject(UUID)
+            drc_storage_adapter.lees_enkelvoudiginformatieobject(UUID, filters={'versie': 1})
+            drc_storage_adapter.lock_enkelvoudiginformatieobject(UUID)
+            drc_storage_adapter.lees_enkelvoudiginformatieobject(UUID)
+
+        self.assertEqual(backend.get_document.call_count, 2)
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from drc.backend import BackendException, drc_storage_adapter
+from drc.datamodel.models import (
+    DocumentLock, EnkelvoudigInformatieObject,
+    EnkelvoudigInformatieObjectCanonical
+)
+
+
+@override_settings(DOCUMENT_LOCK_TTL=600, DOCUMENT_CACHE_ALIAS='')
+class LockLeaseTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.eio = EnkelvoudigInformatieObject.objects.create(
+            canonical=EnkelvoudigInformatieObjectCanonical.objects.create(),
+            bronorganisatie='159351741',
+            creatiedatum='2018-06-27',
+            titel='some titel',
+            auteur='some auteur',
+            taal='nld',
+            informatieobjecttype='https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1',
+        )
+        self.uuid = str(self.eio.uuid)
+
+    def _expire(self):
+        DocumentLock.objects.filter(uuid=self.uuid).update(verloopt_op=timezone.now() - timedelta(seconds=1))
+
+    def test_lock(self):
+        lock = drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+
+        lease = DocumentLock.objects.get(uuid=self.uuid)
+        self.assertEqual(lease.lock, lock)
+        self.assertAlmostEqual(lease.verloopt_op, timezone.now() + timedelta(seconds=600), delta=timedelta(seconds=5))
+        self.assertTrue(drc_storage_adapter.lees_enkelvoudiginformatieobject(self.uuid).locked)
+
+    def test_lock_without_lease(self):
+        with patch('drc.backend.adapter.lock_manager.acquire', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+
+        self.assertEqual(EnkelvoudigInformatieObjectCanonical.objects.get().lock, '')
+        self.assertFalse(drc_storage_adapter.lees_enkelvoudiginformatieobject(self.uuid).locked)
+
+    def test_already_locked(self):
+        drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+
+        with self.assertRaises(BackendException):
+            drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+
+    def test_expired(self):
+        old_lock = drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+        self._expire()
+
+        self.assertFalse(drc_storage_adapter.lees_enkelvoudiginformatieobject(self.uuid).locked)
+
+        lock = drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+        self.assertNotEqual(lock, old_lock)
+        self.assertEqual(DocumentLock.objects.get(uuid=self.uuid).lock, lock)
+
+    def test_update_with_expired_lock(self):
+        lock = drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+        self._expire()
+
+        with self.assertRaises(BackendException) as context:
+            drc_storage_adapter.update_enkenvoudiginformatieobject(self.uuid, lock, {'titel': 'changed'})
+        self.assertEqual(context.exception.code, 'not-locked')
+
+    def test_update_renews(self):
+        lock = drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+        DocumentLock.objects.filter(uuid=self.uuid).update(verloopt_op=timezone.now() + timedelta(seconds=10))
+
+        drc_storage_adapter.update_enkenvoudiginformatieobject(self.uuid, lock, {'titel': 'changed'})
+
+        self.assertGreater(DocumentLock.objects.get().verloopt_op, timezone.now() + timedelta(seconds=500))
+
+    def test_heartbeat(self):
+        lock = drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+        DocumentLock.objects.filter(uuid=self.uuid).update(verloopt_op=timezone.now() + timedelta(seconds=10))
+
+        drc_storage_adapter.verleng_lock_enkelvoudiginformatieobject(self.uuid, lock)
+
+        self.assertGreater(DocumentLock.objects.get().verloopt_op, timezone.now() + timedelta(seconds=500))
+        with self.assertRaises(BackendException):
+            drc_storage_adapter.verleng_lock_enkelvoudiginformatieobject(self.uuid, 'wrong')
+
+    def test_heartbeat_expired(self):
+        lock = drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+        self._expire()
+
+        with self.assertRaises(BackendException):
+            drc_storage_adapter.verleng_lock_enkelvoudiginformatieobject(self.uuid, lock)
+
+    def test_unlock(self):
+        lock = drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+
+        drc_storage_adapter.unlock_enkelvoudiginformatieobject(self.uuid, lock)
+
+        self.assertFalse(DocumentLock.objects.exists())
+        self.assertFalse(drc_storage_adapter.lees_enkelvoudiginformatieobject(self.uuid).locked)
+
+    @override_settings(DOCUMENT_LOCK_TTL=0)
+    def test_no_expiry(self):
+        drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+
+        self.assertIsNone(DocumentLock.objects.get().verloopt_op)
+
+    def test_lock_status_of_a_page(self):
+        drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+        for _ in range(3):
+            eio = EnkelvoudigInformatieObject.objects.create(
+                canonical=EnkelvoudigInformatieObjectCanonical.objects.create(),
+                bronorganisatie='159351741',
+                creatiedatum='2018-06-27',
+                titel='some titel',
+                auteur='some auteur',
+                taal='nld',
+                informatieobjecttype='https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1',
+            )
+            drc_storage_adapter.lock_enkelvoudiginformatieobject(str(eio.uuid))
+        self._expire()
+        documents = drc_storage_adapter.backend().get_documents(page=1, page_size=10).results
+
+        # one query for the leases of all locked documents
+        with self.assertNumQueries(1):
+            drc_storage_adapter._lock_status(documents)
+
+        self.assertEqual(sorted(document.locked for document in documents), [False, True, True, True])
+
+    def test_release_expired_locks(self):
+        drc_storage_adapter.lock_enkelvoudiginformatieobject(self.uuid)
+        self._expire()
+        stdout = StringIO()
+
+        call_command('release_expired_locks', stdout=stdout)
+
+        self.assertIn('Released 1 expired locks', stdout.getvalue())
+        self.assertFalse(DocumentLock.objects.exists())
+        self.assertEqual(EnkelvoudigInformatieObjectCanonical.objects.get().lock, '')
@@ -0,0 +1,132 @@
+import base64
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import JWTAuthMixin, get_operation_url
+from zds_client import ClientError
+
+from drc.api.scopes import SCOPE_DOCUMENTEN_AANMAKEN
+from drc.datamodel.models import UitgaandeNotificatie
+
+INFORMATIEOBJECTTYPE = 'https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1'
+HOOFD_OBJECT = 'http://testserver/api/v1/enkelvoudiginformatieobjecten/1'
+
+
+def _bericht(actie='create', hoofd_object=HOOFD_OBJECT):
+    return {
+        'kanaal': 'documenten',
+        'hoofdObject': hoofd_object,
+        'resource': 'enkelvoudiginformatieobject',
+        'resourceUrl': hoofd_object,
+        'actie': actie,
+        'aanmaakdatum': '2012-01-14T00:00:00Z',
+        'kenmerken': {},
+    }
+
+
+@freeze_time("2012-01-14")
+@override_settings(
+    LINK_FETCHER='vng_api_common.mocks.link_fetcher_200',
+    NOTIFICATIONS_DISABLED=False,
+    NOTIFICATIONS_DELIVERY='async',
+)
+class OutboxTestCase(JWTAuthMixin, APITestCase):
+
+    scopes = [SCOPE_DOCUMENTEN_AANMAKEN]
+    informatieobjecttype = INFORMATIEOBJECTTYPE
+
+    @patch('zds_client.Client.from_url')
+    def test_create_queues_notification(self, mock_client):
+        url = get_operation_url('enkelvoudiginformatieobject_create')
+        data = {
+            'identificatie': 'AMS20180701001',
+            'bronorganisatie': '159351741',
+            'creatiedatum': '2018-07-01',
+            'titel': 'text_extra.txt',
+            'auteur': 'ANONIEM',
+            'formaat': 'text/plain',
+            'taal': 'dut',
+            'inhoud': base64.b64encode(b'Extra tekst in bijlage').decode('utf-8'),
+            'informatieobjecttype': INFORMATIEOBJECTTYPE,
+            'vertrouwelijkheidaanduiding': VertrouwelijkheidsAanduiding.openbaar
+        }
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        mock_client.return_value.create.assert_not_called()
+
+        notificatie = UitgaandeNotificatie.objects.get()
+        self.assertEqual(notificatie.hoofd_object, response.json()['url'])
+        self.assertEqual(notificatie.bericht['actie'], 'create')
+        self.assertIsNone(notificatie.verzonden)
+
+
+@freeze_time("2012-01-14")
+@override_settings(NOTIFICATIONS_MAX_ATTEMPTS=2, NOTIFICATIONS_RETRY_DELAY=30)
+class SendNotificationsCommandTests(TestCase):
+
+    @patch('zds_client.Client.from_url')
+    def test_send(self, mock_client):
+        notificatie = UitgaandeNotificatie.objects.create(
+            kanaal='documenten', hoofd_object=HOOFD_OBJECT, bericht=_bericht()
+        )
+
+        call_command('send_notifications', stdout=StringIO())
+
+        mock_client.return_value.create.assert_called_once_with('notificaties', _bericht())
+        notificatie.refresh_from_db()
+        self.assertIsNotNone(notificatie.verzonden)
+
+    @patch('zds_client.Client.from_url')
+    def test_retry_with_backoff(self, mock_client):
+        mock_client.return_value.create.side_effect = ClientError('NRC is down')
+        notificatie = UitgaandeNotificatie.objects.create(
+            kanaal='documenten', hoofd_object=HOOFD_OBJECT, bericht=_bericht()
+        )
+
+        call_command('send_notifications', stdout=StringIO())
+
+        notificatie.refresh_from_db()
+        self.assertIsNone(notificatie.verzonden)
+        self.assertEqual(notificatie.pogingen, 1)
+        self.assertEqual(notificatie.volgende_poging.isoformat(), '2012-01-14T00:00:30+00:00')
+        self.assertFalse(notificatie.mislukt)
+
+        with freeze_time("2012-01-14T00:01:00"):
+            call_command('send_notifications', stdout=StringIO())
+
+        notificatie.refresh_from_db()
+        self.assertEqual(notificatie.pogingen, 2)
+        self.assertTrue(notificatie.mislukt)
+
+    @patch('zds_client.Client.from_url')
+    def test_order_per_hoofd_object(self, mock_client):
+        mock_client.return_value.create.side_effect = [ClientError('NRC is down'), None]
+        eerste = UitgaandeNotificatie.objects.create(
+            kanaal='documenten', hoofd_object=HOOFD_OBJECT, bericht=_bericht('create')
+        )
+        tweede = UitgaandeNotificatie.objects.create(
+            kanaal='documenten', hoofd_object=HOOFD_OBJECT, bericht=_bericht('update')
+        )
+        ander = UitgaandeNotificatie.objects.create(
+            kanaal='documenten', hoofd_object=f"{HOOFD_OBJECT}0", bericht=_bericht(hoofd_object=f"{HOOFD_OBJECT}0")
+        )
+
+        call_command('send_notifications', stdout=StringIO())
+
+        eerste.refresh_from_db()
+        tweede.refresh_from_db()
+        ander.refresh_from_db()
+        self.assertIsNone(eerste.verzonden)
+        # waits for the first notification about the same object
+        self.assertIsNone(tweede.verzonden)
+        self.assertEqual(tweede.pogingen, 0)
+        self.assertIsNotNone(ander.verzonden)
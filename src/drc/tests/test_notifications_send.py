@@ -1,6 +1,7 @@
 import base64
 from unittest.mock import patch
 
+from django.db import connection
 from django.test import override_settings
 
 from freezegun import freeze_time
@@ -16,6 +17,13 @@ from drc.api.scopes import (
 INFORMATIEOBJECTTYPE = 'https://example.com/ztc/api/v1/catalogus/1/informatieobjecttype/1'
 
 
+def run_on_commit():
+    # the test case never commits its transaction
+    callbacks, connection.run_on_commit = connection.run_on_commit, []
+    for _, callback in callbacks:
+        callback()
+
+
 @freeze_time("2012-01-14")
 @override_settings(
     LINK_FETCHER='vng_api_common.mocks.link_fetcher_200',
@@ -49,6 +57,10 @@ class SendNotifTestCase(JWTAuthMixin, APITestCase):
         response = self.client.post(url, data)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        # sent once the document is committed
+        client.create.assert_not_called()
+
+        run_on_commit()
 
         data = response.json()
         client.create.assert_called_once_with(
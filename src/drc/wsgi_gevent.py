@@ -0,0 +1,22 @@
+"""
+WSGI config for running drc on gevent, e.g. with ``uwsgi --gevent``.
+
+Requests are handled by greenlets instead of threads. The standard library
+(sockets, ``threading``, ``time.sleep``) and psycopg2 are patched to yield
+to other greenlets while they wait, so a request waiting on a slow upstream
+(the Catalogi API, the Zaken API, the Notificaties API or CMIS) doesn't hold
+a thread, and the outgoing connections are still pooled by
+:mod:`drc.backend.http`.
+
+The patches must be applied before anything else is imported, use this
+module instead of :mod:`drc.wsgi`, not next to it.
+"""
+from gevent import monkey  # isort:skip
+
+monkey.patch_all()
+
+from psycogreen.gevent import patch_psycopg  # noqa isort:skip
+
+patch_psycopg()
+
+from drc.wsgi import application  # noqa isort:skip